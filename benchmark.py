@@ -0,0 +1,410 @@
+"""Benchmark suite for the ciphers in cryptocore.
+
+Times every cipher across input sizes (16 B up to 100 MB) and key sizes
+(toy parameters up to 4096-bit moduli), reports throughput and p50/p99
+latency, writes the results as JSON and flags regressions against a stored
+baseline. Run ``python benchmark.py --help`` for the options.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from cryptocore import batch, bignum, classical, des, dsa, rsa
+from cryptocore.numtheory import is_prime, random_prime
+from cryptocore.stream import caesar_stream, des_ctr_stream, vigenere_stream
+
+# ===== CONFIGURATION =====
+SIZES = [16, 256, 4 << 10, 64 << 10, 1 << 20, 16 << 20, 100 << 20]
+KEY_BITS = [0, 512, 1024, 2048, 3072, 4096]   # 0 = the toy parameters from the menus
+DSA_SUBGROUP_BITS = {1024: 160, 2048: 224, 3072: 256, 4096: 256}
+SEED = 2024
+
+# ===== INPUTS =====
+def parse_size(value: str) -> int:
+    """Parse sizes like 4096, 64KB or 100MB"""
+    units = {"KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30, "B": 1}
+    value = value.strip().upper()
+    for suffix, factor in units.items():
+        if value.endswith(suffix):
+            return int(float(value[:-len(suffix)]) * factor)
+    return int(value)
+
+def format_size(size: int) -> str:
+    for suffix, factor in (("MB", 1 << 20), ("KB", 1 << 10)):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{suffix}"
+    return f"{size}B"
+
+def sample_text(size: int) -> str:
+    """Mixed-case letters and spaces, reproducible for a given size"""
+    rng = random.Random(SEED + size)
+    alphabet = "ETAOINSHRDLUCMFWYPVBGKJQXZetaoinshrdlucmfwypvbgkjqxz     "
+    pattern = "".join(rng.choice(alphabet) for _ in range(min(size, 1 << 16)))
+    return (pattern * (size // len(pattern) + 1))[:size]
+
+def rsa_primes(bits: int) -> Tuple[int, int]:
+    """Two primes for a modulus of `bits` bits (61 and 53 for the toy size)"""
+    if bits == 0:
+        return 61, 53
+    rng = random.Random(SEED + bits)
+    while True:
+        p, q = random_prime(bits // 2, rng), random_prime(bits // 2, rng)
+        if p != q and (p * q).bit_length() == bits:
+            return p, q
+
+def rsa_multi_primes(bits: int, count: int) -> List[int]:
+    """`count` primes for a multi-prime modulus of `bits` bits"""
+    rng = random.Random(SEED + bits + count)
+    sizes = [bits // count + (i < bits % count) for i in range(count)]
+    return [rsa.rsa_prime(size, count, rng) for size in sizes]
+
+def dsa_parameters(bits: int) -> Tuple[int, int, int]:
+    """DSA domain parameters (p, q, g) with a `bits`-bit p (23, 11, 4 for the toy size)"""
+    if bits == 0:
+        return 23, 11, 4
+    rng = random.Random(SEED + bits)
+    q = random_prime(DSA_SUBGROUP_BITS[bits], rng)
+    while True:
+        p = (rng.getrandbits(bits) | (1 << (bits - 1))) // (2 * q) * (2 * q) + 1
+        if p.bit_length() == bits and is_prime(p):
+            break
+    h = 2
+    while pow(h, (p - 1) // q, p) == 1:
+        h += 1
+    return p, q, pow(h, (p - 1) // q, p)
+
+# ===== CASES =====
+# A case is (cipher, parameters, setup) where setup() returns the callable
+# to time and the number of input bytes each call processes.
+Case = Tuple[str, Dict[str, Any], Callable[[], Tuple[Callable[[], Any], int]]]
+
+def text_cases(sizes: List[int]) -> Iterator[Case]:
+    cipher_calls = {
+        "caesar_cipher": lambda t: lambda: classical.caesar_cipher(t, 3, True),
+        "caesar_batch": lambda t: lambda: batch.caesar_batch(t, 3),
+        "caesar_stream": lambda t: lambda: b"".join(caesar_stream([t.encode()], 3, True)),
+        "vigenere_cipher": lambda t: lambda: classical.vigenere_cipher(t, "LEMON", True),
+        "vigenere_batch": lambda t: lambda: batch.vigenere_batch(t, "LEMON"),
+        "vigenere_stream": lambda t: lambda: b"".join(vigenere_stream([t.encode()], "LEMON", True)),
+        "playfair_cipher": lambda t: lambda: classical.playfair_cipher(t, "MONARCHY", True),
+        "playfair_batch": lambda t: lambda: batch.playfair_batch(t, "MONARCHY"),
+        "hill_cipher": lambda t: lambda: classical.hill_cipher(t, [[3, 3], [2, 5]], True),
+        "hill_batch": lambda t: lambda: batch.hill_batch(t, [[3, 3], [2, 5]]),
+        "rail_fence_cipher": lambda t: lambda: classical.rail_fence_cipher(t, 5, True),
+        "rail_fence_batch": lambda t: lambda: batch.rail_fence_batch(t, 5),
+    }
+    for size in sizes:
+        for name, make in cipher_calls.items():
+            yield name, {"size": size}, lambda make=make, size=size: (make(sample_text(size)), size)
+
+def des_cases(sizes: List[int]) -> Iterator[Case]:
+    key = b"SECRETKY"
+    round_keys = des.des_key_schedule(key)
+    yield "des_encrypt_block", {"size": 8}, lambda: (lambda: des.des_encrypt_block(b"ABCDEFGH", round_keys), 8)
+    for size in sizes:
+        def setup(size=size):
+            data = sample_text(size).encode()
+            return (lambda: des.des_encrypt(data, key)), size
+        yield "des_ecb", {"size": size}, setup
+        
+        def setup_ctr(size=size):
+            data = sample_text(size).encode()
+            return (lambda: b"".join(des_ctr_stream([data], key, bytes(8)))), size
+        yield "des_ctr_stream", {"size": size}, setup_ctr
+
+def rsa_cases(key_bits: List[int]) -> Iterator[Case]:
+    for bits in key_bits:
+        if bits == 3072:
+            continue   # RSA moduli are benchmarked at powers of two
+        primes = {}
+        
+        def keys(bits=bits, primes=primes):
+            if not primes:
+                p, q = rsa_primes(bits)
+                primes.update(p=p, q=q, keys=rsa.rsa_generate_keys(p, q))
+            return primes
+        
+        def setup_keygen(keys=keys):
+            k = keys()
+            return (lambda: rsa.rsa_generate_keys(k["p"], k["q"])), 0
+        
+        def setup_encrypt(keys=keys):
+            e, d, n = keys()["keys"]
+            m = n // 3
+            return (lambda: rsa.rsa_encrypt(m, e, n)), 0
+        
+        def setup_decrypt(keys=keys):
+            e, d, n = keys()["keys"]
+            c = rsa.rsa_encrypt(n // 3, e, n)
+            return (lambda: rsa.rsa_decrypt(c, d, n)), 0
+        
+        def setup_decrypt_crt(keys=keys):
+            k = keys()
+            e, d, n = k["keys"]
+            p, q = k["p"], k["q"]
+            dp, dq, q_inv = rsa.rsa_crt_params(p, q, d)
+            c = rsa.rsa_encrypt(n // 3, e, n)
+            return (lambda: rsa.rsa_decrypt_crt(c, p, q, dp, dq, q_inv)), 0
+        
+        def setup_decrypt_crt_blinded(keys=keys):
+            k = keys()
+            e, d, n = k["keys"]
+            p, q = k["p"], k["q"]
+            dp, dq, q_inv = rsa.rsa_crt_params(p, q, d)
+            blinding = rsa.RSABlinding(e, n)
+            c = rsa.rsa_encrypt(n // 3, e, n)
+            return (lambda: rsa.rsa_decrypt_crt(c, p, q, dp, dq, q_inv, blinding)), 0
+        
+        def setup_decrypt_multi_crt(count, bits=bits):
+            primes = rsa_multi_primes(bits, count)
+            e, d, n = rsa.rsa_generate_keys(*primes)
+            exponents, coefficients = rsa.rsa_multi_crt_params(primes, d)
+            c = rsa.rsa_encrypt(n // 3, e, n)
+            return (lambda: rsa.rsa_decrypt_multi_crt(c, primes, exponents, coefficients)), 0
+        
+        def setup_prime(bits=bits):
+            rng = random.Random(SEED)
+            return (lambda: random_prime(bits // 2, rng)), 0
+        
+        if bits:
+            yield "random_prime", {"key_bits": bits}, setup_prime
+        yield "rsa_keygen", {"key_bits": bits}, setup_keygen
+        yield "rsa_encrypt", {"key_bits": bits}, setup_encrypt
+        yield "rsa_decrypt", {"key_bits": bits}, setup_decrypt
+        yield "rsa_decrypt_crt", {"key_bits": bits}, setup_decrypt_crt
+        yield "rsa_decrypt_crt_blinded", {"key_bits": bits}, setup_decrypt_crt_blinded
+        # Multi-prime CRT at the same modulus size, for comparison with rsa_decrypt_crt
+        for count in range(3, rsa.rsa_max_primes(bits) + 1):
+            yield f"rsa_decrypt_crt{count}", {"key_bits": bits}, lambda count=count: setup_decrypt_multi_crt(count)
+
+def dsa_cases(key_bits: List[int]) -> Iterator[Case]:
+    for bits in key_bits:
+        if bits == 512:
+            continue   # DSA starts at 1024-bit p
+        params = {}
+        
+        def domain(bits=bits, params=params):
+            if not params:
+                p, q, g = dsa_parameters(bits)
+                rng = random.Random(SEED)
+                x = rng.randrange(1, q)
+                params.update(p=p, q=q, g=g, x=x, y=dsa.dsa_public_key(x, p, g),
+                              h=rng.randrange(1, q), k=rng.randrange(1, q))
+            return params
+        
+        def setup_sign(domain=domain):
+            d = domain()
+            return (lambda: dsa.dsa_sign(d["h"], d["x"], d["p"], d["q"], d["g"], d["k"])), 0
+        
+        def setup_verify(domain=domain):
+            d = domain()
+            r, s = dsa.dsa_sign(d["h"], d["x"], d["p"], d["q"], d["g"], d["k"])
+            return (lambda: dsa.dsa_verify(d["h"], r, s, d["y"], d["p"], d["q"], d["g"])), 0
+        
+        def setup_sign_fixed(domain=domain):
+            d = domain()
+            table = dsa.dsa_base_table(d["g"], d["p"], d["q"])
+            return (lambda: dsa.dsa_sign_fixed(d["h"], d["x"], d["p"], d["q"], table, d["k"])), 0
+        
+        def setup_verify_fixed(domain=domain):
+            d = domain()
+            table = dsa.dsa_base_table(d["g"], d["p"], d["q"])
+            r, s = dsa.dsa_sign(d["h"], d["x"], d["p"], d["q"], d["g"], d["k"])
+            return (lambda: dsa.dsa_verify_fixed(d["h"], r, s, d["y"], d["p"], d["q"], table)), 0
+        
+        yield "dsa_sign", {"key_bits": bits}, setup_sign
+        yield "dsa_sign_fixed", {"key_bits": bits}, setup_sign_fixed
+        yield "dsa_verify", {"key_bits": bits}, setup_verify
+        yield "dsa_verify_fixed", {"key_bits": bits}, setup_verify_fixed
+
+def all_cases(sizes: List[int], key_bits: List[int]) -> Iterator[Case]:
+    yield from text_cases(sizes)
+    yield from des_cases(sizes)
+    yield from rsa_cases(key_bits)
+    yield from dsa_cases(key_bits)
+
+# ===== MEASUREMENT =====
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    index = max(0, min(len(sorted_samples) - 1, int(round(fraction * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[index]
+
+def measure(fn: Callable[[], Any], budget: float, min_repeats: int, max_repeats: int) -> List[float]:
+    """Time calls of fn until the budget is spent (at least min_repeats calls).
+    
+    A call slower than the whole budget is only repeated while the total stays
+    under ten budgets, so 100 MB runs of the pure-Python ciphers stay bounded.
+    """
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_repeats:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+        if elapsed >= budget and len(samples) >= min_repeats:
+            break
+        if elapsed + samples[-1] > 10 * budget:
+            break
+    return samples
+
+def case_id(name: str, params: Dict[str, Any]) -> str:
+    return name + "".join(f"/{k}={v}" for k, v in sorted(params.items()))
+
+def run_case(name: str, params: Dict[str, Any], setup, args) -> Dict[str, Any]:
+    fn, nbytes = setup()
+    fn()   # warm-up: lazy imports, tables, caches
+    samples = sorted(measure(fn, args.budget, args.min_repeats, args.max_repeats))
+    p50 = percentile(samples, 0.50)
+    result = {
+        "id": case_id(name, params),
+        "cipher": name,
+        **params,
+        "repeats": len(samples),
+        "p50_us": p50 * 1e6,
+        "p99_us": percentile(samples, 0.99) * 1e6,
+        "mean_us": sum(samples) / len(samples) * 1e6,
+        "ops_per_s": 1 / p50 if p50 else None,
+    }
+    if nbytes:
+        result["mb_per_s"] = nbytes / p50 / 1e6 if p50 else None
+    return result
+
+# ===== REPORTING =====
+def describe(result: Dict[str, Any]) -> str:
+    if "size" in result:
+        what = format_size(result["size"])
+        rate = f"{result['mb_per_s']:10.2f} MB/s"
+    else:
+        what = "toy" if result["key_bits"] == 0 else f"{result['key_bits']}-bit"
+        rate = f"{result['ops_per_s']:10.1f} op/s"
+    return (f"{result['cipher']:<23} {what:>9}  p50 {result['p50_us']:>12.1f} us  "
+            f"p99 {result['p99_us']:>12.1f} us  {rate}  (n={result['repeats']})")
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any],
+            threshold: float) -> List[Tuple[Dict[str, Any], float]]:
+    """Results whose p50 is more than `threshold` slower than the baseline's"""
+    previous = {r["id"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result["id"])
+        if old and old["p50_us"] > 0:
+            ratio = result["p50_us"] / old["p50_us"]
+            result["baseline_ratio"] = ratio
+            if ratio > 1 + threshold:
+                regressions.append((result, ratio))
+    return regressions
+
+def compare_backends(args) -> int:
+    """Run the key-size cases once per bignum backend and print the speedups.
+    
+    The backend is fixed when cryptocore is imported, so each run is a
+    subprocess with CRYPTOCORE_BIGNUM set.
+    """
+    if importlib.util.find_spec("gmpy2") is None:
+        print("--compare-backends needs gmpy2 (pip install gmpy2)", file=sys.stderr)
+        return 1
+    reports = {}
+    for backend in bignum.BACKENDS:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.json")
+            command = [sys.executable, os.path.abspath(__file__), "--max-size", str(args.max_size),
+                       "--max-key-bits", str(args.max_key_bits), "--budget", str(args.budget),
+                       "--min-repeats", str(args.min_repeats), "--max-repeats", str(args.max_repeats), "-o", path]
+            for f in args.filter or ["rsa", "dsa", "prime"]:
+                command += ["-k", f]
+            print(f"--- {backend} ---", flush=True)
+            subprocess.run(command, env=dict(os.environ, CRYPTOCORE_BIGNUM=backend), check=True)
+            with open(path) as f:
+                reports[backend] = json.load(f)
+    
+    gmp = {r["id"]: r for r in reports["gmpy2"]["results"]}
+    print(f"\n{'case':<34} {'python p50':>14} {'gmpy2 p50':>14} {'speedup':>8}")
+    for result in reports["python"]["results"]:
+        other = gmp.get(result["id"])
+        if other and other["p50_us"] > 0:
+            result["gmpy2_speedup"] = result["p50_us"] / other["p50_us"]
+            print(f"{result['id']:<34} {result['p50_us']:>11.1f} us {other['p50_us']:>11.1f} us "
+                  f"{result['gmpy2_speedup']:>7.1f}x")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"backends": reports}, f, indent=2)
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="benchmark.py",
+        description="Time every cipher across input and key sizes."
+    )
+    parser.add_argument("--max-size", type=parse_size, default=parse_size("1MB"),
+                        help="largest text/data size, e.g. 100MB (default: 1MB)")
+    parser.add_argument("--max-key-bits", type=int, default=2048,
+                        help="largest RSA modulus / DSA p in bits, up to 4096 (default: 2048)")
+    parser.add_argument("--full", action="store_true", help="same as --max-size 100MB --max-key-bits 4096")
+    parser.add_argument("-k", "--filter", action="append", default=[],
+                        help="only run cases whose id contains this text (repeatable)")
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds to spend per case (default: 0.5)")
+    parser.add_argument("--min-repeats", type=int, default=5)
+    parser.add_argument("--max-repeats", type=int, default=10000)
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--save-baseline", help="also write the results to this baseline file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="flag cases whose p50 is this fraction slower than the baseline (default: 0.10)")
+    parser.add_argument("--compare-backends", action="store_true",
+                        help="run the RSA/DSA/prime cases with Python ints and with gmpy2 and compare them")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.full:
+        args.max_size, args.max_key_bits = 100 << 20, 4096
+    if args.compare_backends:
+        return compare_backends(args)
+    sizes = [s for s in SIZES if s <= args.max_size]
+    key_bits = [b for b in KEY_BITS if b <= args.max_key_bits]
+    
+    results = []
+    for name, params, setup in all_cases(sizes, key_bits):
+        if args.filter and not any(f in case_id(name, params) for f in args.filter):
+            continue
+        result = run_case(name, params, setup, args)
+        results.append(result)
+        print(describe(result), flush=True)
+    
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "budget": args.budget,
+            "bignum": bignum.BACKEND,
+        },
+        "results": results,
+    }
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for result, ratio in regressions:
+            print(f"REGRESSION {result['id']}: {ratio:.2f}x the baseline p50", file=sys.stderr)
+        report["regressions"] = [r["id"] for r, _ in regressions]
+        status = 1 if regressions else 0
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
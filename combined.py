@@ -1,9 +1,27 @@
 import sys
-import math
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import customtkinter as ctk
-from typing import List, Tuple, Optional
+from typing import Any, Callable, Dict, List, Tuple, Optional
+
+from cryptocore.classical import (
+    caesar_cipher, prepare_playfair_matrix, playfair_cipher,
+    hill_cipher, vigenere_cipher, rail_fence_cipher
+)
+from cryptocore import metrics
+from cryptocore.des import des_xor_encrypt
+from cryptocore.rsa import rsa_generate_keys, rsa_encrypt, rsa_decrypt
+from cryptocore.dsa import dsa_public_key, dsa_sign, dsa_verify
+from cryptocore.keyio import key_to_pem
+from cryptocore.keystore import DSADomain, DSAKey, KeyStore, RSAKey
+from cryptocore.ecc import (
+    ecdsa_p256_generate_keys, ecdsa_p256_sign, ecdsa_p256_verify,
+    p256_encode_point, p256_decode_point,
+    ed25519_generate_keys, ed25519_sign, ed25519_verify
+)
 
 # ===== CONSTANTS =====
 DARK_BG = "#121212"
@@ -17,205 +35,22 @@ FONT_BODY = ("Segoe UI", 10)
 ICON_SIZE = 20
 PADDING = 15
 ANIMATION_SPEED = 200
-SIZE = 5
-
-# ===== CRYPTOGRAPHY FUNCTIONS =====
-def print_hex(data: bytes, length: int) -> None:
-    for i in range(length):
-        print(f"{data[i]:02x}", end="")
-    print()
-
-# ===== CLASSICAL CIPHERS =====
-def caesar_cipher(text: str, key: int, encrypt: bool) -> str:
-    result = []
-    for char in text:
-        if char.isupper():
-            if encrypt:
-                new_char = chr((ord(char) - ord('A') + key) % 26 + ord('A'))
-            else:
-                new_char = chr((ord(char) - ord('A') - key + 26) % 26 + ord('A'))
-            result.append(new_char)
-        elif char.islower():
-            if encrypt:
-                new_char = chr((ord(char) - ord('a') + key) % 26 + ord('a'))
-            else:
-                new_char = chr((ord(char) - ord('a') - key + 26) % 26 + ord('a'))
-            result.append(new_char)
-        else:
-            result.append(char)
-    return "".join(result)
-
-def prepare_playfair_matrix(key: str) -> List[List[str]]:
-    key = key.upper().replace("J", "I")
-    used = [False] * 26
-    matrix = [['' for _ in range(SIZE)] for _ in range(SIZE)]
-    k = 0
-    
-    # Process key
-    for ch in key:
-        if ch == 'J':
-            ch = 'I'
-        if ch.isalpha() and not used[ord(ch) - ord('A')]:
-            matrix[k // SIZE][k % SIZE] = ch
-            used[ord(ch) - ord('A')] = True
-            k += 1
-    
-    # Fill remaining letters
-    for ch in range(ord('A'), ord('Z') + 1):
-        ch = chr(ch)
-        if ch == 'J':
-            continue
-        if not used[ord(ch) - ord('A')] and k < 25:
-            matrix[k // SIZE][k % SIZE] = ch
-            k += 1
-    return matrix
-
-def playfair_cipher(text: str, key: str, encrypt: bool) -> str:
-    matrix = prepare_playfair_matrix(key)
-    processed_text = []
-    i = 0
-    text = text.upper().replace("J", "I")
-    
-    while i < len(text):
-        a = text[i]
-        if i + 1 < len(text):
-            b = text[i + 1]
-        else:
-            b = 'X'
-        
-        if a == b:
-            b = 'X'
-            i += 1
-        else:
-            i += 2
-        
-        # Find positions in matrix
-        a_pos = (-1, -1)
-        b_pos = (-1, -1)
-        for row in range(SIZE):
-            for col in range(SIZE):
-                if matrix[row][col] == a:
-                    a_pos = (row, col)
-                if matrix[row][col] == b:
-                    b_pos = (row, col)
-        
-        a_row, a_col = a_pos
-        b_row, b_col = b_pos
-        
-        # Apply cipher rules
-        if a_row == b_row:  # Same row
-            new_a_col = (a_col + (1 if encrypt else -1)) % SIZE
-            new_b_col = (b_col + (1 if encrypt else -1)) % SIZE
-            processed_text.append(matrix[a_row][new_a_col])
-            processed_text.append(matrix[b_row][new_b_col])
-        elif a_col == b_col:  # Same column
-            new_a_row = (a_row + (1 if encrypt else -1)) % SIZE
-            new_b_row = (b_row + (1 if encrypt else -1)) % SIZE
-            processed_text.append(matrix[new_a_row][a_col])
-            processed_text.append(matrix[new_b_row][b_col])
-        else:  # Rectangle
-            processed_text.append(matrix[a_row][b_col])
-            processed_text.append(matrix[b_row][a_col])
-    
-    return "".join(processed_text)
-
-def hill_cipher(text: str, key: List[List[int]], encrypt: bool) -> str:
-    # Calculate determinant
-    det = key[0][0] * key[1][1] - key[0][1] * key[1][0]
-    det = (det % 26 + 26) % 26
-    
-    # Find modular inverse of determinant
-    det_inv = -1
-    for i in range(26):
-        if (det * i) % 26 == 1:
-            det_inv = i
-            break
-    
-    if not encrypt and det_inv == -1:
-        raise ValueError("Invalid key - no inverse exists!")
-    
-    # Calculate inverse key for decryption
-    if not encrypt:
-        inv_key = [
-            [(key[1][1] * det_inv) % 26, (-key[0][1] * det_inv) % 26],
-            [(-key[1][0] * det_inv) % 26, (key[0][0] * det_inv) % 26]
-        ]
-        for i in range(2):
-            for j in range(2):
-                if inv_key[i][j] < 0:
-                    inv_key[i][j] += 26
-        key = inv_key
-    
-    # Process text in pairs
-    result = []
-    text = text.upper()
-    for i in range(0, len(text), 2):
-        a = ord(text[i]) - ord('A')
-        b = ord(text[i + 1]) - ord('A') if i + 1 < len(text) else 23  # 'X'
-        
-        res_a = (key[0][0] * a + key[0][1] * b) % 26
-        res_b = (key[1][0] * a + key[1][1] * b) % 26
-        
-        result.append(chr(res_a + ord('A')))
-        result.append(chr(res_b + ord('A')))
-    
-    return "".join(result)
-
-def vigenere_cipher(text: str, key: str, encrypt: bool) -> str:
-    result = []
-    key_index = 0
-    for char in text:
-        if char.isalpha():
-            key_char = key[key_index % len(key)].lower()
-            shift = ord(key_char) - ord('a')
-            if not encrypt:
-                shift = -shift
-            
-            if char.isupper():
-                new_char = chr((ord(char) - ord('A') + shift + 26) % 26 + ord('A'))
-            else:
-                new_char = chr((ord(char) - ord('a') + shift + 26) % 26 + ord('a'))
-            
-            result.append(new_char)
-            key_index += 1
-        else:
-            result.append(char)
-    return "".join(result)
-
-def rail_fence_cipher(text: str, rails: int, encrypt: bool) -> str:
-    if encrypt:
-        result = []
-        for r in range(rails):
-            i = r
-            while i < len(text):
-                result.append(text[i])
-                if r != 0 and r != rails - 1:
-                    next_i = i + 2 * (rails - r - 1)
-                    if next_i < len(text):
-                        result.append(text[next_i])
-                i += 2 * (rails - 1)
-        return "".join(result)
-    else:
-        decrypted = [''] * len(text)
-        index = 0
-        for r in range(rails):
-            i = r
-            while i < len(text):
-                decrypted[i] = text[index]
-                index += 1
-                if r != 0 and r != rails - 1:
-                    next_i = i + 2 * (rails - r - 1)
-                    if next_i < len(text):
-                        decrypted[next_i] = text[index]
-                        index += 1
-                i += 2 * (rails - 1)
-        return "".join(decrypted)
+JOB_POLL_MS = 50
+JOB_WORKERS = 4
 
 # ===== HELPER FUNCTIONS =====
 def validate_numeric_input(new_value: str) -> bool:
     """Validate that input contains only numbers"""
     return new_value == "" or new_value.isdigit()
 
+def format_duration(seconds: float) -> str:
+    """Short human-readable duration for the status bar"""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
 def create_tooltip(widget, text: str) -> None:
     """Create a tooltip for a widget"""
     tooltip = ctk.CTkToplevel(widget)
@@ -237,6 +72,102 @@ def create_tooltip(widget, text: str) -> None:
     widget.bind("<Enter>", enter)
     widget.bind("<Leave>", leave)
 
+# ===== BACKGROUND JOBS =====
+class BackgroundJob:
+    """A unit of cipher work submitted to the background executor"""
+    def __init__(self, job_id: int, description: str, work: Callable[[], Any],
+                 on_success: Callable[[Any], None]):
+        self.job_id = job_id
+        self.description = description
+        self.work = work
+        self.on_success = on_success
+        self.cancelled = False
+        self.started = False
+        self.elapsed = 0.0
+
+class BackgroundExecutor:
+    """Run cipher jobs on a pool of daemon worker threads.
+    
+    Tk widgets are not thread-safe, so workers never touch them: finished
+    jobs are pushed onto a results queue which the GUI drains with after().
+    A job cancelled before it starts is skipped; a job cancelled while
+    running finishes in the background and its result is discarded.
+    """
+    def __init__(self, workers: int = JOB_WORKERS):
+        self.pending: "queue.Queue[Optional[BackgroundJob]]" = queue.Queue()
+        self.results: "queue.Queue[Tuple[BackgroundJob, Any, Optional[BaseException]]]" = queue.Queue()
+        self.jobs: Dict[int, BackgroundJob] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker, name=f"cipher-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def _worker(self) -> None:
+        while True:
+            job = self.pending.get()
+            if job is None:
+                return
+            if job.cancelled:
+                self.results.put((job, None, None))
+                continue
+            job.started = True
+            start = time.perf_counter()
+            try:
+                result = job.work()
+            except BaseException as e:
+                job.elapsed = time.perf_counter() - start
+                self.results.put((job, None, e))
+            else:
+                job.elapsed = time.perf_counter() - start
+                self.results.put((job, result, None))
+    
+    def submit(self, description: str, work: Callable[[], Any],
+               on_success: Callable[[Any], None]) -> int:
+        """Queue work() and return its job id"""
+        with self._lock:
+            self._next_id += 1
+            job = BackgroundJob(self._next_id, description, work, on_success)
+            self.jobs[job.job_id] = job
+        self.pending.put(job)
+        return job.job_id
+    
+    def cancel(self, job_id: Optional[int] = None) -> int:
+        """Cancel one job, or every active job when job_id is None"""
+        with self._lock:
+            if job_id is None:
+                targets = list(self.jobs.values())
+            else:
+                targets = [self.jobs[job_id]] if job_id in self.jobs else []
+            for job in targets:
+                job.cancelled = True
+        return len(targets)
+    
+    def drain(self) -> List[Tuple[BackgroundJob, Any, Optional[BaseException]]]:
+        """Collect finished jobs without blocking"""
+        finished = []
+        while True:
+            try:
+                job, result, error = self.results.get_nowait()
+            except queue.Empty:
+                return finished
+            with self._lock:
+                self.jobs.pop(job.job_id, None)
+            finished.append((job, result, error))
+    
+    def active(self) -> List[BackgroundJob]:
+        """Jobs that have been submitted and not yet drained"""
+        with self._lock:
+            return [job for job in self.jobs.values() if not job.cancelled]
+    
+    def shutdown(self) -> None:
+        """Cancel outstanding work and stop idle workers"""
+        self.cancel()
+        for _ in self._threads:
+            self.pending.put(None)
+
 # ===== MAIN APPLICATION =====
 class CryptographyApp(ctk.CTk):
     def __init__(self):
@@ -258,6 +189,14 @@ class CryptographyApp(ctk.CTk):
         self.main_container = ctk.CTkFrame(self, fg_color=DARK_BG)
         self.main_container.pack(fill="both", expand=True, padx=0, pady=0)
         
+        # Category views are built on first use and cached afterwards
+        self.category_frames: Dict[str, ctk.CTkFrame] = {}
+        self.current_category: Optional[str] = None
+        
+        # Background executor for cipher work
+        self.executor = BackgroundExecutor()
+        self._polling_jobs = False
+        
         # Initialize UI
         self.create_main_menu()
         self.create_status_bar()
@@ -319,6 +258,10 @@ class CryptographyApp(ctk.CTk):
         self.iconify()
         
     def _close_window(self):
+        self.executor.shutdown()
+        if metrics.get_mode() != "off":
+            # Started with CRYPTOCORE_METRICS=sampled|full: leave the stats on stderr
+            print(metrics.to_json(), file=sys.stderr)
         self.destroy()
     
     def create_main_menu(self) -> None:
@@ -441,6 +384,20 @@ class CryptographyApp(ctk.CTk):
             command=self.toggle_theme
         )
         self.theme_btn.pack(side="right", padx=5)
+        
+        # Background job indicator (shown only while jobs are running)
+        self.job_cancel_btn = ctk.CTkButton(
+            self.status_bar,
+            text="✕ Cancel",
+            width=70,
+            height=20,
+            fg_color="transparent",
+            hover_color="#FF5555",
+            command=self.cancel_jobs
+        )
+        self.job_progress = ctk.CTkProgressBar(self.status_bar, mode="indeterminate", width=120, height=8)
+        self.job_label = ctk.CTkLabel(self.status_bar, text="", font=FONT_BODY)
+        self._job_indicator_visible = False
     
     def toggle_theme(self) -> None:
         """Toggle between dark and light theme"""
@@ -457,17 +414,88 @@ class CryptographyApp(ctk.CTk):
         self.status_label.configure(text=message)
         self.after(3000, lambda: self.status_label.configure(text="Ready"))
     
-    def clear_content_frame(self) -> None:
-        """Clear the content frame to show new content"""
-        if hasattr(self, 'content_frame'):
-            self.content_frame.destroy()
-        
-        self.content_frame = ctk.CTkFrame(self.main_container, fg_color=DARK_BG)
-        self.content_frame.pack(fill="both", expand=True, padx=PADDING, pady=(0, PADDING))
+    def run_job(self, description: str, work: Callable[[], Any],
+                on_success: Callable[[Any], None]) -> int:
+        """Run work() in the background and hand its result to on_success on the Tk thread"""
+        job_id = self.executor.submit(description, work, on_success)
+        self._update_job_indicator()
+        if not self._polling_jobs:
+            self._polling_jobs = True
+            self.after(JOB_POLL_MS, self._poll_jobs)
+        return job_id
+    
+    def cancel_jobs(self) -> None:
+        """Cancel all running and queued background jobs"""
+        count = self.executor.cancel()
+        self._update_job_indicator()
+        if count:
+            self.update_status(f"Cancelled {count} job(s)")
+    
+    def _poll_jobs(self) -> None:
+        """Deliver finished background jobs to their callbacks"""
+        for job, result, error in self.executor.drain():
+            if job.cancelled:
+                continue
+            if error is not None:
+                messagebox.showerror("Error", f"{job.description} failed: {str(error)}")
+                continue
+            try:
+                job.on_success(result)
+                self.update_status(f"{job.description} successful! ({format_duration(job.elapsed)})")
+            except Exception as e:
+                messagebox.showerror("Error", f"{job.description} failed: {str(e)}")
+        
+        self._update_job_indicator()
+        if self.executor.jobs:
+            self.after(JOB_POLL_MS, self._poll_jobs)
+        else:
+            self._polling_jobs = False
+    
+    def _update_job_indicator(self) -> None:
+        """Show the progress bar and cancel button while jobs are active"""
+        active = self.executor.active()
+        if active:
+            text = active[0].description + "..."
+            if len(active) > 1:
+                text += f" (+{len(active) - 1} more)"
+            self.job_label.configure(text=text)
+            if not self._job_indicator_visible:
+                self._job_indicator_visible = True
+                self.job_cancel_btn.pack(side="right", padx=5)
+                self.job_progress.pack(side="right", padx=5)
+                self.job_label.pack(side="right", padx=5)
+                self.job_progress.start()
+        elif self._job_indicator_visible:
+            self._job_indicator_visible = False
+            self.job_progress.stop()
+            self.job_progress.pack_forget()
+            self.job_label.pack_forget()
+            self.job_cancel_btn.pack_forget()
+    
+    def set_output(self, textbox, text: str) -> None:
+        """Replace the contents of an output textbox"""
+        textbox.delete("1.0", "end")
+        textbox.insert("1.0", text)
+    
+    def stored_key(self, entry, kind: str):
+        """The key a Key ID entry names in the key store, or None when the entry is empty"""
+        key_id = entry.get().strip()
+        if not key_id:
+            return None
+        with KeyStore() as store:
+            if key_id not in store:
+                raise ValueError(f"No key {key_id!r} in {store.path}")
+            if store.kind(key_id) != kind:
+                raise ValueError(f"Key {key_id!r} is a {store.kind(key_id)} key, not {kind}")
+            return store.get(key_id)
+    
+    def create_category_frame(self) -> ctk.CTkFrame:
+        """Create an (unpacked) category frame with a back button"""
+        frame = ctk.CTkFrame(self.main_container, fg_color=DARK_BG)
         
         # Add back button
         back_btn = ctk.CTkButton(
-            self.content_frame,
+            frame,
             text="← Back to Menu",
             width=120,
             command=self.show_main_menu,
@@ -476,68 +504,78 @@ class CryptographyApp(ctk.CTk):
             border_width=1
         )
         back_btn.pack(anchor="nw", padx=5, pady=5)
+        return frame
+    
+    def create_lazy_tabview(self, parent, tabs: List[Tuple[str, Callable[[Any], None]]]) -> ctk.CTkTabview:
+        """Create a tabview whose tab contents are only built when first selected"""
+        builders = dict(tabs)
+        built = set()
+        
+        def build_selected() -> None:
+            name = notebook.get()
+            if name not in built:
+                built.add(name)
+                builders[name](notebook.tab(name))
+        
+        notebook = ctk.CTkTabview(parent, command=build_selected)
+        notebook.pack(fill="both", expand=True, padx=5, pady=5)
+        
+        for name, _ in tabs:
+            notebook.add(name)
+        build_selected()
+        return notebook
+    
+    def show_category(self, name: str, tabs: List[Tuple[str, Callable[[Any], None]]]) -> None:
+        """Show a category view, building it on first use and reusing it afterwards"""
+        self.menu_frame.pack_forget()
+        if self.current_category is not None:
+            self.category_frames[self.current_category].pack_forget()
+        
+        frame = self.category_frames.get(name)
+        if frame is None:
+            frame = self.create_category_frame()
+            self.create_lazy_tabview(frame, tabs)
+            self.category_frames[name] = frame
+        
+        frame.pack(fill="both", expand=True, padx=PADDING, pady=(0, PADDING))
+        self.current_category = name
     
     def show_main_menu(self) -> None:
         """Show the main menu"""
-        if hasattr(self, 'content_frame'):
-            self.content_frame.destroy()
+        if self.current_category is not None:
+            self.category_frames[self.current_category].pack_forget()
+            self.current_category = None
         self.menu_frame.pack(fill="both", expand=True, padx=PADDING, pady=PADDING)
     
     def show_classical_ciphers(self) -> None:
         """Show classical cipher options"""
-        self.menu_frame.pack_forget()
-        self.clear_content_frame()
-        
-        # Create notebook for different ciphers
-        notebook = ctk.CTkTabview(self.content_frame)
-        notebook.pack(fill="both", expand=True, padx=5, pady=5)
-        
-        # Add tabs
-        tabs = [
+        self.show_category("classical", [
             ("Caesar", self.create_caesar_interface),
             ("Playfair", self.create_playfair_interface),
             ("Hill", self.create_hill_interface),
             ("Vigenère", self.create_vigenere_interface),
             ("Rail Fence", self.create_rail_fence_interface)
-        ]
-        
-        for name, func in tabs:
-            tab = notebook.add(name)
-            func(tab)
+        ])
     
     def show_symmetric_ciphers(self) -> None:
         """Show symmetric cipher options"""
-        self.menu_frame.pack_forget()
-        self.clear_content_frame()
-        
-        notebook = ctk.CTkTabview(self.content_frame)
-        notebook.pack(fill="both", expand=True, padx=5, pady=5)
-        
-        # Add tabs
-        des_tab = notebook.add("DES")
-        self.create_des_interface(des_tab)
+        self.show_category("symmetric", [
+            ("DES", self.create_des_interface)
+        ])
     
     def show_asymmetric_ciphers(self) -> None:
         """Show asymmetric cipher options"""
-        self.menu_frame.pack_forget()
-        self.clear_content_frame()
-        
-        notebook = ctk.CTkTabview(self.content_frame)
-        notebook.pack(fill="both", expand=True, padx=5, pady=5)
-        
-        rsa_tab = notebook.add("RSA")
-        self.create_rsa_interface(rsa_tab)
+        self.show_category("asymmetric", [
+            ("RSA", self.create_rsa_interface)
+        ])
     
     def show_signature_tools(self) -> None:
         """Show digital signature tools"""
-        self.menu_frame.pack_forget()
-        self.clear_content_frame()
-        
-        notebook = ctk.CTkTabview(self.content_frame)
-        notebook.pack(fill="both", expand=True, padx=5, pady=5)
-        
-        dsa_tab = notebook.add("DSA")
-        self.create_dsa_interface(dsa_tab)
+        self.show_category("signature", [
+            ("DSA", self.create_dsa_interface),
+            ("ECDSA P-256", self.create_ecdsa_interface),
+            ("Ed25519", self.create_eddsa_interface)
+        ])
     
     # ===== CIPHER INTERFACE CREATORS =====
     def create_caesar_interface(self, parent) -> None:
@@ -929,6 +967,13 @@ class CryptographyApp(ctk.CTk):
         )
         self.des_key.pack(fill="x", padx=5, pady=5)
         
+        self.des_key_id = ctk.CTkEntry(
+            input_frame,
+            placeholder_text="...or the ID of a stored DES key",
+            width=400
+        )
+        self.des_key_id.pack(fill="x", padx=5, pady=5)
+        
         # Text input
         self.des_text = ctk.CTkTextbox(
             input_frame,
@@ -987,16 +1032,10 @@ class CryptographyApp(ctk.CTk):
     def create_rsa_interface(self, parent) -> None:
         """Create RSA cipher interface"""
         # Notebook for different operations
-        notebook = ctk.CTkTabview(parent)
-        notebook.pack(fill="both", expand=True, padx=5, pady=5)
-        
-        # Key generation tab
-        keygen_tab = notebook.add("Key Generation")
-        self.create_rsa_keygen_interface(keygen_tab)
-        
-        # Encryption/Decryption tab
-        crypt_tab = notebook.add("Encryption/Decryption")
-        self.create_rsa_crypt_interface(crypt_tab)
+        self.create_lazy_tabview(parent, [
+            ("Key Generation", self.create_rsa_keygen_interface),
+            ("Encryption/Decryption", self.create_rsa_crypt_interface)
+        ])
 
     def create_rsa_keygen_interface(self, parent) -> None:
         """Create RSA key generation interface"""
@@ -1018,6 +1057,10 @@ class CryptographyApp(ctk.CTk):
         self.rsa_q = ctk.CTkEntry(prime_frame, width=120)
         self.rsa_q.pack(side="left", padx=5)
         
+        ctk.CTkLabel(prime_frame, text="Save as ID:").pack(side="left", padx=5)
+        self.rsa_keygen_id = ctk.CTkEntry(prime_frame, width=120, placeholder_text="optional")
+        self.rsa_keygen_id.pack(side="left", padx=5)
+        
         # Generate button
         generate_btn = ctk.CTkButton(
             input_frame,
@@ -1048,6 +1091,9 @@ class CryptographyApp(ctk.CTk):
         ctk.CTkLabel(priv_frame, text="Private Key (d, n):").pack(side="left", padx=5)
         self.rsa_priv_key = ctk.CTkLabel(priv_frame, text="", font=("Consolas", 10))
         self.rsa_priv_key.pack(side="left", padx=5)
+        
+        self.rsa_generated: Optional[RSAKey] = None
+        self.create_pem_buttons(output_frame, lambda: self.rsa_generated)
 
     def create_rsa_crypt_interface(self, parent) -> None:
         """Create RSA encryption/decryption interface"""
@@ -1067,6 +1113,10 @@ class CryptographyApp(ctk.CTk):
         self.rsa_key_n = ctk.CTkEntry(key_frame, width=120, placeholder_text="n")
         self.rsa_key_n.pack(side="left", padx=5)
         
+        ctk.CTkLabel(key_frame, text="or Key ID:").pack(side="left", padx=5)
+        self.rsa_key_id = ctk.CTkEntry(key_frame, width=120)
+        self.rsa_key_id.pack(side="left", padx=5)
+        
         # Message input
         self.rsa_message = ctk.CTkEntry(
             input_frame,
@@ -1118,16 +1168,10 @@ class CryptographyApp(ctk.CTk):
     def create_dsa_interface(self, parent) -> None:
         """Create DSA interface"""
         # Notebook for different operations
-        notebook = ctk.CTkTabview(parent)
-        notebook.pack(fill="both", expand=True, padx=5, pady=5)
-        
-        # Key generation tab
-        keygen_tab = notebook.add("Key Generation")
-        self.create_dsa_keygen_interface(keygen_tab)
-        
-        # Sign/Verify tab
-        sign_tab = notebook.add("Sign/Verify")
-        self.create_dsa_sign_interface(sign_tab)
+        self.create_lazy_tabview(parent, [
+            ("Key Generation", self.create_dsa_keygen_interface),
+            ("Sign/Verify", self.create_dsa_sign_interface)
+        ])
 
     def create_dsa_keygen_interface(self, parent) -> None:
         """Create DSA key generation interface"""
@@ -1183,6 +1227,9 @@ class CryptographyApp(ctk.CTk):
         ctk.CTkLabel(priv_frame, text="Private Key (x):").pack(side="left", padx=5)
         self.dsa_priv_key = ctk.CTkLabel(priv_frame, text="", font=("Consolas", 10))
         self.dsa_priv_key.pack(side="left", padx=5)
+        
+        self.dsa_generated: Optional[DSAKey] = None
+        self.create_pem_buttons(output_frame, lambda: self.dsa_generated)
 
     def create_dsa_sign_interface(self, parent) -> None:
         """Create DSA signing/verification interface"""
@@ -1212,6 +1259,10 @@ class CryptographyApp(ctk.CTk):
         self.dsa_sign_key = ctk.CTkEntry(key_frame, width=120)
         self.dsa_sign_key.pack(side="left", padx=5)
         
+        ctk.CTkLabel(key_frame, text="or Key ID (instead of parameters and key):").pack(side="left", padx=5)
+        self.dsa_sign_key_id = ctk.CTkEntry(key_frame, width=120)
+        self.dsa_sign_key_id.pack(side="left", padx=5)
+        
         # Message input
         self.dsa_message = ctk.CTkEntry(
             input_frame,
@@ -1270,16 +1321,189 @@ class CryptographyApp(ctk.CTk):
         )
         copy_btn.pack(side="right", padx=5, pady=5)
 
+    def create_ecdsa_interface(self, parent) -> None:
+        """Create ECDSA P-256 interface"""
+        # Input frame
+        input_frame = ctk.CTkFrame(parent, fg_color=DARK_FRAME)
+        input_frame.pack(fill="x", padx=5, pady=5)
+        
+        ctk.CTkLabel(input_frame, text="ECDSA P-256 (SHA-256)", font=FONT_HEADING).pack(anchor="w", pady=(5, 10))
+        
+        # Key inputs
+        key_frame = ctk.CTkFrame(input_frame, fg_color="transparent")
+        key_frame.pack(fill="x", padx=5, pady=5)
+        
+        ctk.CTkLabel(key_frame, text="Private Key (hex):").pack(side="left", padx=5)
+        self.ecdsa_priv_key = ctk.CTkEntry(key_frame, width=400, placeholder_text="d")
+        self.ecdsa_priv_key.pack(side="left", padx=5)
+        
+        ctk.CTkButton(
+            key_frame,
+            text="Generate Keys",
+            command=self.ecdsa_generate_keys,
+            fg_color=ACCENT_COLOR
+        ).pack(side="left", padx=5)
+        
+        self.ecdsa_pub_key = ctk.CTkEntry(
+            input_frame,
+            placeholder_text="Public key (hex, 04 || x || y)...",
+            width=400
+        )
+        self.ecdsa_pub_key.pack(fill="x", padx=5, pady=5)
+        
+        # Message input
+        self.ecdsa_message = ctk.CTkEntry(
+            input_frame,
+            placeholder_text="Enter message...",
+            width=400
+        )
+        self.ecdsa_message.pack(fill="x", padx=5, pady=5)
+        
+        # Signature input (for verification)
+        self.ecdsa_signature = ctk.CTkEntry(
+            input_frame,
+            placeholder_text="Signature (hex, r || s)...",
+            width=400
+        )
+        self.ecdsa_signature.pack(fill="x", padx=5, pady=5)
+        
+        # Button frame
+        button_frame = ctk.CTkFrame(input_frame, fg_color="transparent")
+        button_frame.pack(fill="x", padx=5, pady=10)
+        
+        ctk.CTkButton(
+            button_frame,
+            text="Sign",
+            command=self.ecdsa_sign,
+            fg_color=ACCENT_COLOR
+        ).pack(side="left", padx=5)
+        
+        ctk.CTkButton(
+            button_frame,
+            text="Verify",
+            command=self.ecdsa_verify,
+            fg_color=SECONDARY_COLOR
+        ).pack(side="left", padx=5)
+        
+        # Output frame
+        output_frame = ctk.CTkFrame(parent, fg_color=DARK_FRAME)
+        output_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        
+        ctk.CTkLabel(output_frame, text="Result", font=FONT_HEADING).pack(anchor="w", pady=(5, 10))
+        
+        self.ecdsa_output = ctk.CTkTextbox(
+            output_frame,
+            height=100,
+            wrap="word"
+        )
+        self.ecdsa_output.pack(fill="both", expand=True, padx=5, pady=5)
+        
+        # Copy button
+        copy_btn = ctk.CTkButton(
+            output_frame,
+            text="📋 Copy",
+            width=80,
+            command=lambda: self.copy_to_clipboard(self.ecdsa_output.get("1.0", "end"))
+        )
+        copy_btn.pack(side="right", padx=5, pady=5)
+
+    def create_eddsa_interface(self, parent) -> None:
+        """Create Ed25519 interface"""
+        # Input frame
+        input_frame = ctk.CTkFrame(parent, fg_color=DARK_FRAME)
+        input_frame.pack(fill="x", padx=5, pady=5)
+        
+        ctk.CTkLabel(input_frame, text="Ed25519", font=FONT_HEADING).pack(anchor="w", pady=(5, 10))
+        
+        # Key inputs
+        key_frame = ctk.CTkFrame(input_frame, fg_color="transparent")
+        key_frame.pack(fill="x", padx=5, pady=5)
+        
+        ctk.CTkLabel(key_frame, text="Private Key (hex):").pack(side="left", padx=5)
+        self.eddsa_priv_key = ctk.CTkEntry(key_frame, width=400, placeholder_text="32-byte seed")
+        self.eddsa_priv_key.pack(side="left", padx=5)
+        
+        ctk.CTkButton(
+            key_frame,
+            text="Generate Keys",
+            command=self.eddsa_generate_keys,
+            fg_color=ACCENT_COLOR
+        ).pack(side="left", padx=5)
+        
+        self.eddsa_pub_key = ctk.CTkEntry(
+            input_frame,
+            placeholder_text="Public key (hex, 32 bytes)...",
+            width=400
+        )
+        self.eddsa_pub_key.pack(fill="x", padx=5, pady=5)
+        
+        # Message input
+        self.eddsa_message = ctk.CTkEntry(
+            input_frame,
+            placeholder_text="Enter message...",
+            width=400
+        )
+        self.eddsa_message.pack(fill="x", padx=5, pady=5)
+        
+        # Signature input (for verification)
+        self.eddsa_signature = ctk.CTkEntry(
+            input_frame,
+            placeholder_text="Signature (hex, 64 bytes)...",
+            width=400
+        )
+        self.eddsa_signature.pack(fill="x", padx=5, pady=5)
+        
+        # Button frame
+        button_frame = ctk.CTkFrame(input_frame, fg_color="transparent")
+        button_frame.pack(fill="x", padx=5, pady=10)
+        
+        ctk.CTkButton(
+            button_frame,
+            text="Sign",
+            command=self.eddsa_sign,
+            fg_color=ACCENT_COLOR
+        ).pack(side="left", padx=5)
+        
+        ctk.CTkButton(
+            button_frame,
+            text="Verify",
+            command=self.eddsa_verify,
+            fg_color=SECONDARY_COLOR
+        ).pack(side="left", padx=5)
+        
+        # Output frame
+        output_frame = ctk.CTkFrame(parent, fg_color=DARK_FRAME)
+        output_frame.pack(fill="both", expand=True, padx=5, pady=5)
+        
+        ctk.CTkLabel(output_frame, text="Result", font=FONT_HEADING).pack(anchor="w", pady=(5, 10))
+        
+        self.eddsa_output = ctk.CTkTextbox(
+            output_frame,
+            height=100,
+            wrap="word"
+        )
+        self.eddsa_output.pack(fill="both", expand=True, padx=5, pady=5)
+        
+        # Copy button
+        copy_btn = ctk.CTkButton(
+            output_frame,
+            text="📋 Copy",
+            width=80,
+            command=lambda: self.copy_to_clipboard(self.eddsa_output.get("1.0", "end"))
+        )
+        copy_btn.pack(side="right", padx=5, pady=5)
+
     # ===== CIPHER METHODS =====
     def caesar_encrypt(self) -> None:
         """Handle Caesar cipher encryption"""
         try:
             text = self.caesar_text.get()
             key = int(self.caesar_key.get())
-            result = caesar_cipher(text, key, True)
-            self.caesar_output.delete("1.0", "end")
-            self.caesar_output.insert("1.0", result)
-            self.update_status("Caesar encryption successful!")
+            self.run_job(
+                "Caesar encryption",
+                lambda: caesar_cipher(text, key, True),
+                lambda result: self.set_output(self.caesar_output, result)
+            )
         except Exception as e:
             messagebox.showerror("Error", f"Caesar encryption failed: {str(e)}")
 
@@ -1288,10 +1512,11 @@ class CryptographyApp(ctk.CTk):
         try:
             text = self.caesar_text.get()
             key = int(self.caesar_key.get())
-            result = caesar_cipher(text, key, False)
-            self.caesar_output.delete("1.0", "end")
-            self.caesar_output.insert("1.0", result)
-            self.update_status("Caesar decryption successful!")
+            self.run_job(
+                "Caesar decryption",
+                lambda: caesar_cipher(text, key, False),
+                lambda result: self.set_output(self.caesar_output, result)
+            )
         except Exception as e:
             messagebox.showerror("Error", f"Caesar decryption failed: {str(e)}")
 
@@ -1300,16 +1525,11 @@ class CryptographyApp(ctk.CTk):
         try:
             text = self.playfair_text.get()
             key = self.playfair_key.get()
-            result = playfair_cipher(text, key, True)
-            self.playfair_output.delete("1.0", "end")
-            self.playfair_output.insert("1.0", result)
-            
-            # Update matrix display
-            matrix = prepare_playfair_matrix(key)
-            matrix_str = "\n".join([" ".join(row) for row in matrix])
-            self.matrix_display.configure(text=matrix_str)
-            
-            self.update_status("Playfair encryption successful!")
+            self.run_job(
+                "Playfair encryption",
+                lambda: (playfair_cipher(text, key, True), prepare_playfair_matrix(key)),
+                self._show_playfair_result
+            )
         except Exception as e:
             messagebox.showerror("Error", f"Playfair encryption failed: {str(e)}")
 
@@ -1318,19 +1538,23 @@ class CryptographyApp(ctk.CTk):
         try:
             text = self.playfair_text.get()
             key = self.playfair_key.get()
-            result = playfair_cipher(text, key, False)
-            self.playfair_output.delete("1.0", "end")
-            self.playfair_output.insert("1.0", result)
-            
-            # Update matrix display
-            matrix = prepare_playfair_matrix(key)
-            matrix_str = "\n".join([" ".join(row) for row in matrix])
-            self.matrix_display.configure(text=matrix_str)
-            
-            self.update_status("Playfair decryption successful!")
+            self.run_job(
+                "Playfair decryption",
+                lambda: (playfair_cipher(text, key, False), prepare_playfair_matrix(key)),
+                self._show_playfair_result
+            )
         except Exception as e:
             messagebox.showerror("Error", f"Playfair decryption failed: {str(e)}")
 
+    def _show_playfair_result(self, outcome) -> None:
+        """Display Playfair output and its key matrix"""
+        result, matrix = outcome
+        self.set_output(self.playfair_output, result)
+        
+        # Update matrix display
+        matrix_str = "\n".join([" ".join(row) for row in matrix])
+        self.matrix_display.configure(text=matrix_str)
+
     def hill_encrypt(self) -> None:
         """Handle Hill cipher encryption"""
         try:
@@ -1339,15 +1563,11 @@ class CryptographyApp(ctk.CTk):
                 [int(self.hill_key_a.get()), int(self.hill_key_b.get())],
                 [int(self.hill_key_c.get()), int(self.hill_key_d.get())]
             ]
-            result = hill_cipher(text, key, True)
-            self.hill_output.delete("1.0", "end")
-            self.hill_output.insert("1.0", result)
-            
-            # Update matrix display
-            matrix_str = f"Key Matrix:\n{key[0][0]} {key[0][1]}\n{key[1][0]} {key[1][1]}"
-            self.hill_matrix_display.configure(text=matrix_str)
-            
-            self.update_status("Hill encryption successful!")
+            self.run_job(
+                "Hill encryption",
+                lambda: hill_cipher(text, key, True),
+                lambda result: self._show_hill_result(result, key)
+            )
         except Exception as e:
             messagebox.showerror("Error", f"Hill encryption failed: {str(e)}")
 
@@ -1359,27 +1579,32 @@ class CryptographyApp(ctk.CTk):
                 [int(self.hill_key_a.get()), int(self.hill_key_b.get())],
                 [int(self.hill_key_c.get()), int(self.hill_key_d.get())]
             ]
-            result = hill_cipher(text, key, False)
-            self.hill_output.delete("1.0", "end")
-            self.hill_output.insert("1.0", result)
-            
-            # Update matrix display
-            matrix_str = f"Key Matrix:\n{key[0][0]} {key[0][1]}\n{key[1][0]} {key[1][1]}"
-            self.hill_matrix_display.configure(text=matrix_str)
-            
-            self.update_status("Hill decryption successful!")
+            self.run_job(
+                "Hill decryption",
+                lambda: hill_cipher(text, key, False),
+                lambda result: self._show_hill_result(result, key)
+            )
         except Exception as e:
             messagebox.showerror("Error", f"Hill decryption failed: {str(e)}")
 
+    def _show_hill_result(self, result: str, key: List[List[int]]) -> None:
+        """Display Hill output and its key matrix"""
+        self.set_output(self.hill_output, result)
+        
+        # Update matrix display
+        matrix_str = f"Key Matrix:\n{key[0][0]} {key[0][1]}\n{key[1][0]} {key[1][1]}"
+        self.hill_matrix_display.configure(text=matrix_str)
+
     def vigenere_encrypt(self) -> None:
         """Handle Vigenère cipher encryption"""
         try:
             text = self.vigenere_text.get()
             key = self.vigenere_key.get()
-            result = vigenere_cipher(text, key, True)
-            self.vigenere_output.delete("1.0", "end")
-            self.vigenere_output.insert("1.0", result)
-            self.update_status("Vigenère encryption successful!")
+            self.run_job(
+                "Vigenère encryption",
+                lambda: vigenere_cipher(text, key, True),
+                lambda result: self.set_output(self.vigenere_output, result)
+            )
         except Exception as e:
             messagebox.showerror("Error", f"Vigenère encryption failed: {str(e)}")
 
@@ -1388,10 +1613,11 @@ class CryptographyApp(ctk.CTk):
         try:
             text = self.vigenere_text.get()
             key = self.vigenere_key.get()
-            result = vigenere_cipher(text, key, False)
-            self.vigenere_output.delete("1.0", "end")
-            self.vigenere_output.insert("1.0", result)
-            self.update_status("Vigenère decryption successful!")
+            self.run_job(
+                "Vigenère decryption",
+                lambda: vigenere_cipher(text, key, False),
+                lambda result: self.set_output(self.vigenere_output, result)
+            )
         except Exception as e:
             messagebox.showerror("Error", f"Vigenère decryption failed: {str(e)}")
 
@@ -1400,10 +1626,11 @@ class CryptographyApp(ctk.CTk):
         try:
             text = self.rail_fence_text.get()
             rails = int(self.rail_fence_rails.get())
-            result = rail_fence_cipher(text, rails, True)
-            self.rail_fence_output.delete("1.0", "end")
-            self.rail_fence_output.insert("1.0", result)
-            self.update_status("Rail Fence encryption successful!")
+            self.run_job(
+                "Rail Fence encryption",
+                lambda: rail_fence_cipher(text, rails, True),
+                lambda result: self.set_output(self.rail_fence_output, result)
+            )
         except Exception as e:
             messagebox.showerror("Error", f"Rail Fence encryption failed: {str(e)}")
 
@@ -1412,95 +1639,103 @@ class CryptographyApp(ctk.CTk):
         try:
             text = self.rail_fence_text.get()
             rails = int(self.rail_fence_rails.get())
-            result = rail_fence_cipher(text, rails, False)
-            self.rail_fence_output.delete("1.0", "end")
-            self.rail_fence_output.insert("1.0", result)
-            self.update_status("Rail Fence decryption successful!")
+            self.run_job(
+                "Rail Fence decryption",
+                lambda: rail_fence_cipher(text, rails, False),
+                lambda result: self.set_output(self.rail_fence_output, result)
+            )
         except Exception as e:
             messagebox.showerror("Error", f"Rail Fence decryption failed: {str(e)}")
 
     def des_encrypt(self) -> None:
         """Handle DES encryption"""
         try:
+            stored = self.stored_key(self.des_key_id, "des")
             key = self.des_key.get()
             text = self.des_text.get("1.0", "end-1c")
             
-            if len(key) != 8:
+            if stored is None and len(key) != 8:
                 raise ValueError("Key must be exactly 8 characters")
             
             # Convert to bytes
-            key_bytes = key.encode('latin-1')
+            key_bytes = stored.key if stored is not None else key.encode('latin-1')
             text_bytes = text.encode('latin-1')
             
-            # Pad text to be multiple of 8 bytes
-            pad_len = 8 - (len(text_bytes) % 8)
-            text_bytes += bytes([pad_len] * pad_len)
-            
-            # Simple XOR "encryption" for demonstration
-            # In a real implementation, you would use proper DES here
-            encrypted = bytes([text_bytes[i] ^ key_bytes[i % 8] for i in range(len(text_bytes))])
-            
-            # Display results
-            self.des_output.delete("1.0", "end")
-            self.des_output.insert("1.0", encrypted.hex())
-            
-            self.byte_display.configure(text=f"Hex: {encrypted.hex()}")
-            self.update_status("DES encryption successful!")
+            self.run_job(
+                "DES encryption",
+                lambda: des_xor_encrypt(text_bytes, key_bytes),
+                self._show_des_result
+            )
         except Exception as e:
             messagebox.showerror("Error", f"DES encryption failed: {str(e)}")
 
+    def _show_des_result(self, encrypted: bytes) -> None:
+        """Display DES output as hex"""
+        self.set_output(self.des_output, encrypted.hex())
+        self.byte_display.configure(text=f"Hex: {encrypted.hex()}")
+
     def rsa_generate_keys(self) -> None:
         """Generate RSA keys"""
         try:
             p = int(self.rsa_p.get())
             q = int(self.rsa_q.get())
-            
-            if not self.is_prime(p) or not self.is_prime(q):
-                raise ValueError("Both numbers must be prime")
-            
-            n = p * q
-            phi = (p - 1) * (q - 1)
-            
-            e = 2
-            while e < phi:
-                if math.gcd(e, phi) == 1:
-                    break
-                e += 1
-            
-            d = self.mod_inverse(e, phi)
-            
-            # Display keys
-            self.rsa_pub_key.configure(text=f"{e}, {n}")
-            self.rsa_priv_key.configure(text=f"{d}, {n}")
-            self.update_status("RSA key generation successful!")
+            key_id = self.rsa_keygen_id.get().strip()
+            self.run_job("RSA key generation", lambda: self._generate_rsa_key(p, q, key_id),
+                         self._show_rsa_keys)
         except Exception as e:
             messagebox.showerror("Error", f"RSA key generation failed: {str(e)}")
 
+    def _generate_rsa_key(self, p: int, q: int, key_id: str = "") -> RSAKey:
+        """Generate an RSA key, and store it under key_id if one is given (runs in the background)"""
+        e, d, n = rsa_generate_keys(p, q)
+        key = RSAKey(n, e, d, p, q)
+        if key_id:
+            with KeyStore(writable=True) as store:
+                store.put(key_id, key)
+        return key
+
+    def _show_rsa_keys(self, key: RSAKey) -> None:
+        """Display generated RSA keys"""
+        self.rsa_pub_key.configure(text=f"{key.e}, {key.n}")
+        self.rsa_priv_key.configure(text=f"{key.d}, {key.n}")
+        self.rsa_generated = key
+
     def rsa_encrypt(self) -> None:
         """Handle RSA encryption"""
         try:
-            e = int(self.rsa_key_e.get())
-            n = int(self.rsa_key_n.get())
+            stored = self.stored_key(self.rsa_key_id, "rsa")
             msg = int(self.rsa_message.get())
-            
-            cipher = pow(msg, e, n)
-            self.rsa_output.delete("1.0", "end")
-            self.rsa_output.insert("1.0", str(cipher))
-            self.update_status("RSA encryption successful!")
+            if stored is not None:
+                work = lambda: stored.encrypt(msg)
+            else:
+                e = int(self.rsa_key_e.get())
+                n = int(self.rsa_key_n.get())
+                work = lambda: rsa_encrypt(msg, e, n)
+            self.run_job(
+                "RSA encryption",
+                work,
+                lambda cipher: self.set_output(self.rsa_output, str(cipher))
+            )
         except Exception as e:
             messagebox.showerror("Error", f"RSA encryption failed: {str(e)}")
 
     def rsa_decrypt(self) -> None:
         """Handle RSA decryption"""
         try:
-            d = int(self.rsa_key_e.get())
-            n = int(self.rsa_key_n.get())
+            stored = self.stored_key(self.rsa_key_id, "rsa")
             cipher = int(self.rsa_message.get())
-            
-            msg = pow(cipher, d, n)
-            self.rsa_output.delete("1.0", "end")
-            self.rsa_output.insert("1.0", str(msg))
-            self.update_status("RSA decryption successful!")
+            if stored is not None:
+                # Stored keys with their primes decrypt through the CRT
+                work = lambda: stored.decrypt(cipher)
+            else:
+                d = int(self.rsa_key_e.get())
+                n = int(self.rsa_key_n.get())
+                work = lambda: rsa_decrypt(cipher, d, n)
+            self.run_job(
+                "RSA decryption",
+                work,
+                lambda msg: self.set_output(self.rsa_output, str(msg))
+            )
         except Exception as e:
             messagebox.showerror("Error", f"RSA decryption failed: {str(e)}")
 
@@ -1512,91 +1747,192 @@ class CryptographyApp(ctk.CTk):
             g = int(self.dsa_g.get())
             
             x = 2  # In real implementation, this would be a random number
-            y = pow(g, x, p)
-            
-            # Display keys
-            self.dsa_pub_key.configure(text=str(y))
-            self.dsa_priv_key.configure(text=str(x))
-            self.update_status("DSA key generation successful!")
+            self.run_job("DSA key generation", lambda: dsa_public_key(x, p, g), lambda y: self._show_dsa_keys(x, y, (p, q, g)))
         except Exception as e:
             messagebox.showerror("Error", f"DSA key generation failed: {str(e)}")
 
+    def _show_dsa_keys(self, x: int, y: int, params: Tuple[int, int, int]) -> None:
+        """Display generated DSA keys"""
+        self.dsa_pub_key.configure(text=str(y))
+        self.dsa_priv_key.configure(text=str(x))
+        self.dsa_generated = DSAKey(DSADomain(*params), y, x)
+
     def dsa_sign(self) -> None:
         """Handle DSA signing"""
         try:
-            p = int(self.dsa_sign_p.get())
-            q = int(self.dsa_sign_q.get())
-            g = int(self.dsa_sign_g.get())
-            x = int(self.dsa_sign_key.get())
+            stored = self.stored_key(self.dsa_sign_key_id, "dsa")
             msg = self.dsa_message.get()
+            if stored is not None:
+                # Random k, and g^k from the domain's cached fixed-base table
+                h = hash(msg) % stored.domain.q
+                work = lambda: stored.sign(h)
+            else:
+                p = int(self.dsa_sign_p.get())
+                q = int(self.dsa_sign_q.get())
+                g = int(self.dsa_sign_g.get())
+                x = int(self.dsa_sign_key.get())
+                
+                # Simplified signing process
+                k = 2  # In real implementation, this would be random
+                h = hash(msg) % q
+                work = lambda: dsa_sign(h, x, p, q, g, k)
             
-            # Simplified signing process
-            k = 2  # In real implementation, this would be random
-            r = pow(g, k, p) % q
-            h = hash(msg) % q
-            s = (self.mod_inverse(k, q) * (h + x * r)) % q
-            
-            self.dsa_output.delete("1.0", "end")
-            self.dsa_output.insert("1.0", f"Signature (r, s): {r}, {s}")
-            self.update_status("DSA signing successful!")
+            self.run_job(
+                "DSA signing",
+                work,
+                lambda sig: self.set_output(self.dsa_output, f"Signature (r, s): {sig[0]}, {sig[1]}")
+            )
         except Exception as e:
             messagebox.showerror("Error", f"DSA signing failed: {str(e)}")
 
     def dsa_verify(self) -> None:
         """Handle DSA verification"""
         try:
-            p = int(self.dsa_sign_p.get())
-            q = int(self.dsa_sign_q.get())
-            g = int(self.dsa_sign_g.get())
-            y = int(self.dsa_sign_key.get())
+            stored = self.stored_key(self.dsa_sign_key_id, "dsa")
             msg = self.dsa_message.get()
             r = int(self.dsa_sign_r.get())
             s = int(self.dsa_sign_s.get())
-            
-            # Simplified verification process
-            w = self.mod_inverse(s, q)
-            h = hash(msg) % q
-            u1 = (h * w) % q
-            u2 = (r * w) % q
-            v = (pow(g, u1, p) * pow(y, u2, p) % p) % q
-            
-            if v == r:
-                result = "Signature is valid!"
+            if stored is not None:
+                h = hash(msg) % stored.domain.q
+                verify = lambda: stored.verify(h, r, s)
             else:
-                result = "Signature is invalid!"
+                p = int(self.dsa_sign_p.get())
+                q = int(self.dsa_sign_q.get())
+                g = int(self.dsa_sign_g.get())
+                y = int(self.dsa_sign_key.get())
+                
+                # Simplified verification process
+                h = hash(msg) % q
+                verify = lambda: dsa_verify(h, r, s, y, p, q, g)
             
-            self.dsa_output.delete("1.0", "end")
-            self.dsa_output.insert("1.0", result)
-            self.update_status("DSA verification successful!")
+            self.run_job(
+                "DSA verification",
+                lambda: "Signature is valid!" if verify() else "Signature is invalid!",
+                lambda result: self.set_output(self.dsa_output, result)
+            )
         except Exception as e:
             messagebox.showerror("Error", f"DSA verification failed: {str(e)}")
 
+    def ecdsa_generate_keys(self) -> None:
+        """Generate ECDSA P-256 keys"""
+        self.run_job("ECDSA key generation", ecdsa_p256_generate_keys, self._show_ecdsa_keys)
+
+    def _show_ecdsa_keys(self, keys) -> None:
+        """Display generated ECDSA keys"""
+        d, Q = keys
+        self.ecdsa_priv_key.delete(0, "end")
+        self.ecdsa_priv_key.insert(0, f"{d:064x}")
+        self.ecdsa_pub_key.delete(0, "end")
+        self.ecdsa_pub_key.insert(0, p256_encode_point(Q).hex())
+
+    def ecdsa_sign(self) -> None:
+        """Handle ECDSA signing"""
+        try:
+            d = int(self.ecdsa_priv_key.get(), 16)
+            msg = self.ecdsa_message.get().encode('utf-8')
+            self.run_job("ECDSA signing", lambda: ecdsa_p256_sign(msg, d), self._show_ecdsa_signature)
+        except Exception as e:
+            messagebox.showerror("Error", f"ECDSA signing failed: {str(e)}")
+
+    def _show_ecdsa_signature(self, sig: Tuple[int, int]) -> None:
+        """Display an ECDSA signature as r || s"""
+        r, s = sig
+        signature = r.to_bytes(32, "big") + s.to_bytes(32, "big")
+        self.ecdsa_signature.delete(0, "end")
+        self.ecdsa_signature.insert(0, signature.hex())
+        self.set_output(self.ecdsa_output, f"Signature (r || s): {signature.hex()}")
+
+    def ecdsa_verify(self) -> None:
+        """Handle ECDSA verification"""
+        try:
+            Q = p256_decode_point(bytes.fromhex(self.ecdsa_pub_key.get()))
+            msg = self.ecdsa_message.get().encode('utf-8')
+            signature = bytes.fromhex(self.ecdsa_signature.get())
+            if len(signature) != 64:
+                raise ValueError("Signature must be 64 bytes (r || s)")
+            r = int.from_bytes(signature[:32], "big")
+            s = int.from_bytes(signature[32:], "big")
+            
+            self.run_job(
+                "ECDSA verification",
+                lambda: "Signature is valid!" if ecdsa_p256_verify(msg, (r, s), Q) else "Signature is invalid!",
+                lambda result: self.set_output(self.ecdsa_output, result)
+            )
+        except Exception as e:
+            messagebox.showerror("Error", f"ECDSA verification failed: {str(e)}")
+
+    def eddsa_generate_keys(self) -> None:
+        """Generate Ed25519 keys"""
+        self.run_job("Ed25519 key generation", ed25519_generate_keys, self._show_eddsa_keys)
+
+    def _show_eddsa_keys(self, keys: Tuple[bytes, bytes]) -> None:
+        """Display generated Ed25519 keys"""
+        seed, public_key = keys
+        self.eddsa_priv_key.delete(0, "end")
+        self.eddsa_priv_key.insert(0, seed.hex())
+        self.eddsa_pub_key.delete(0, "end")
+        self.eddsa_pub_key.insert(0, public_key.hex())
+
+    def eddsa_sign(self) -> None:
+        """Handle Ed25519 signing"""
+        try:
+            seed = bytes.fromhex(self.eddsa_priv_key.get())
+            msg = self.eddsa_message.get().encode('utf-8')
+            self.run_job("Ed25519 signing", lambda: ed25519_sign(msg, seed), self._show_eddsa_signature)
+        except Exception as e:
+            messagebox.showerror("Error", f"Ed25519 signing failed: {str(e)}")
+
+    def _show_eddsa_signature(self, signature: bytes) -> None:
+        """Display an Ed25519 signature"""
+        self.eddsa_signature.delete(0, "end")
+        self.eddsa_signature.insert(0, signature.hex())
+        self.set_output(self.eddsa_output, f"Signature: {signature.hex()}")
+
+    def eddsa_verify(self) -> None:
+        """Handle Ed25519 verification"""
+        try:
+            public_key = bytes.fromhex(self.eddsa_pub_key.get())
+            msg = self.eddsa_message.get().encode('utf-8')
+            signature = bytes.fromhex(self.eddsa_signature.get())
+            
+            self.run_job(
+                "Ed25519 verification",
+                lambda: "Signature is valid!" if ed25519_verify(msg, signature, public_key) else "Signature is invalid!",
+                lambda result: self.set_output(self.eddsa_output, result)
+            )
+        except Exception as e:
+            messagebox.showerror("Error", f"Ed25519 verification failed: {str(e)}")
+
     # ===== HELPER METHODS =====
+    def create_pem_buttons(self, parent, generated: Callable[[], Any]) -> None:
+        """Buttons that copy the key generated() returns as PKCS#8 / SPKI PEM"""
+        button_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        button_frame.pack(fill="x", padx=5, pady=5)
+        
+        for text, public in (("📋 Private Key PEM", False), ("📋 Public Key PEM", True)):
+            ctk.CTkButton(
+                button_frame,
+                text=text,
+                width=140,
+                command=lambda public=public: self.copy_key_pem(generated(), public)
+            ).pack(side="left", padx=5)
+    
+    def copy_key_pem(self, key, public: bool) -> None:
+        """Copy a generated key to the clipboard as PEM"""
+        if key is None:
+            messagebox.showinfo("PEM", "Generate keys first")
+            return
+        try:
+            self.copy_to_clipboard(key_to_pem(key, public=public))
+        except Exception as e:
+            messagebox.showerror("Error", f"PEM export failed: {str(e)}")
+    
     def copy_to_clipboard(self, text: str) -> None:
         """Copy text to clipboard"""
         self.clipboard_clear()
         self.clipboard_append(text)
         self.update_status("Copied to clipboard!")
 
-    @staticmethod
-    def is_prime(n: int) -> bool:
-        """Check if a number is prime"""
-        if n <= 1:
-            return False
-        for i in range(2, int(math.sqrt(n)) + 1):
-            if n % i == 0:
-                return False
-        return True
-
-    @staticmethod
-    def mod_inverse(a: int, m: int) -> int:
-        """Find modular inverse of a under modulo m"""
-        a = a % m
-        for x in range(1, m):
-            if (a * x) % m == 1:
-                return x
-        return -1
-
 if __name__ == "__main__":
     app = CryptographyApp()
     app.mainloop()
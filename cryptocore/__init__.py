@@ -0,0 +1,88 @@
+"""Headless cryptography core used by the GUI (combined.py) and the CLI (main.py).
+
+Nothing in this package imports tkinter. Submodules are loaded on first
+attribute access, so ``import cryptocore`` is almost free and
+``from cryptocore import caesar_cipher`` only loads the classical ciphers.
+The hot modules also avoid importing ``typing`` at runtime (annotations are
+postponed and only resolved by type checkers), and optional heavy
+dependencies such as NumPy are imported lazily through ``_optional``.
+"""
+_EXPORTS = {
+    # Classical ciphers
+    "caesar_cipher": "classical",
+    "prepare_playfair_matrix": "classical",
+    "playfair_cipher": "classical",
+    "hill_cipher": "classical",
+    "vigenere_cipher": "classical",
+    "rail_fence_cipher": "classical",
+    # Batch classical ciphers
+    "caesar_batch": "batch",
+    "vigenere_batch": "batch",
+    "playfair_batch": "batch",
+    "hill_batch": "batch",
+    "rail_fence_batch": "batch",
+    # Number theory
+    "is_prime": "numtheory",
+    "gcd": "numtheory",
+    "mod_inverse": "numtheory",
+    # DES
+    "des_key_schedule": "des",
+    "des_encrypt_block": "des",
+    "des_encrypt": "des",
+    "des_xor_encrypt": "des",
+    # RSA
+    "rsa_generate_keys": "rsa",
+    "rsa_encrypt": "rsa",
+    "rsa_decrypt": "rsa",
+    "rsa_crt_params": "rsa",
+    "rsa_decrypt_crt": "rsa",
+    "RSABlinding": "rsa",
+    "rsa_random_primes": "rsa",
+    "rsa_multi_crt_params": "rsa",
+    "rsa_decrypt_multi_crt": "rsa",
+    # DSA
+    "dsa_public_key": "dsa",
+    "dsa_sign": "dsa",
+    "dsa_verify": "dsa",
+    "dsa_base_table": "dsa",
+    "dsa_sign_fixed": "dsa",
+    "dsa_verify_fixed": "dsa",
+    # Key store
+    "KeyStore": "keystore",
+    "RSAKey": "keystore",
+    "DSADomain": "keystore",
+    "DSAKey": "keystore",
+    "DESKey": "keystore",
+    # Key files (PEM/DER)
+    "key_to_der": "keyio",
+    "key_to_pem": "keyio",
+    "key_from_der": "keyio",
+    "key_from_pem": "keyio",
+    "load_key": "keyio",
+    "load_key_file": "keyio",
+    "fingerprint": "keyio",
+    # Elliptic curve signatures
+    "ecdsa_p256_generate_keys": "ecc",
+    "ecdsa_p256_public_key": "ecc",
+    "ecdsa_p256_sign": "ecc",
+    "ecdsa_p256_verify": "ecc",
+    "p256_encode_point": "ecc",
+    "p256_decode_point": "ecc",
+    "ed25519_generate_keys": "ecc",
+    "ed25519_public_key": "ecc",
+    "ed25519_sign": "ecc",
+    "ed25519_verify": "ecc",
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(__import__(f"{__name__}.{module}", fromlist=[name]), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
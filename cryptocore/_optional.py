@@ -0,0 +1,8 @@
+import importlib
+
+def numpy():
+    """Import NumPy on first use so the core stays cheap to import"""
+    try:
+        return importlib.import_module("numpy")
+    except ImportError as e:
+        raise ImportError("This feature requires NumPy (pip install numpy)") from e
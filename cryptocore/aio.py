@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Optional, Union
+
+from . import batch, classical, des, dsa, ecc, rsa, stream
+
+# ===== ASYNC API =====
+# Awaitable versions of the cipher entry points, for use from an event loop:
+#
+#   from cryptocore import aio
+#   text = await aio.vigenere_cipher(text, "KEY", True)
+#   async for chunk in aio.des_ctr_stream(reader_chunks, key, iv): ...
+#
+# A call whose input is small runs inline, because handing it to another
+# thread or process would cost more than the work itself. Anything larger,
+# and every operation that is slow whatever its input (key generation,
+# public-key exponentiations with real-sized exponents, elliptic curves),
+# runs on a shared executor so the event loop is never blocked. The default
+# executor is a process pool (so the work also runs in parallel); replace it
+# with set_executor(), e.g. with a ThreadPoolExecutor in programs that must
+# not start processes.
+INLINE_TEXT = 1024   # characters of classical cipher text (~0.2-3 ms)
+INLINE_DES = 64      # bytes of DES input (~0.25 ms)
+INLINE_BITS = 64     # exponentiations with an exponent or modulus this small
+
+_executor: Optional[Executor] = None
+
+def get_executor() -> Executor:
+    """The shared executor for heavy calls, created on first use"""
+    global _executor
+    if _executor is None:
+        from concurrent.futures import ProcessPoolExecutor
+        _executor = ProcessPoolExecutor()
+    return _executor
+
+def set_executor(executor: Optional[Executor]) -> None:
+    """Use another executor for heavy calls (None goes back to the default process pool).
+    
+    The previous executor is not shut down.
+    """
+    global _executor
+    _executor = executor
+
+async def run(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run fn(*args, **kwargs) on the shared executor and await its result"""
+    if kwargs:
+        fn = functools.partial(fn, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), fn, *args)
+
+def awaitable(fn: Callable[..., Any], inline: Callable[..., bool]) -> Callable[..., Any]:
+    """Coroutine version of fn that runs inline when inline(*args, **kwargs) is true"""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if inline(*args, **kwargs):
+            return fn(*args, **kwargs)
+        return await run(fn, *args, **kwargs)
+    return wrapper
+
+# ----- Size rules -----
+def _never(*args, **kwargs) -> bool:
+    return False
+
+def _short_text(text: str, *args, **kwargs) -> bool:
+    return len(text) <= INLINE_TEXT
+
+def _short_playfair(text: str, *args, **kwargs) -> bool:
+    # Playfair costs about ten times as much per character as the others
+    return len(text) <= INLINE_TEXT // 8
+
+def _short_texts(texts, *args, **kwargs) -> bool:
+    # One-shot iterators have no size and go to the executor (materialized by _batch)
+    return hasattr(texts, "__len__") and batch.texts_size(texts) <= INLINE_TEXT
+
+def _short_des(plaintext: bytes, *args, **kwargs) -> bool:
+    return len(plaintext) <= INLINE_DES
+
+def _small_power(exponent: int, modulus: int) -> bool:
+    return exponent.bit_length() <= INLINE_BITS or modulus.bit_length() <= INLINE_BITS
+
+def _small_rsa(value: int, exponent: int, n: int, *args, **kwargs) -> bool:
+    return _small_power(exponent, n)
+
+def _small_primes(p: int, q: int, *others: int) -> bool:
+    return (p * q).bit_length() + sum(r.bit_length() for r in others) <= INLINE_BITS
+
+def _small_crt(cipher: int, p: int, q: int, dp: int, dq: int, q_inv: int, *args, **kwargs) -> bool:
+    return _small_power(max(dp, dq), max(p, q))
+
+def _small_multi_crt(cipher: int, primes, exponents, *args, **kwargs) -> bool:
+    return _small_power(max(exponents), max(primes))
+
+def _small_dsa_public(x: int, p: int, g: int) -> bool:
+    return _small_power(x, p)
+
+def _small_dsa_sign(h: int, x: int, p: int, *args) -> bool:
+    return p.bit_length() <= INLINE_BITS
+
+def _small_dsa_verify(h: int, r: int, s: int, y: int, p: int, *args) -> bool:
+    return p.bit_length() <= INLINE_BITS
+
+# ----- Cipher calls -----
+caesar_cipher = awaitable(classical.caesar_cipher, _short_text)
+playfair_cipher = awaitable(classical.playfair_cipher, _short_playfair)
+hill_cipher = awaitable(classical.hill_cipher, _short_text)
+vigenere_cipher = awaitable(classical.vigenere_cipher, _short_text)
+rail_fence_cipher = awaitable(classical.rail_fence_cipher, _short_text)
+
+def _batch(fn: Callable[..., Any]) -> Callable[..., Any]:
+    coroutine = awaitable(fn, _short_texts)
+    
+    @functools.wraps(fn)
+    async def wrapper(texts, keys, encrypt: bool = True):
+        # Generators cannot be sent to another process
+        if not isinstance(texts, str) and not hasattr(texts, "__len__"):
+            texts = list(texts)
+        if not isinstance(keys, (str, int)) and not hasattr(keys, "__len__"):
+            keys = list(keys)
+        return await coroutine(texts, keys, encrypt)
+    return wrapper
+
+caesar_batch = _batch(batch.caesar_batch)
+vigenere_batch = _batch(batch.vigenere_batch)
+playfair_batch = _batch(batch.playfair_batch)
+hill_batch = _batch(batch.hill_batch)
+rail_fence_batch = _batch(batch.rail_fence_batch)
+
+des_encrypt = awaitable(des.des_encrypt, _short_des)
+des_xor_encrypt = awaitable(des.des_xor_encrypt, _short_des)
+
+rsa_generate_keys = awaitable(rsa.rsa_generate_keys, _small_primes)
+rsa_encrypt = awaitable(rsa.rsa_encrypt, _small_rsa)
+rsa_decrypt = awaitable(rsa.rsa_decrypt, _small_rsa)
+rsa_decrypt_crt = awaitable(rsa.rsa_decrypt_crt, _small_crt)
+rsa_decrypt_multi_crt = awaitable(rsa.rsa_decrypt_multi_crt, _small_multi_crt)
+
+dsa_public_key = awaitable(dsa.dsa_public_key, _small_dsa_public)
+dsa_sign = awaitable(dsa.dsa_sign, _small_dsa_sign)
+dsa_verify = awaitable(dsa.dsa_verify, _small_dsa_verify)
+dsa_base_table = awaitable(dsa.dsa_base_table, _never)
+dsa_sign_fixed = awaitable(dsa.dsa_sign_fixed, _small_dsa_sign)
+dsa_verify_fixed = awaitable(dsa.dsa_verify_fixed, _small_dsa_verify)
+
+ecdsa_p256_generate_keys = awaitable(ecc.ecdsa_p256_generate_keys, _never)
+ecdsa_p256_public_key = awaitable(ecc.ecdsa_p256_public_key, _never)
+ecdsa_p256_sign = awaitable(ecc.ecdsa_p256_sign, _never)
+ecdsa_p256_verify = awaitable(ecc.ecdsa_p256_verify, _never)
+ed25519_generate_keys = awaitable(ecc.ed25519_generate_keys, _never)
+ed25519_public_key = awaitable(ecc.ed25519_public_key, _never)
+ed25519_sign = awaitable(ecc.ed25519_sign, _never)
+ed25519_verify = awaitable(ecc.ed25519_verify, _never)
+
+# ----- Streams -----
+_END = object()
+
+async def _next_chunk(chunks: AsyncIterator[bytes]) -> Any:
+    try:
+        return await chunks.__anext__()
+    except StopAsyncIteration:
+        return _END
+
+async def _stream(stream_fn: Callable[..., Iterator[bytes]],
+                  chunks: Union[AsyncIterable[bytes], Iterable[bytes]], *args) -> AsyncIterator[bytes]:
+    """Run a streaming engine over an async (or plain) iterable of chunks.
+    
+    The engine runs on a thread of its own, one output chunk per step, and
+    pulls its input from the event loop as it needs it. Nothing is read
+    ahead of what the consumer asks for, so backpressure passes straight
+    through from the consumer to the source.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    loop = asyncio.get_running_loop()
+    if hasattr(chunks, "__aiter__"):
+        source = chunks.__aiter__()
+        
+        def pull() -> Iterator[bytes]:
+            while True:
+                chunk = asyncio.run_coroutine_threadsafe(_next_chunk(source), loop).result()
+                if chunk is _END:
+                    return
+                yield chunk
+        inputs = pull()
+    else:
+        inputs = iter(chunks)
+    
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="cryptocore-aio") as thread:
+        engine = stream_fn(inputs, *args)
+        try:
+            while True:
+                chunk = await loop.run_in_executor(thread, next, engine, _END)
+                if chunk is _END:
+                    return
+                yield chunk
+        finally:
+            await loop.run_in_executor(thread, engine.close)
+
+def caesar_stream(chunks, key: int, encrypt: bool) -> AsyncIterator[bytes]:
+    """Async iterator version of stream.caesar_stream"""
+    return _stream(stream.caesar_stream, chunks, key, encrypt)
+
+def vigenere_stream(chunks, key: str, encrypt: bool) -> AsyncIterator[bytes]:
+    """Async iterator version of stream.vigenere_stream"""
+    return _stream(stream.vigenere_stream, chunks, key, encrypt)
+
+def des_ctr_stream(chunks, key: bytes, iv: bytes) -> AsyncIterator[bytes]:
+    """Async iterator version of stream.des_ctr_stream"""
+    return _stream(stream.des_ctr_stream, chunks, key, iv)
+
+def des_ecb_stream(chunks, key: bytes, encrypt: bool) -> AsyncIterator[bytes]:
+    """Async iterator version of stream.des_ecb_stream"""
+    return _stream(stream.des_ecb_stream, chunks, key, encrypt)
+
+async def read_chunks(reader: asyncio.StreamReader, chunk_size: int = stream.CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Async version of stream.read_chunks for an asyncio StreamReader"""
+    while True:
+        chunk = await reader.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
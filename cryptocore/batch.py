@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import functools
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ._optional import numpy
+from .classical import (SIZE, caesar_cipher, hill_cipher, prepare_playfair_matrix, rail_fence_cipher,
+                        vigenere_cipher)
+from .metrics import instrument
+from .numtheory import mod_inverse
+
+# ===== BATCH CIPHERS =====
+# Each *_batch function encrypts (or decrypts) many texts under one key, one
+# text under many keys, or texts and keys pairwise, and returns the results
+# in input order. Per-key state (tables, inverse matrices, permutations) is
+# built once per distinct key, and per-text state once per distinct text,
+# and the output always matches the single-call function in classical.py.
+
+# Below this many characters a NumPy call costs more than the plain loop
+SMALL_TEXT = 48
+
+def _optional_numpy():
+    try:
+        return numpy()
+    except ImportError:
+        return None
+
+def broadcast(texts: Union[str, Sequence[str]], keys: Any,
+              is_single_key: Callable[[Any], bool]) -> List[Tuple[str, Any]]:
+    """Pair texts with keys; a single text or key is repeated to match the other"""
+    texts = [texts] if isinstance(texts, str) else list(texts)
+    keys = [keys] if is_single_key(keys) else list(keys)
+    if len(texts) == 1 and len(keys) != 1:
+        texts = texts * len(keys)
+    elif len(keys) == 1 and len(texts) != 1:
+        keys = keys * len(texts)
+    if len(texts) != len(keys):
+        raise ValueError(f"Got {len(texts)} texts but {len(keys)} keys")
+    return list(zip(texts, keys))
+
+def texts_size(texts: Union[str, Sequence[str]], *args, **kwargs) -> int:
+    """Characters processed by a batch call (0 for one-shot iterators, which must not be consumed)"""
+    if isinstance(texts, str):
+        return len(texts)
+    return sum(len(t) for t in texts) if hasattr(texts, "__len__") else 0
+
+def _run(jobs: List[Tuple[str, Any]], key_id: Callable[[Any], Any],
+         engine: Callable[[Any], Callable[[str], str]]) -> List[str]:
+    """Apply each job with an engine built once per distinct key"""
+    engines: Dict[Any, Callable[[str], str]] = {}
+    results = []
+    for text, key in jobs:
+        ident = key_id(key)
+        fn = engines.get(ident)
+        if fn is None:
+            fn = engines[ident] = engine(key)
+        results.append(fn(text))
+    return results
+
+# ----- Caesar -----
+def caesar_table(key: int, encrypt: bool) -> Dict[int, str]:
+    """str.translate table that shifts ASCII letters exactly like caesar_cipher"""
+    shift = key if encrypt else -key
+    table = {}
+    for base in (ord('A'), ord('a')):
+        for i in range(26):
+            table[base + i] = chr(base + (i + shift) % 26)
+    return table
+
+def caesar_engine(key: int, encrypt: bool = True) -> Callable[[str], str]:
+    """caesar_cipher under one key, as a translate table"""
+    key = int(key) % 26
+    table = caesar_table(key, encrypt)
+    
+    def apply(text: str) -> str:
+        mapping = table
+        if not text.isascii():
+            # caesar_cipher also shifts non-ASCII cased letters (into A-Z/a-z);
+            # add exactly the ones this text contains
+            extra = {ord(c): caesar_cipher(c, key, encrypt) for c in set(text)
+                     if ord(c) > 127 and (c.isupper() or c.islower())}
+            if extra:
+                mapping = {**table, **extra}
+        return text.translate(mapping)
+    return apply
+
+@instrument(texts_size)
+def caesar_batch(texts: Union[str, Sequence[str]], keys: Union[int, Iterable[int]],
+                 encrypt: bool = True) -> List[str]:
+    jobs = broadcast(texts, keys, lambda k: not hasattr(k, "__iter__"))
+    # Only the key mod 26 matters, so there are at most 26 tables
+    return _run(jobs, lambda k: int(k) % 26, lambda k: caesar_engine(k, encrypt))
+
+# ----- Vigenère -----
+def _vigenere_letters(text: str):
+    """(bytes array, letter indices, letter bases) of an ASCII text"""
+    np = numpy()
+    a = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    upper = (a >= 65) & (a <= 90)
+    letters = np.flatnonzero(upper | ((a >= 97) & (a <= 122)))
+    base = np.where(upper[letters], 65, 97).astype(np.uint8)
+    return a, letters, base
+
+def vigenere_engine(key: str, encrypt: bool = True,
+                    text_cache: Optional[Dict[str, Any]] = None) -> Callable[[str], str]:
+    """vigenere_cipher under one key with its shifts precomputed.
+    
+    text_cache, if given, keeps the letter positions of each text, so a
+    text encrypted under many keys is only scanned once.
+    """
+    np = _optional_numpy()
+    if np is None:
+        return lambda text: vigenere_cipher(text, key, encrypt)
+    shifts = [(ord(ch.lower()) - ord('a')) % 26 for ch in key]
+    shifts = np.array(shifts if encrypt else [-s % 26 for s in shifts], dtype=np.uint8)
+    
+    def apply(text: str) -> str:
+        if not text.isascii() or len(text) < SMALL_TEXT:
+            # Non-ASCII letters advance the key too: leave those to the reference
+            return vigenere_cipher(text, key, encrypt)
+        if text_cache is None:
+            a, letters, base = _vigenere_letters(text)
+        else:
+            if text not in text_cache:
+                text_cache[text] = _vigenere_letters(text)
+            a, letters, base = text_cache[text]
+        if letters.size == 0:
+            return text
+        if shifts.size == 0:
+            return vigenere_cipher(text, key, encrypt)   # raises like the reference
+        out = a.copy()
+        out[letters] = (a[letters] - base + np.resize(shifts, letters.size)) % 26 + base
+        return out.tobytes().decode("ascii")
+    return apply
+
+@instrument(texts_size)
+def vigenere_batch(texts: Union[str, Sequence[str]], keys: Union[str, Iterable[str]],
+                   encrypt: bool = True) -> List[str]:
+    text_cache: Dict[str, Any] = {}
+    jobs = broadcast(texts, keys, lambda k: isinstance(k, str))
+    return _run(jobs, str, lambda k: vigenere_engine(str(k), encrypt, text_cache))
+
+# ----- Playfair -----
+class PlayfairTable:
+    """A Playfair key with O(1) letter positions and a memo of processed digraphs"""
+    def __init__(self, key: str, encrypt: bool):
+        self.matrix = prepare_playfair_matrix(key)
+        self.step = 1 if encrypt else -1
+        self.position = {}
+        for row in range(SIZE):
+            for col in range(SIZE):
+                self.position[self.matrix[row][col]] = (row, col)
+        self.digraphs: Dict[Tuple[str, str], str] = {}
+    
+    def digraph(self, a: str, b: str) -> str:
+        result = self.digraphs.get((a, b))
+        if result is None:
+            m = self.matrix
+            # playfair_cipher falls back to (-1, -1) for characters not in the square
+            a_row, a_col = self.position.get(a, (-1, -1))
+            b_row, b_col = self.position.get(b, (-1, -1))
+            if a_row == b_row:
+                result = m[a_row][(a_col + self.step) % SIZE] + m[b_row][(b_col + self.step) % SIZE]
+            elif a_col == b_col:
+                result = m[(a_row + self.step) % SIZE][a_col] + m[(b_row + self.step) % SIZE][b_col]
+            else:
+                result = m[a_row][b_col] + m[b_row][a_col]
+            self.digraphs[(a, b)] = result
+        return result
+    
+    def apply(self, text: str) -> str:
+        text = text.upper().replace("J", "I")
+        digraph = self.digraph
+        out = []
+        i = 0
+        n = len(text)
+        while i < n:
+            a = text[i]
+            b = text[i + 1] if i + 1 < n else 'X'
+            if a == b:
+                b = 'X'
+                i += 1
+            else:
+                i += 2
+            out.append(digraph(a, b))
+        return "".join(out)
+
+@instrument(texts_size)
+def playfair_batch(texts: Union[str, Sequence[str]], keys: Union[str, Iterable[str]],
+                   encrypt: bool = True) -> List[str]:
+    jobs = broadcast(texts, keys, lambda k: isinstance(k, str))
+    return _run(jobs, str, lambda k: PlayfairTable(str(k), encrypt).apply)
+
+# ----- Hill -----
+def hill_matrix(key: Sequence[Sequence[int]], encrypt: bool) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """The matrix hill_cipher multiplies pairs by (the inverse key when decrypting)"""
+    (k00, k01), (k10, k11) = ((int(v) for v in row) for row in key)
+    if encrypt:
+        return (k00, k01), (k10, k11)
+    det_inv = mod_inverse((k00 * k11 - k01 * k10) % 26, 26)
+    if det_inv == -1:
+        raise ValueError("Invalid key - no inverse exists!")
+    return ((k11 * det_inv % 26, -k01 * det_inv % 26),
+            (-k10 * det_inv % 26, k00 * det_inv % 26))
+
+def _hill_pairs(text: str):
+    """(2, pairs) letter codes as hill_cipher reads them: ord - 'A', padded with 'X'"""
+    np = numpy()
+    codes = np.frombuffer(text.upper().encode("utf-32-le"), dtype=np.uint32).astype(np.int64) - 65
+    if codes.size % 2:
+        codes = np.append(codes, 23)
+    return codes.reshape(-1, 2).T
+
+def hill_engine(key: Sequence[Sequence[int]], encrypt: bool = True,
+                text_cache: Optional[Dict[str, Any]] = None) -> Callable[[str], str]:
+    """hill_cipher under one key, inverted once, as a NumPy matrix product"""
+    matrix = hill_matrix(key, encrypt)
+    np = _optional_numpy()
+    if np is None:
+        return lambda text: hill_cipher(text, [list(row) for row in matrix], True)
+    m = np.array(matrix, dtype=np.int64)
+    small_key = [list(row) for row in matrix]
+    
+    def apply(text: str) -> str:
+        if len(text) < SMALL_TEXT:
+            return hill_cipher(text, small_key, True)
+        if text_cache is None:
+            pairs = _hill_pairs(text)
+        else:
+            if text not in text_cache:
+                text_cache[text] = _hill_pairs(text)
+            pairs = text_cache[text]
+        out = (m @ pairs) % 26 + 65
+        return out.T.astype(np.uint8).tobytes().decode("ascii")
+    return apply
+
+@instrument(texts_size)
+def hill_batch(texts: Union[str, Sequence[str]], keys: Any, encrypt: bool = True) -> List[str]:
+    """Hill over many texts and/or 2x2 keys (a single key is a 2x2 nested list or array)"""
+    text_cache: Dict[str, Any] = {}
+    
+    def is_single_key(k) -> bool:
+        first = k[0]
+        return not hasattr(first[0], "__iter__")
+    
+    jobs = broadcast(texts, keys, is_single_key)
+    return _run(jobs, lambda k: tuple(tuple(int(v) for v in row) for row in k),
+                lambda k: hill_engine(k, encrypt, text_cache))
+
+# ----- Rail Fence -----
+@functools.lru_cache(maxsize=64)
+def rail_positions(length: int, rails: int, prefix: Optional[int] = None):
+    """Ciphertext index of each plaintext position (the first `prefix` only if given).
+    
+    Position i sits on rail min(m, cycle - m) with m = i % cycle, and
+    rail_fence_cipher writes the rails out one after another in position
+    order, so the index is the rail's start offset plus the position's rank
+    within its rail. Rail sizes follow from the length alone, so a prefix
+    costs O(prefix) however long the text is. Decrypting is the gather
+    ciphertext[rail_positions(len(ciphertext), rails)].
+    """
+    np = numpy()
+    if rails < 2:
+        raise ValueError("Rail fence needs at least 2 rails")
+    dtype = np.int32 if length < 1 << 31 else np.int64
+    cycle = 2 * (rails - 1)
+    q, m = np.divmod(np.arange(min(length, prefix or length), dtype=dtype), cycle)
+    rail = np.minimum(m, cycle - m)
+    # Inner rails are visited twice per cycle: at m == rail and m == cycle - rail
+    rank = np.where((rail == 0) | (rail == rails - 1), q, 2 * q + (m > rail))
+    
+    # Positions below `length` congruent to r, plus those congruent to cycle - r
+    r = np.arange(rails, dtype=np.int64)
+    sizes = np.maximum(length - r + cycle - 1, 0) // cycle
+    inner = (r > 0) & (r < rails - 1)
+    sizes[inner] += np.maximum(length - (cycle - r[inner]) + cycle - 1, 0) // cycle
+    start = (np.cumsum(sizes) - sizes).astype(dtype)
+    positions = start[rail] + rank
+    positions.flags.writeable = False
+    return positions
+
+def rail_fence_engine(rails: int, encrypt: bool = True) -> Callable[[str], str]:
+    """Rail fence as one gather per text with the cached permutation for its length"""
+    np = _optional_numpy()
+    rails = int(rails)
+    if np is None:
+        def plain(text: str) -> str:
+            if rails < 2:
+                raise ValueError("Rail fence needs at least 2 rails")
+            return rail_fence_cipher(text, rails, encrypt)
+        return plain
+    
+    def apply(text: str) -> str:
+        chars = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        positions = rail_positions(chars.size, rails)
+        if encrypt:
+            out = np.empty_like(chars)
+            out[positions] = chars
+        else:
+            out = chars[positions]
+        return out.tobytes().decode("utf-32-le")
+    return apply
+
+@instrument(texts_size)
+def rail_fence_batch(texts: Union[str, Sequence[str]], keys: Union[int, Iterable[int]],
+                     encrypt: bool = True) -> List[str]:
+    jobs = broadcast(texts, keys, lambda k: not hasattr(k, "__iter__"))
+    return _run(jobs, int, lambda k: rail_fence_engine(k, encrypt))
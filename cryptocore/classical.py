@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List
+
+from .metrics import data_size, instrument
+
+SIZE = 5
+
+# ===== CLASSICAL CIPHERS =====
+@instrument(data_size)
+def caesar_cipher(text: str, key: int, encrypt: bool) -> str:
+    result = []
+    for char in text:
+        if char.isupper():
+            if encrypt:
+                new_char = chr((ord(char) - ord('A') + key) % 26 + ord('A'))
+            else:
+                new_char = chr((ord(char) - ord('A') - key + 26) % 26 + ord('A'))
+            result.append(new_char)
+        elif char.islower():
+            if encrypt:
+                new_char = chr((ord(char) - ord('a') + key) % 26 + ord('a'))
+            else:
+                new_char = chr((ord(char) - ord('a') - key + 26) % 26 + ord('a'))
+            result.append(new_char)
+        else:
+            result.append(char)
+    return "".join(result)
+
+def prepare_playfair_matrix(key: str) -> List[List[str]]:
+    key = key.upper().replace("J", "I")
+    used = [False] * 26
+    matrix = [['' for _ in range(SIZE)] for _ in range(SIZE)]
+    k = 0
+    
+    # Process key
+    for ch in key:
+        if ch == 'J':
+            ch = 'I'
+        if ch.isalpha() and not used[ord(ch) - ord('A')]:
+            matrix[k // SIZE][k % SIZE] = ch
+            used[ord(ch) - ord('A')] = True
+            k += 1
+    
+    # Fill remaining letters
+    for ch in range(ord('A'), ord('Z') + 1):
+        ch = chr(ch)
+        if ch == 'J':
+            continue
+        if not used[ord(ch) - ord('A')] and k < 25:
+            matrix[k // SIZE][k % SIZE] = ch
+            k += 1
+    return matrix
+
+@instrument(data_size)
+def playfair_cipher(text: str, key: str, encrypt: bool) -> str:
+    matrix = prepare_playfair_matrix(key)
+    processed_text = []
+    i = 0
+    text = text.upper().replace("J", "I")
+    
+    while i < len(text):
+        a = text[i]
+        if i + 1 < len(text):
+            b = text[i + 1]
+        else:
+            b = 'X'
+        
+        if a == b:
+            b = 'X'
+            i += 1
+        else:
+            i += 2
+        
+        # Find positions in matrix
+        a_pos = (-1, -1)
+        b_pos = (-1, -1)
+        for row in range(SIZE):
+            for col in range(SIZE):
+                if matrix[row][col] == a:
+                    a_pos = (row, col)
+                if matrix[row][col] == b:
+                    b_pos = (row, col)
+        
+        a_row, a_col = a_pos
+        b_row, b_col = b_pos
+        
+        # Apply cipher rules
+        if a_row == b_row:  # Same row
+            new_a_col = (a_col + (1 if encrypt else -1)) % SIZE
+            new_b_col = (b_col + (1 if encrypt else -1)) % SIZE
+            processed_text.append(matrix[a_row][new_a_col])
+            processed_text.append(matrix[b_row][new_b_col])
+        elif a_col == b_col:  # Same column
+            new_a_row = (a_row + (1 if encrypt else -1)) % SIZE
+            new_b_row = (b_row + (1 if encrypt else -1)) % SIZE
+            processed_text.append(matrix[new_a_row][a_col])
+            processed_text.append(matrix[new_b_row][b_col])
+        else:  # Rectangle
+            processed_text.append(matrix[a_row][b_col])
+            processed_text.append(matrix[b_row][a_col])
+    
+    return "".join(processed_text)
+
+@instrument(data_size)
+def hill_cipher(text: str, key: List[List[int]], encrypt: bool) -> str:
+    # Calculate determinant
+    det = key[0][0] * key[1][1] - key[0][1] * key[1][0]
+    det = (det % 26 + 26) % 26
+    
+    # Find modular inverse of determinant
+    det_inv = -1
+    for i in range(26):
+        if (det * i) % 26 == 1:
+            det_inv = i
+            break
+    
+    if not encrypt and det_inv == -1:
+        raise ValueError("Invalid key - no inverse exists!")
+    
+    # Calculate inverse key for decryption
+    if not encrypt:
+        inv_key = [
+            [(key[1][1] * det_inv) % 26, (-key[0][1] * det_inv) % 26],
+            [(-key[1][0] * det_inv) % 26, (key[0][0] * det_inv) % 26]
+        ]
+        for i in range(2):
+            for j in range(2):
+                if inv_key[i][j] < 0:
+                    inv_key[i][j] += 26
+        key = inv_key
+    
+    # Process text in pairs
+    result = []
+    text = text.upper()
+    for i in range(0, len(text), 2):
+        a = ord(text[i]) - ord('A')
+        b = ord(text[i + 1]) - ord('A') if i + 1 < len(text) else 23  # 'X'
+        
+        res_a = (key[0][0] * a + key[0][1] * b) % 26
+        res_b = (key[1][0] * a + key[1][1] * b) % 26
+        
+        result.append(chr(res_a + ord('A')))
+        result.append(chr(res_b + ord('A')))
+    
+    return "".join(result)
+
+@instrument(data_size)
+def vigenere_cipher(text: str, key: str, encrypt: bool) -> str:
+    result = []
+    key_index = 0
+    for char in text:
+        if char.isalpha():
+            key_char = key[key_index % len(key)].lower()
+            shift = ord(key_char) - ord('a')
+            if not encrypt:
+                shift = -shift
+            
+            if char.isupper():
+                new_char = chr((ord(char) - ord('A') + shift + 26) % 26 + ord('A'))
+            else:
+                new_char = chr((ord(char) - ord('a') + shift + 26) % 26 + ord('a'))
+            
+            result.append(new_char)
+            key_index += 1
+        else:
+            result.append(char)
+    return "".join(result)
+
+@instrument(data_size)
+def rail_fence_cipher(text: str, rails: int, encrypt: bool) -> str:
+    if encrypt:
+        result = []
+        for r in range(rails):
+            i = r
+            while i < len(text):
+                result.append(text[i])
+                if r != 0 and r != rails - 1:
+                    next_i = i + 2 * (rails - r - 1)
+                    if next_i < len(text):
+                        result.append(text[next_i])
+                i += 2 * (rails - 1)
+        return "".join(result)
+    else:
+        decrypted = [''] * len(text)
+        index = 0
+        for r in range(rails):
+            i = r
+            while i < len(text):
+                decrypted[i] = text[index]
+                index += 1
+                if r != 0 and r != rails - 1:
+                    next_i = i + 2 * (rails - r - 1)
+                    if next_i < len(text):
+                        decrypted[next_i] = text[index]
+                        index += 1
+                i += 2 * (rails - 1)
+        return "".join(decrypted)
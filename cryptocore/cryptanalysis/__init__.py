@@ -0,0 +1,6 @@
+"""Cryptanalysis tools for the classical ciphers in cryptocore.classical.
+
+Each module breaks one cipher. NumPy is used when it is installed and is
+imported lazily, so importing a cracker stays cheap. batchgcd finds RSA
+moduli that share a prime.
+"""
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import itertools
+import os
+import shutil
+import struct
+import tempfile
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..bignum import gcd, mpz
+
+# ===== BATCH GCD =====
+# Bernstein's batch GCD finds every RSA modulus that shares a prime with
+# another one in a corpus, without trying the pairs one by one:
+#
+#   product tree    level 0 holds the moduli; each level above multiplies
+#                   neighbours in pairs, up to their product P at the root
+#   remainder tree  back down, every node gets P mod node^2; at a leaf N,
+#                   gcd(N, (P mod N^2) / N) is the gcd of N with the product
+#                   of all the other moduli
+#
+# Every level of the product tree is about as large as the corpus (256 MB
+# for a million 2048-bit moduli) and there are log2(count) levels. A corpus
+# whose tree does not fit in memory_limit keeps its levels in files and
+# streams them. Each pass reads one level, writes the next and holds only a
+# pair of nodes. The leaves are split into one contiguous chunk per worker.
+# Every worker builds the product tree of its chunk. The parent joins the
+# chunk roots in a top tree and takes the remainders down to them. Then the
+# workers finish the descent of their chunks, and the gcds, in parallel.
+#
+# With gmpy2 the products near the root use GMP's FFT multiplication. On
+# Python ints (Karatsuba), 10,000 2048-bit moduli already take more than ten
+# minutes.
+MEMORY_LIMIT = 1 << 28       # bytes of tree levels kept in memory
+PARALLEL_MIN = 4096          # fewer moduli are scanned in this process
+LENGTH = struct.Struct("<Q")
+
+class WeakModulus:
+    """A modulus that shares a prime with another one in the corpus.
+    
+    `factor` is a divisor of `n` shared with other moduli (for two-prime
+    moduli, one prime; n // factor is the other), or None when n was only
+    found to occur more than once. `duplicates` holds the indices of the
+    other moduli equal to n.
+    """
+    __slots__ = ("index", "n", "factor", "duplicates")
+    
+    def __init__(self, index: int, n: int, factor: Optional[int] = None, duplicates: Iterable[int] = ()):
+        self.index, self.n, self.factor = index, n, factor
+        self.duplicates = list(duplicates)
+    
+    def __repr__(self) -> str:
+        return f"WeakModulus(index={self.index}, factor={self.factor}, duplicates={self.duplicates})"
+
+# ----- Levels -----
+def _write_int(f, value: int) -> None:
+    data = value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big")
+    f.write(LENGTH.pack(len(data)))
+    f.write(data)
+
+def _write_ints(path: str, values: Iterable[int]) -> int:
+    count = 0
+    with open(path, "wb", buffering=1 << 20) as f:
+        for value in values:
+            _write_int(f, value)
+            count += 1
+    return count
+
+def _read_ints(path: str, start: int = 0, stop: Optional[int] = None) -> Iterator[int]:
+    """The values of records start..stop of a level file (skipped records are not decoded)"""
+    with open(path, "rb", buffering=1 << 20) as f:
+        for _ in range(start):
+            length, = LENGTH.unpack(f.read(LENGTH.size))
+            f.seek(length, os.SEEK_CUR)
+        index = start
+        while stop is None or index < stop:
+            header = f.read(LENGTH.size)
+            if not header:
+                return
+            length, = LENGTH.unpack(header)
+            yield mpz.from_bytes(f.read(length), "big")
+            index += 1
+
+class _Levels:
+    """Levels of one tree: lists, or files `prefix<name>` in a directory"""
+    __slots__ = ("directory", "prefix", "lists")
+    
+    def __init__(self, directory: Optional[str] = None, prefix: str = ""):
+        self.directory, self.prefix = directory, prefix
+        self.lists: Dict[str, List[int]] = {}
+    
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, self.prefix + name)
+    
+    def write(self, name: str, values: Iterable[int]) -> int:
+        """Store a level; returns its length"""
+        if self.directory is None:
+            self.lists[name] = list(values)
+            return len(self.lists[name])
+        return _write_ints(self.path(name), values)
+    
+    def read(self, name: str) -> Iterator[int]:
+        if self.directory is None:
+            return iter(self.lists[name])
+        return _read_ints(self.path(name))
+    
+    def drop(self, name: str) -> None:
+        if self.directory is None:
+            del self.lists[name]
+        else:
+            os.remove(self.path(name))
+
+# ----- Trees -----
+def _products(values: Iterator[int]) -> Iterator[int]:
+    for a in values:
+        b = next(values, None)
+        yield a if b is None else a * b
+
+def _descend(remainders: Iterator[int], children: Iterator[int]) -> Iterator[Tuple[int, int]]:
+    """(child, parent remainder mod child^2) for every node of the level below"""
+    for r in remainders:
+        a = next(children)
+        yield a, r % (a * a)
+        # Only the last node of a level can have a single child
+        b = next(children, None)
+        if b is not None:
+            yield b, r % (b * b)
+
+def _build(levels: _Levels, leaves: Iterable[int]) -> int:
+    """Write the product tree of leaves as levels "p0" (the leaves) to "p<top>"; returns top"""
+    count = levels.write("p0", leaves)
+    top = 0
+    while count > 1:
+        count = levels.write(f"p{top + 1}", _products(levels.read(f"p{top}")))
+        top += 1
+    return top
+
+def _leaf_remainders(levels: _Levels, top: int, remainder: int) -> Iterator[Tuple[int, int]]:
+    """(leaf, P mod leaf^2) for every leaf, from the root's remainder; drops the levels above the leaves"""
+    if top == 0:
+        yield next(levels.read("p0")), remainder
+        return
+    levels.write(f"r{top}", [remainder])
+    for level in range(top, 1, -1):
+        pairs = _descend(levels.read(f"r{level}"), levels.read(f"p{level - 1}"))
+        levels.write(f"r{level - 1}", (r for _, r in pairs))
+        levels.drop(f"r{level}")
+        levels.drop(f"p{level}")
+    yield from _descend(levels.read("r1"), levels.read("p0"))
+    levels.drop("r1")
+    levels.drop("p1")
+
+def _leaf_gcds(pairs: Iterator[Tuple[int, int]], base: int) -> List[Tuple[int, int, int]]:
+    """(index, n, gcd) of the leaves that share a factor"""
+    shared = []
+    for index, (n, r) in enumerate(pairs, base):
+        g = gcd(n, r // n)
+        if g != 1:
+            shared.append((index, int(n), g))
+    return shared
+
+# ----- Chunks -----
+# Run in the worker processes; everything they share is in files
+def _chunk_product(directory: str, chunk: int, start: int, stop: int) -> int:
+    """Build the product tree of leaves start..stop; returns its top level"""
+    levels = _Levels(directory, f"c{chunk}.")
+    return _build(levels, _read_ints(os.path.join(directory, "leaves"), start, stop))
+
+def _chunk_gcds(directory: str, chunk: int, top: int, base: int) -> List[Tuple[int, int, int]]:
+    levels = _Levels(directory, f"c{chunk}.")
+    remainder = next(_read_ints(levels.path("rem")))
+    return _leaf_gcds(_leaf_remainders(levels, top, remainder), base)
+
+def _scan_files(directory: str, count: int, workers: int) -> List[Tuple[int, int, int]]:
+    """Batch GCD of the `count` moduli in directory/leaves in `workers` chunks"""
+    chunks = max(1, min(workers, count))
+    bounds = [count * i // chunks for i in range(chunks + 1)]
+    starts, stops = bounds[:-1], bounds[1:]
+    ids = range(chunks)
+    
+    def run(function, *args):
+        if workers <= 1:
+            return list(map(function, *args))
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, chunks)) as pool:
+            return list(pool.map(function, *args))
+    
+    tops = run(_chunk_product, [directory] * chunks, ids, starts, stops)
+    # The top tree over the chunk roots, then its remainders down to them
+    chunk_levels = [_Levels(directory, f"c{chunk}.") for chunk in ids]
+    top_levels = _Levels(directory, "top.")
+    roots = (next(levels.read(f"p{top}")) for levels, top in zip(chunk_levels, tops))
+    top = _build(top_levels, roots)
+    root = next(top_levels.read(f"p{top}"))
+    for levels, (_, remainder) in zip(chunk_levels, _leaf_remainders(top_levels, top, root)):
+        levels.write("rem", [remainder])
+    del root
+    top_levels.drop("p0")
+    shared = run(_chunk_gcds, [directory] * chunks, ids, tops, starts)
+    return [item for chunk in shared for item in chunk]
+
+# ----- Scanner -----
+def _resolve(shared: List[Tuple[int, int, int]]) -> List[WeakModulus]:
+    """Turn (index, n, gcd) into WeakModulus reports.
+    
+    A gcd of n itself means that every prime of n is shared, or that n
+    occurs more than once. Such moduli are factored with the divisors found
+    for the others, or with each other.
+    """
+    known = set()
+    whole = []
+    weak = {}
+    for index, n, g in shared:
+        if g == n:
+            whole.append((index, n))
+        else:
+            weak[index] = WeakModulus(index, n, g)
+            known.update((g, n // g))
+    copies: Dict[int, List[int]] = {}
+    for index, n in whole:
+        copies.setdefault(n, []).append(index)
+    for index, n in whole:
+        candidates = itertools.chain(known, (other for other in copies if other != n))
+        factor = next((g for g in (gcd(n, c) for c in candidates) if 1 < g < n), None)
+        weak[index] = WeakModulus(index, n, factor, (i for i in copies[n] if i != index))
+    return [weak[index] for index in sorted(weak)]
+
+def find_weak_moduli(moduli: Iterable[int], workers: Optional[int] = None, directory: Optional[str] = None,
+                     memory_limit: int = MEMORY_LIMIT) -> List[WeakModulus]:
+    """Every modulus that shares a prime with another one, in input order.
+    
+    The moduli are read once, as they come. Once the trees would take more
+    than memory_limit bytes (or when the corpus is split between workers)
+    the moduli go to a temporary directory under `directory` (default: the
+    system one) and the levels are streamed from there. Up to `workers`
+    processes (default: CPU count, 0 for this process) build and descend
+    the subtrees.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    leaves: List[int] = []
+    size = count = 0
+    spill = tmp = None   # the leaves file, once the corpus has outgrown memory
+    try:
+        for count, n in enumerate(moduli, 1):
+            if n < 2:
+                raise ValueError(f"Modulus {count - 1} must be greater than 1")
+            if spill is not None:
+                _write_int(spill, n)
+                continue
+            leaves.append(mpz(n))
+            size += (n.bit_length() + 7) // 8
+            if size * count.bit_length() > memory_limit:
+                tmp = tempfile.mkdtemp(prefix="batchgcd-", dir=directory)
+                spill = open(os.path.join(tmp, "leaves"), "wb", buffering=1 << 20)
+                for leaf in leaves:
+                    _write_int(spill, leaf)
+                leaves = []
+        if count < 2:
+            return []
+        if spill is None and (workers <= 1 or count < PARALLEL_MIN):
+            levels = _Levels()
+            top = _build(levels, leaves)
+            del leaves[:]
+            root = next(levels.read(f"p{top}"))
+            shared = _leaf_gcds(_leaf_remainders(levels, top, root), 0)
+        else:
+            if spill is None:
+                tmp = tempfile.mkdtemp(prefix="batchgcd-", dir=directory)
+                _write_ints(os.path.join(tmp, "leaves"), leaves)
+                del leaves[:]
+            else:
+                spill.close()
+            shared = _scan_files(tmp, count, workers)
+    finally:
+        if spill is not None:
+            spill.close()
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+    return _resolve(shared)
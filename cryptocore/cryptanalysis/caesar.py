@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, List, Tuple
+
+from .._optional import numpy
+from ..classical import caesar_cipher
+
+# ===== CAESAR CRACKER =====
+# Relative letter frequencies of English text, A..Z
+ENGLISH_FREQUENCIES = [
+    0.08167, 0.01492, 0.02782, 0.04253, 0.12702, 0.02228, 0.02015, 0.06094,
+    0.06966, 0.00153, 0.00772, 0.04025, 0.02406, 0.06749, 0.07507, 0.01929,
+    0.00095, 0.05987, 0.06327, 0.09056, 0.02758, 0.00978, 0.02360, 0.00150,
+    0.01974, 0.00074,
+]
+
+def letter_histogram(text: str) -> List[int]:
+    """Count A..Z case-insensitively in one pass (other characters are ignored)"""
+    data = text.encode("ascii", "ignore").upper()
+    try:
+        np = numpy()
+    except ImportError:
+        return [data.count(c) for c in range(ord('A'), ord('Z') + 1)]
+    counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    return [int(c) for c in counts[ord('A'):ord('Z') + 1]]
+
+def chi_squared_by_shift(histogram: List[int]) -> List[float]:
+    """Chi-squared of the decryption under every key, from one histogram.
+    
+    Decrypting with key k maps ciphertext letter (i + k) to plaintext letter
+    i, so the plaintext histogram is just the ciphertext histogram rotated
+    by k and no decryption is needed.
+    """
+    total = sum(histogram)
+    if total == 0:
+        return [0.0] * 26
+    expected = [total * f for f in ENGLISH_FREQUENCIES]
+    scores = []
+    for key in range(26):
+        chi2 = 0.0
+        for i in range(26):
+            diff = histogram[(i + key) % 26] - expected[i]
+            chi2 += diff * diff / expected[i]
+        scores.append(chi2)
+    return scores
+
+def rank_caesar_keys(text: str) -> List[Tuple[int, float]]:
+    """All 26 keys ranked by chi-squared (best first)"""
+    scores = chi_squared_by_shift(letter_histogram(text))
+    return sorted(enumerate(scores), key=lambda item: item[1])
+
+def crack_caesar(text: str, top: int = 3) -> Iterator[Tuple[int, float, str]]:
+    """Yield (key, chi-squared, plaintext) for the `top` best keys.
+    
+    Candidates are ranked up front from the histogram; each decryption is
+    only produced when the caller asks for the next candidate.
+    """
+    for key, score in rank_caesar_keys(text)[:top]:
+        yield key, score, caesar_cipher(text, key, False)
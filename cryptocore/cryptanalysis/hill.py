@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, List, Optional, Tuple
+
+from .._optional import numpy
+from ..classical import hill_cipher
+from ..numtheory import mod_inverse
+from .caesar import ENGLISH_FREQUENCIES
+from .ngrams import default_model, letter_array
+
+# ===== HILL CRACKER =====
+ROW_CANDIDATES = 30
+
+def matrix_inverse(m: List[List[int]]) -> Optional[List[List[int]]]:
+    """Inverse of a 2x2 matrix mod 26, or None if it is singular"""
+    det_inv = mod_inverse((m[0][0] * m[1][1] - m[0][1] * m[1][0]) % 26, 26)
+    if det_inv == -1:
+        return None
+    return [[m[1][1] * det_inv % 26, -m[0][1] * det_inv % 26],
+            [-m[1][0] * det_inv % 26, m[0][0] * det_inv % 26]]
+
+def matrix_multiply(a: List[List[int]], b: List[List[int]]) -> List[List[int]]:
+    return [[(a[i][0] * b[0][j] + a[i][1] * b[1][j]) % 26 for j in range(2)] for i in range(2)]
+
+def known_plaintext_key(plaintext: str, ciphertext: str) -> List[List[int]]:
+    """Recover the key from matching plaintext and ciphertext letters.
+    
+    hill_cipher maps each letter pair p to K p, so two plaintext pairs
+    forming an invertible matrix P with ciphertext pairs C give K = C P^-1.
+    The key is then checked against every other pair.
+    """
+    p = [ord(ch) - ord('A') for ch in plaintext.upper() if 'A' <= ch <= 'Z']
+    c = [ord(ch) - ord('A') for ch in ciphertext.upper() if 'A' <= ch <= 'Z']
+    pairs = min(len(p), len(c)) // 2
+    for i in range(pairs):
+        for j in range(i + 1, pairs):
+            p_inv = matrix_inverse([[p[2 * i], p[2 * j]], [p[2 * i + 1], p[2 * j + 1]]])
+            if p_inv is None:
+                continue
+            key = matrix_multiply([[c[2 * i], c[2 * j]], [c[2 * i + 1], c[2 * j + 1]]], p_inv)
+            if all((key[0][0] * p[2 * k] + key[0][1] * p[2 * k + 1]) % 26 == c[2 * k]
+                   and (key[1][0] * p[2 * k] + key[1][1] * p[2 * k + 1]) % 26 == c[2 * k + 1]
+                   for k in range(pairs)):
+                return key
+            raise ValueError("Plaintext and ciphertext do not match any Hill key")
+    raise ValueError("Need two plaintext pairs forming an invertible matrix")
+
+def pair_histogram(letters):
+    """Counts of the 676 ciphertext pairs a * 26 + b"""
+    np = numpy()
+    if letters.size % 2:
+        raise ValueError("Hill ciphertext must have an even number of letters")
+    return np.bincount(letters[0::2].astype(np.intp) * 26 + letters[1::2], minlength=676)
+
+def row_outputs():
+    """(676, 676) plaintext letter of decryption row x * 26 + y for pair a * 26 + b"""
+    np = numpy()
+    rows = np.arange(676)
+    pairs = np.arange(676)
+    return ((rows // 26)[:, None] * (pairs // 26)[None, :]
+            + (rows % 26)[:, None] * (pairs % 26)[None, :]) % 26
+
+def rank_rows(histogram) -> List[Tuple[int, int]]:
+    """All 676 decryption rows (x, y) ranked by the chi-squared of their letters.
+    
+    A row of the inverse key alone fixes one letter of every plaintext pair,
+    so its letter histogram is aggregated from the pair histogram in one
+    bincount and all rows are scored without decrypting anything.
+    """
+    np = numpy()
+    outputs = row_outputs()
+    counts = np.bincount((np.arange(676)[:, None] * 26 + outputs).ravel(),
+                         weights=np.broadcast_to(histogram, outputs.shape).ravel(),
+                         minlength=676 * 26).reshape(676, 26)
+    expected = histogram.sum() * np.array(ENGLISH_FREQUENCIES)
+    chi2 = ((counts - expected) ** 2 / expected).sum(axis=1)
+    return [(int(r) // 26, int(r) % 26) for r in np.argsort(chi2, kind="stable")]
+
+def crack_hill(text: str, top: int = 3,
+               row_candidates: int = ROW_CANDIDATES) -> Iterator[Tuple[List[List[int]], float, str]]:
+    """Yield (key, bigram log10 score, plaintext) for the `top` best keys.
+    
+    The best `row_candidates` rows are paired into invertible inverse keys,
+    which are ranked by the English bigram score of their plaintext pairs
+    (again computed from the pair histogram). Higher scores are better.
+    """
+    histogram = pair_histogram(letter_array(text))
+    rows = rank_rows(histogram)[:row_candidates]
+    outputs = row_outputs()
+    bigrams = default_model().table(2)
+    
+    scored = []
+    for first in rows:
+        for second in rows:
+            inverse = [list(first), list(second)]
+            key = matrix_inverse(inverse)
+            if key is None:
+                continue
+            codes = outputs[first[0] * 26 + first[1]] * 26 + outputs[second[0] * 26 + second[1]]
+            scored.append((float(histogram @ bigrams[codes]), key))
+    scored.sort(key=lambda item: -item[0])
+    for score, key in scored[:top]:
+        yield key, score, hill_cipher(text, key, False)
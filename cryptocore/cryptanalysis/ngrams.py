@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import functools
+import mmap
+import os
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import BinaryIO, Dict, Iterable, Optional, Union
+
+from .._optional import numpy
+
+# ===== N-GRAM LANGUAGE MODEL =====
+ORDERS = (1, 2, 3, 4)
+MAGIC = b"NGRAMS\x00\x01"   # format version 1: float32 tables for ORDERS, little-endian
+MODEL_FILE = "english.ngrams"
+
+def default_corpus() -> str:
+    """English prose that ships with every CPython: the pydoc topic help"""
+    from pydoc_data.topics import topics
+    return "\n".join(topics.values())
+
+def letter_bytes(data: bytes):
+    """ASCII letters of raw bytes as a uint8 array of 0..25, case folded"""
+    np = numpy()
+    folded = np.frombuffer(data, dtype=np.uint8) & 0xDF
+    return folded[(folded >= 65) & (folded <= 90)] - 65
+
+def letter_array(text: str):
+    """ASCII letters of text as a uint8 array of 0..25, case folded"""
+    return letter_bytes(text.encode("ascii", "ignore"))
+
+def ngram_indices(letters, n: int):
+    """Base-26 code of every overlapping n-gram along the last axis of a letter array"""
+    np = numpy()
+    codes = letters.astype(np.int32)
+    width = codes.shape[-1] - n + 1
+    indices = codes[..., :width].copy()
+    for i in range(1, n):
+        indices *= 26
+        indices += codes[..., i:width + i]
+    return indices
+
+class NgramModel:
+    """Log10 probabilities of English n-grams of orders 1-4.
+    
+    Each order is a dense float32 table indexed by the n-gram's base-26 code
+    (26 ** n entries). Unseen n-grams get log10(0.01 / total) so a single
+    rare n-gram cannot outweigh the rest of a text. Higher scores mean more
+    English-like text.
+    """
+    def __init__(self, tables: Dict[int, object]):
+        self.tables = tables
+        self._mmap = None
+    
+    @classmethod
+    def from_counts(cls, counts: Dict[int, object]) -> NgramModel:
+        np = numpy()
+        tables = {}
+        for n, count in counts.items():
+            total = max(int(count.sum()), 1)
+            table = np.full(26 ** n, np.log10(0.01 / total), dtype=np.float32)
+            seen = count > 0
+            table[seen] = np.log10(count[seen] / total)
+            tables[n] = table
+        return cls(tables)
+    
+    @classmethod
+    def load(cls, path: str) -> NgramModel:
+        """Memory-map a model file; tables are read-only views of the mapping"""
+        np = numpy()
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        expected = len(MAGIC) + 4 * sum(26 ** n for n in ORDERS)
+        if mapped[:len(MAGIC)] != MAGIC or len(mapped) != expected:
+            mapped.close()
+            raise ValueError(f"{path} is not an n-gram model file")
+        tables = {}
+        offset = len(MAGIC)
+        for n in ORDERS:
+            tables[n] = np.frombuffer(mapped, dtype="<f4", count=26 ** n, offset=offset)
+            offset += 4 * 26 ** n
+        model = cls(tables)
+        model._mmap = mapped
+        return model
+    
+    def write(self, stream: BinaryIO) -> None:
+        """Serialize the model: MAGIC, then the float32 tables in ORDERS"""
+        stream.write(MAGIC)
+        for n in ORDERS:
+            stream.write(self.tables[n].astype("<f4").tobytes())
+    
+    def save(self, path: str) -> None:
+        """Write a model file (written aside, then renamed into place)"""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            self.write(f)
+        os.replace(tmp, path)
+    
+    def table(self, n: int = 4):
+        return self.tables[n]
+    
+    def score(self, letters, n: int = 4):
+        """Log10 probability of 0..25 letters; a 2-D array scores each row"""
+        if letters.shape[-1] < n:
+            return 0.0 if letters.ndim == 1 else numpy().zeros(letters.shape[:-1])
+        scores = self.tables[n][ngram_indices(letters, n)].sum(axis=-1)
+        return float(scores) if letters.ndim == 1 else scores
+    
+    def score_text(self, text: str, n: int = 4) -> float:
+        """Log10 probability of the ASCII letters of text"""
+        return self.score(letter_array(text), n)
+    
+    def delta(self, letters, positions, values, n: int = 4) -> float:
+        """Score change from setting letters[positions] = values, without applying it.
+        
+        Only the n-grams overlapping a changed position are rescored, so a
+        local key change costs O(changes * n) however long the text is.
+        """
+        np = numpy()
+        positions = np.asarray(positions, dtype=np.intp)
+        values = np.asarray(values)
+        order = np.argsort(positions)
+        positions, values = positions[order], values[order]
+        offsets = np.arange(n)
+        starts = np.unique((positions[:, None] - offsets).ravel())
+        starts = starts[(starts >= 0) & (starts <= letters.size - n)]
+        if starts.size == 0:
+            return 0.0
+        windows = starts[:, None] + offsets
+        before = letters[windows]
+        slot = np.minimum(np.searchsorted(positions, windows), positions.size - 1)
+        after = np.where(positions[slot] == windows, values[slot], before)
+        table = self.tables[n]
+        return float(table[ngram_indices(after, n)].sum() - table[ngram_indices(before, n)].sum())
+
+def count_ngrams(chunks: Iterable[Union[bytes, str]]) -> Dict[int, object]:
+    """Count n-grams of all ORDERS over a stream of text or byte chunks.
+    
+    Only ASCII letters count; the last letters of each chunk are carried
+    into the next so n-grams spanning chunk boundaries are not lost.
+    """
+    np = numpy()
+    counts = {n: np.zeros(26 ** n, dtype=np.int64) for n in ORDERS}
+    carry = np.zeros(0, dtype=np.uint8)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("ascii", "ignore")
+        fresh = letter_bytes(chunk)
+        letters = np.concatenate([carry, fresh])
+        for n in ORDERS:
+            # n-grams that end in this chunk's letters
+            window = letters[max(0, carry.size - n + 1):]
+            if window.size >= n:
+                counts[n] += np.bincount(ngram_indices(window, n), minlength=26 ** n)
+        carry = letters[-(max(ORDERS) - 1):]
+    return counts
+
+def train(chunks: Iterable[Union[bytes, str]], path: Optional[str] = None) -> NgramModel:
+    """Build a model from a corpus stream, saving it to `path` if given"""
+    model = NgramModel.from_counts(count_ngrams(chunks))
+    if path:
+        model.save(path)
+    return model
+
+def default_model_path() -> str:
+    """$CRYPTOCORE_NGRAMS, or english.ngrams in the user cache directory"""
+    path = os.environ.get("CRYPTOCORE_NGRAMS")
+    if path:
+        return path
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache, "cryptocore", MODEL_FILE)
+
+@functools.lru_cache(maxsize=1)
+def default_model() -> NgramModel:
+    """The model crackers score with, mapped from default_model_path().
+    
+    Without $CRYPTOCORE_NGRAMS the file is trained from default_corpus() on
+    first use and cached; later processes just map it.
+    """
+    path = default_model_path()
+    if os.environ.get("CRYPTOCORE_NGRAMS") or os.path.exists(path):
+        return NgramModel.load(path)
+    model = train([default_corpus()])
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        model.save(path)
+    except OSError:
+        pass   # read-only home: keep the in-memory model
+    return model
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import functools
+import itertools
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, Optional, Tuple
+
+from .._optional import numpy
+from ..classical import playfair_cipher
+from .ngrams import default_model, letter_array
+
+# ===== PLAYFAIR CRACKER =====
+ALPHABET = "ABCDEFGHIKLMNOPQRSTUVWXYZ"   # the 25 letters of a Playfair square
+ITERATIONS = 200000
+TIME_BUDGET = 60.0
+TEMPERATURE_PER_LETTER = 0.06
+
+def ciphertext_pairs(text: str):
+    """Ciphertext digraphs as codes first * 25 + second of 0..24 square letters.
+    
+    J is read as I, like prepare_playfair_matrix does.
+    """
+    np = numpy()
+    letters = letter_array(text)
+    if letters.size % 2:
+        raise ValueError("Playfair ciphertext must have an even number of letters")
+    # 0..25 -> 0..24 by closing the gap left by J
+    squares = (letters - (letters >= 9)).astype(np.intp)
+    return squares[0::2] * 25 + squares[1::2]
+
+@functools.lru_cache(maxsize=1)
+def decryption_geometry():
+    """Plaintext cells (qa, qb) for every ciphertext cell pair, as two 25x25 arrays.
+    
+    Where two letters decrypt to depends only on their cells, not on which
+    letters fill the square, so this is computed once for all keys.
+    """
+    np = numpy()
+    ra, ca = np.divmod(np.arange(25)[:, None], 5)
+    rb, cb = np.divmod(np.arange(25)[None, :], 5)
+    same_row = ra == rb
+    same_col = (ca == cb) & ~same_row
+    qa = np.where(same_col, (ra - 1) % 5, ra) * 5 + np.where(same_row, (ca - 1) % 5, np.where(same_col, ca, cb))
+    qb = np.where(same_col, (rb - 1) % 5, rb) * 5 + np.where(same_row, (cb - 1) % 5, np.where(same_col, cb, ca))
+    return qa, qb
+
+def digraph_table(key):
+    """Plaintext bigram code (a * 26 + b, letters 0..25) of all 625 ciphertext digraphs"""
+    np = numpy()
+    position = np.empty(25, dtype=np.intp)
+    position[key] = np.arange(25)
+    # 0..24 -> 0..25 by reopening the gap at J
+    letters = key.astype(np.intp)
+    letters += letters > 8
+    cells = np.ix_(position, position)
+    qa, qb = decryption_geometry()
+    return ((letters * 26)[qa[cells]] + letters[qb[cells]]).reshape(625)
+
+def decrypt_pairs(key, pairs):
+    """Decrypt ciphertext digraph codes under a flat 25-byte key into 0..25 letters"""
+    np = numpy()
+    digraphs = digraph_table(key)[pairs]
+    plain = np.empty(pairs.size * 2, dtype=np.intp)
+    plain[0::2], plain[1::2] = np.divmod(digraphs, 26)
+    return plain
+
+def score_key(key, pairs, model) -> float:
+    """Quadgram log10 probability of the decryption under key"""
+    return model.score(decrypt_pairs(key, pairs))
+
+def mutate(key, rng: random.Random):
+    """A copy of key with one random move applied.
+    
+    Mostly swaps two letters; occasionally swaps two rows or columns, or
+    reverses the square, its row order or its column order.
+    """
+    np = numpy()
+    square = key.reshape(5, 5).copy()
+    move = rng.random()
+    if move < 0.90:
+        flat = square.reshape(25)
+        i, j = rng.sample(range(25), 2)
+        flat[i], flat[j] = flat[j], flat[i]
+    elif move < 0.92:
+        i, j = rng.sample(range(5), 2)
+        square[[i, j]] = square[[j, i]]
+    elif move < 0.94:
+        i, j = rng.sample(range(5), 2)
+        square[:, [i, j]] = square[:, [j, i]]
+    elif move < 0.96:
+        square = square[::-1, ::-1]
+    elif move < 0.98:
+        square = square[::-1]
+    else:
+        square = square[:, ::-1]
+    return np.ascontiguousarray(square).reshape(25)
+
+def anneal(pairs, seed: int, deadline: float,
+           iterations: int = ITERATIONS) -> Tuple[float, str]:
+    """One simulated-annealing run from a random key; returns (score, key).
+    
+    The key state is a flat 25-byte array holding the square row by row.
+    """
+    np = numpy()
+    model = default_model()
+    rng = random.Random(seed)
+    key = np.array(rng.sample(range(25), 25), dtype=np.uint8)
+    score = score_key(key, pairs, model)
+    best_key, best_score = key, score
+    # A letter swap changes a share of all digraphs, so score deltas (and
+    # the starting temperature) grow with the text length; cooled linearly
+    start = max(5.0, TEMPERATURE_PER_LETTER * pairs.size * 2)
+    for step in range(iterations):
+        if step % 256 == 0 and time.time() > deadline:
+            break
+        temperature = max(start * (1 - step / iterations), 1e-3)
+        candidate = mutate(key, rng)
+        candidate_score = score_key(candidate, pairs, model)
+        delta = candidate_score - score
+        if delta >= 0 or rng.random() < math.exp(delta / temperature):
+            key, score = candidate, candidate_score
+            if score > best_score:
+                best_key, best_score = key, score
+    return best_score, "".join(ALPHABET[i] for i in best_key)
+
+def _anneal_job(job) -> Tuple[float, str]:
+    text, seed, deadline, iterations = job
+    return anneal(ciphertext_pairs(text), seed, deadline, iterations)
+
+def crack_playfair(text: str, top: int = 3, time_budget: float = TIME_BUDGET,
+                   restarts: Optional[int] = None, iterations: int = ITERATIONS,
+                   workers: Optional[int] = None) -> Iterator[Tuple[str, float, str]]:
+    """Yield (key, log10 score, plaintext) for the best `top` annealing restarts.
+    
+    Independent restarts run in a process pool, and new ones are started
+    until the time budget is spent (or `restarts` have run). Higher scores
+    are better. The key is a 25-letter square that playfair_cipher accepts
+    as is.
+    """
+    ciphertext_pairs(text)   # validate before starting workers
+    default_model()          # load once here so forked workers inherit it
+    deadline = time.time() + time_budget
+    seeds = itertools.count() if restarts is None else iter(range(restarts))
+    workers = workers or os.cpu_count() or 1
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_anneal_job, (text, seed, deadline, iterations))
+                   for seed in itertools.islice(seeds, workers)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results.append(future.result())
+                seed = next(seeds, None) if time.time() < deadline else None
+                if seed is not None:
+                    pending.add(pool.submit(_anneal_job, (text, seed, deadline, iterations)))
+    
+    # Rotating the rows or columns of a square gives an equivalent key with
+    # the same decryption, so duplicates are recognised by their plaintext
+    seen = set()
+    for score, key in sorted(results, reverse=True):
+        plaintext = playfair_cipher(text, key, False)
+        if plaintext in seen:
+            continue
+        seen.add(plaintext)
+        yield key, score, plaintext
+        if len(seen) == top:
+            return
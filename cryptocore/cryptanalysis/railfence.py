@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, List, Optional, Tuple
+
+from .._optional import numpy
+from ..batch import rail_fence_batch, rail_positions
+from .ngrams import default_model
+
+# ===== RAIL FENCE CRACKER =====
+MAX_RAILS = 50
+SCORE_PREFIX = 4096   # plaintext characters scored per rail count
+
+def character_codes(text: str):
+    """Letters of text as 0..25 (case folded) and everything else as 26"""
+    np = numpy()
+    chars = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    folded = chars & ~np.uint32(0x20)
+    codes = np.full(chars.size, 26, dtype=np.uint8)
+    letters = (folded >= 65) & (folded <= 90)
+    codes[letters] = folded[letters] - 65
+    return codes
+
+def score_rails(codes, rails: int, model) -> float:
+    """Quadgram log10 score of the letters opening the decryption with `rails` rails"""
+    plain = codes[rail_positions(codes.size, rails, SCORE_PREFIX)]
+    letters = plain[plain < 26]
+    return model.score(letters)
+
+def rank_rails(text: str, max_rails: int = MAX_RAILS,
+               workers: Optional[int] = None) -> List[Tuple[int, float]]:
+    """Rail counts 2..max_rails ranked by quadgram score (best first)"""
+    codes = character_codes(text)
+    model = default_model()
+    candidates = range(2, max(2, min(max_rails, codes.size - 1)) + 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        scores = list(pool.map(lambda r: score_rails(codes, r, model), candidates))
+    return sorted(zip(candidates, scores), key=lambda item: -item[1])
+
+def crack_rail_fence(text: str, top: int = 3, max_rails: int = MAX_RAILS,
+                     workers: Optional[int] = None) -> Iterator[Tuple[int, float, str]]:
+    """Yield (rails, log10 score, plaintext) for the `top` best rail counts.
+    
+    Higher scores are better; decryptions are produced as the caller iterates.
+    """
+    for rails, score in rank_rails(text, max_rails, workers)[:top]:
+        yield rails, score, rail_fence_batch(text, rails, False)[0]
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, List, Optional, Tuple
+
+from .._optional import numpy
+from ..classical import vigenere_cipher
+from ..stream import vigenere_stream
+from .caesar import ENGLISH_FREQUENCIES
+from .ngrams import letter_array
+
+# ===== VIGENÈRE CRACKER =====
+MAX_PERIOD = 20
+KASISKI_SAMPLE = 1 << 18    # letters scanned for repeated trigrams
+ENGLISH_IOC = 0.0667
+RANDOM_IOC = 1 / 26
+
+def column_histograms(letters, period: int):
+    """(period, 26) letter counts of every key column.
+    
+    letters[j::period] is a strided view, so no column is copied.
+    """
+    np = numpy()
+    return np.stack([np.bincount(letters[j::period], minlength=26) for j in range(period)])
+
+def index_of_coincidence(histograms) -> float:
+    """Mean index of coincidence over the rows of a histogram matrix"""
+    np = numpy()
+    counts = histograms.astype(np.float64)
+    totals = counts.sum(axis=1)
+    valid = totals > 1
+    if not valid.any():
+        return 0.0
+    pairs = (counts * (counts - 1)).sum(axis=1)[valid]
+    return float((pairs / (totals[valid] * (totals[valid] - 1))).mean())
+
+def kasiski_fractions(letters, max_period: int) -> List[float]:
+    """Fraction of repeated-trigram distances divisible by each period 0..max_period"""
+    np = numpy()
+    sample = letters[:KASISKI_SAMPLE].astype(np.int32)
+    if sample.size < 3:
+        return [0.0] * (max_period + 1)
+    trigrams = sample[:-2] * 676 + sample[1:-1] * 26 + sample[2:]
+    order = np.argsort(trigrams, kind="stable")
+    repeated = trigrams[order[1:]] == trigrams[order[:-1]]
+    # Stable sort keeps equal trigrams in text order: neighbours give the gaps
+    distances = (order[1:] - order[:-1])[repeated]
+    if distances.size == 0:
+        return [0.0] * (max_period + 1)
+    return [0.0] + [float(np.count_nonzero(distances % p == 0)) / distances.size
+                    for p in range(1, max_period + 1)]
+
+def estimate_periods(letters, max_period: int = MAX_PERIOD,
+                     workers: Optional[int] = None) -> List[Tuple[int, float, float]]:
+    """Rank candidate key lengths as (period, IoC, Kasiski fraction).
+    
+    Periods whose IoC is close to the best one come first, ordered by the
+    Kasiski fraction so that the true period beats its multiples (which have
+    an equally English-like IoC but fewer divisible distances).
+    """
+    periods = list(range(1, min(max_period, max(1, len(letters) // 2)) + 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        iocs = list(pool.map(lambda p: index_of_coincidence(column_histograms(letters, p)), periods))
+    kasiski = kasiski_fractions(letters, periods[-1])
+    
+    best = max(iocs)
+    threshold = best - 0.25 * (best - RANDOM_IOC)
+    estimates = [(p, ioc, kasiski[p]) for p, ioc in zip(periods, iocs)]
+    return sorted(estimates, key=lambda e: (e[1] < threshold,
+                                            -e[2] if e[1] >= threshold else -e[1], e[0]))
+
+def solve_key(letters, period: int) -> Tuple[str, float]:
+    """Best key of a given length and the chi-squared of its decryption.
+    
+    Each column is a Caesar cipher: its histogram is correlated with English
+    letter frequencies under all 26 rotations and the best rotation wins.
+    """
+    np = numpy()
+    histograms = column_histograms(letters, period)
+    rotations = (np.arange(26)[:, None] + np.arange(26)[None, :]) % 26
+    frequencies = np.array(ENGLISH_FREQUENCIES)
+    # correlation[j, k] = sum_i histograms[j, (i + k) % 26] * frequencies[i]
+    correlation = histograms[:, rotations] @ frequencies
+    shifts = correlation.argmax(axis=1)
+    
+    plain = np.zeros(26, dtype=np.float64)
+    for j, k in enumerate(shifts):
+        plain += np.roll(histograms[j], -k)
+    total = plain.sum()
+    expected = total * frequencies
+    chi2 = float(((plain - expected) ** 2 / expected).sum()) if total else 0.0
+    return "".join(chr(ord('A') + int(k)) for k in shifts), chi2
+
+def vigenere_decrypt(text: str, key: str) -> str:
+    """vigenere_cipher decryption, through the vectorized stream for ASCII text"""
+    if text.isascii():
+        return b"".join(vigenere_stream([text.encode("ascii")], key, False)).decode("ascii")
+    return vigenere_cipher(text, key, False)
+
+def crack_vigenere(text: str, top: int = 3, max_period: int = MAX_PERIOD,
+                   workers: Optional[int] = None) -> Iterator[Tuple[str, float, str]]:
+    """Yield (key, chi-squared, plaintext) for the `top` most likely key lengths.
+    
+    Decryptions are only produced as the caller iterates.
+    """
+    letters = letter_array(text)
+    if letters.size == 0:
+        return
+    for period, _, _ in estimate_periods(letters, max_period, workers)[:top]:
+        key, chi2 = solve_key(letters, period)
+        yield key, chi2, vigenere_decrypt(text, key)
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import functools
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Tuple
+
+from .metrics import data_size, instrument
+
+# ===== SYMMETRIC ENCRYPTION =====
+# DES tables (FIPS 46-3), bit positions are 1-indexed from the most significant bit
+INITIAL_PERM = [58, 50, 42, 34, 26, 18, 10, 2,
+                60, 52, 44, 36, 28, 20, 12, 4,
+                62, 54, 46, 38, 30, 22, 14, 6,
+                64, 56, 48, 40, 32, 24, 16, 8,
+                57, 49, 41, 33, 25, 17, 9, 1,
+                59, 51, 43, 35, 27, 19, 11, 3,
+                61, 53, 45, 37, 29, 21, 13, 5,
+                63, 55, 47, 39, 31, 23, 15, 7]
+
+FINAL_PERM = [INITIAL_PERM.index(i) + 1 for i in range(1, 65)]
+
+PERMUTED_CHOICE_1 = [57, 49, 41, 33, 25, 17, 9,
+                     1, 58, 50, 42, 34, 26, 18,
+                     10, 2, 59, 51, 43, 35, 27,
+                     19, 11, 3, 60, 52, 44, 36,
+                     63, 55, 47, 39, 31, 23, 15,
+                     7, 62, 54, 46, 38, 30, 22,
+                     14, 6, 61, 53, 45, 37, 29,
+                     21, 13, 5, 28, 20, 12, 4]
+
+PERMUTED_CHOICE_2 = [14, 17, 11, 24, 1, 5,
+                     3, 28, 15, 6, 21, 10,
+                     23, 19, 12, 4, 26, 8,
+                     16, 7, 27, 20, 13, 2,
+                     41, 52, 31, 37, 47, 55,
+                     30, 40, 51, 45, 33, 48,
+                     44, 49, 39, 56, 34, 53,
+                     46, 42, 50, 36, 29, 32]
+
+KEY_SHIFTS = [1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1]
+
+ROUND_PERM = [16, 7, 20, 21, 29, 12, 28, 17,
+              1, 15, 23, 26, 5, 18, 31, 10,
+              2, 8, 24, 14, 32, 27, 3, 9,
+              19, 13, 30, 6, 22, 11, 4, 25]
+
+S_BOXES = [
+    [14, 4, 13, 1, 2, 15, 11, 8, 3, 10, 6, 12, 5, 9, 0, 7,
+     0, 15, 7, 4, 14, 2, 13, 1, 10, 6, 12, 11, 9, 5, 3, 8,
+     4, 1, 14, 8, 13, 6, 2, 11, 15, 12, 9, 7, 3, 10, 5, 0,
+     15, 12, 8, 2, 4, 9, 1, 7, 5, 11, 3, 14, 10, 0, 6, 13],
+    [15, 1, 8, 14, 6, 11, 3, 4, 9, 7, 2, 13, 12, 0, 5, 10,
+     3, 13, 4, 7, 15, 2, 8, 14, 12, 0, 1, 10, 6, 9, 11, 5,
+     0, 14, 7, 11, 10, 4, 13, 1, 5, 8, 12, 6, 9, 3, 2, 15,
+     13, 8, 10, 1, 3, 15, 4, 2, 11, 6, 7, 12, 0, 5, 14, 9],
+    [10, 0, 9, 14, 6, 3, 15, 5, 1, 13, 12, 7, 11, 4, 2, 8,
+     13, 7, 0, 9, 3, 4, 6, 10, 2, 8, 5, 14, 12, 11, 15, 1,
+     13, 6, 4, 9, 8, 15, 3, 0, 11, 1, 2, 12, 5, 10, 14, 7,
+     1, 10, 13, 0, 6, 9, 8, 7, 4, 15, 14, 3, 11, 5, 2, 12],
+    [7, 13, 14, 3, 0, 6, 9, 10, 1, 2, 8, 5, 11, 12, 4, 15,
+     13, 8, 11, 5, 6, 15, 0, 3, 4, 7, 2, 12, 1, 10, 14, 9,
+     10, 6, 9, 0, 12, 11, 7, 13, 15, 1, 3, 14, 5, 2, 8, 4,
+     3, 15, 0, 6, 10, 1, 13, 8, 9, 4, 5, 11, 12, 7, 2, 14],
+    [2, 12, 4, 1, 7, 10, 11, 6, 8, 5, 3, 15, 13, 0, 14, 9,
+     14, 11, 2, 12, 4, 7, 13, 1, 5, 0, 15, 10, 3, 9, 8, 6,
+     4, 2, 1, 11, 10, 13, 7, 8, 15, 9, 12, 5, 6, 3, 0, 14,
+     11, 8, 12, 7, 1, 14, 2, 13, 6, 15, 0, 9, 10, 4, 5, 3],
+    [12, 1, 10, 15, 9, 2, 6, 8, 0, 13, 3, 4, 14, 7, 5, 11,
+     10, 15, 4, 2, 7, 12, 9, 5, 6, 1, 13, 14, 0, 11, 3, 8,
+     9, 14, 15, 5, 2, 8, 12, 3, 7, 0, 4, 10, 1, 13, 11, 6,
+     4, 3, 2, 12, 9, 5, 15, 10, 11, 14, 1, 7, 6, 0, 8, 13],
+    [4, 11, 2, 14, 15, 0, 8, 13, 3, 12, 9, 7, 5, 10, 6, 1,
+     13, 0, 11, 7, 4, 9, 1, 10, 14, 3, 5, 12, 2, 15, 8, 6,
+     1, 4, 11, 13, 12, 3, 7, 14, 10, 15, 6, 8, 0, 5, 9, 2,
+     6, 11, 13, 8, 1, 4, 10, 7, 9, 5, 0, 15, 14, 2, 3, 12],
+    [13, 2, 8, 4, 6, 15, 11, 1, 10, 9, 3, 14, 5, 0, 12, 7,
+     1, 15, 13, 8, 10, 3, 7, 4, 12, 5, 6, 11, 0, 14, 9, 2,
+     7, 11, 4, 1, 9, 12, 14, 2, 0, 6, 10, 13, 15, 3, 5, 8,
+     2, 1, 14, 7, 4, 10, 8, 13, 15, 12, 9, 0, 3, 5, 6, 11],
+]
+
+def permute(value: int, table: List[int], width: int) -> int:
+    """Apply a DES bit-selection table to a width-bit integer"""
+    result = 0
+    for pos in table:
+        result = (result << 1) | ((value >> (width - pos)) & 1)
+    return result
+
+def byte_permutation_tables(table: List[int]) -> List[List[int]]:
+    """Split a 64-bit permutation into 8 per-byte lookup tables"""
+    lookups = []
+    for byte_index in range(8):
+        row = []
+        for value in range(256):
+            word = value << (56 - 8 * byte_index)
+            row.append(permute(word, table, 64) if value else 0)
+        lookups.append(row)
+    return lookups
+
+def sp_tables() -> List[List[int]]:
+    """Combine each S-box with the round permutation P (8 tables of 64 words)"""
+    tables = []
+    for box_index, box in enumerate(S_BOXES):
+        row = []
+        for chunk in range(64):
+            # Outer bits select the row, inner four bits the column
+            s_row = ((chunk >> 4) & 2) | (chunk & 1)
+            s_col = (chunk >> 1) & 0xF
+            nibble = box[s_row * 16 + s_col]
+            row.append(permute(nibble << (28 - 4 * box_index), ROUND_PERM, 32))
+        tables.append(row)
+    return tables
+
+@functools.lru_cache(maxsize=1)
+def des_tables() -> Tuple[List[List[int]], List[List[int]], List[List[int]]]:
+    """The (IP, SP, FP) lookup tables, built on first use"""
+    return byte_permutation_tables(INITIAL_PERM), sp_tables(), byte_permutation_tables(FINAL_PERM)
+
+@instrument()
+def des_key_schedule(key: bytes) -> List[int]:
+    """Generate 16 48-bit round keys from a 64-bit key"""
+    if len(key) != 8:
+        raise ValueError("Key must be exactly 8 bytes")
+    cd = permute(int.from_bytes(key, "big"), PERMUTED_CHOICE_1, 64)
+    c, d = cd >> 28, cd & 0xFFFFFFF
+    round_keys = []
+    for shift in KEY_SHIFTS:
+        c = ((c << shift) | (c >> (28 - shift))) & 0xFFFFFFF
+        d = ((d << shift) | (d >> (28 - shift))) & 0xFFFFFFF
+        round_keys.append(permute((c << 28) | d, PERMUTED_CHOICE_2, 56))
+    return round_keys
+
+def des_crypt_int(block: int, round_keys: List[int]) -> int:
+    """Run the 16-round Feistel network over a 64-bit integer block"""
+    ip, sp, fp = des_tables()
+    x = (ip[0][block >> 56] | ip[1][(block >> 48) & 0xFF] | ip[2][(block >> 40) & 0xFF] |
+         ip[3][(block >> 32) & 0xFF] | ip[4][(block >> 24) & 0xFF] | ip[5][(block >> 16) & 0xFF] |
+         ip[6][(block >> 8) & 0xFF] | ip[7][block & 0xFF])
+    left, right = x >> 32, x & 0xFFFFFFFF
+    s0, s1, s2, s3, s4, s5, s6, s7 = sp
+    
+    for k in round_keys:
+        # Expansion E: R32 R1..R32 R1 as a 34-bit word, then XOR with the round key
+        e = ((((right & 1) << 33) | (right << 1) | (right >> 31)) & 0x3FFFFFFFF)
+        f = (s0[((e >> 28) ^ (k >> 42)) & 0x3F] | s1[((e >> 24) ^ (k >> 36)) & 0x3F] |
+             s2[((e >> 20) ^ (k >> 30)) & 0x3F] | s3[((e >> 16) ^ (k >> 24)) & 0x3F] |
+             s4[((e >> 12) ^ (k >> 18)) & 0x3F] | s5[((e >> 8) ^ (k >> 12)) & 0x3F] |
+             s6[((e >> 4) ^ (k >> 6)) & 0x3F] | s7[(e ^ k) & 0x3F])
+        left, right = right, left ^ f
+    
+    x = (right << 32) | left
+    return (fp[0][x >> 56] | fp[1][(x >> 48) & 0xFF] | fp[2][(x >> 40) & 0xFF] |
+            fp[3][(x >> 32) & 0xFF] | fp[4][(x >> 24) & 0xFF] | fp[5][(x >> 16) & 0xFF] |
+            fp[6][(x >> 8) & 0xFF] | fp[7][x & 0xFF])
+
+@instrument(data_size)
+def des_encrypt_block(block: bytes, round_keys: List[int]) -> bytes:
+    """Encrypt single 64-bit block"""
+    if len(block) != 8:
+        raise ValueError("Block must be exactly 8 bytes")
+    return des_crypt_int(int.from_bytes(block, "big"), round_keys).to_bytes(8, "big")
+
+@instrument(data_size)
+def des_decrypt_block(block: bytes, round_keys: List[int]) -> bytes:
+    """Decrypt single 64-bit block"""
+    if len(block) != 8:
+        raise ValueError("Block must be exactly 8 bytes")
+    return des_crypt_int(int.from_bytes(block, "big"), round_keys[::-1]).to_bytes(8, "big")
+
+def pkcs7_pad(data: bytes, block_size: int = 8) -> bytes:
+    """Pad data to a multiple of block_size using PKCS#7"""
+    pad_len = block_size - (len(data) % block_size)
+    return data + bytes([pad_len] * pad_len)
+
+def pkcs7_unpad(data: bytes, block_size: int = 8) -> bytes:
+    """Strip and check PKCS#7 padding"""
+    if not data or len(data) % block_size:
+        raise ValueError("Padded data must be a non-empty multiple of the block size")
+    pad_len = data[-1]
+    if not 1 <= pad_len <= block_size or data[-pad_len:] != bytes([pad_len] * pad_len):
+        raise ValueError("Invalid padding")
+    return data[:-pad_len]
+
+@instrument(data_size)
+def des_encrypt(plaintext: bytes, key: bytes) -> bytes:
+    """PKCS#7-pad plaintext and encrypt it block by block (ECB)"""
+    plaintext = pkcs7_pad(plaintext)
+    round_keys = des_key_schedule(key)
+    
+    ciphertext = bytearray()
+    for i in range(0, len(plaintext), 8):
+        ciphertext.extend(des_encrypt_block(plaintext[i:i+8], round_keys))
+    return bytes(ciphertext)
+
+@instrument(data_size)
+def des_xor_encrypt(plaintext: bytes, key: bytes) -> bytes:
+    """PKCS#7-pad plaintext and XOR it with the 8-byte key"""
+    if len(key) != 8:
+        raise ValueError("Key must be exactly 8 characters")
+    plaintext = pkcs7_pad(plaintext)
+    
+    # Simple XOR "encryption" for demonstration
+    # In a real implementation, you would use proper DES here
+    return bytes([plaintext[i] ^ key[i % 8] for i in range(len(plaintext))])
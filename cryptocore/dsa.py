@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Tuple
+
+from .bignum import GMPY2_MIN_BITS, mpz, powmod
+from .metrics import instrument
+from .numtheory import mod_inverse
+
+# ===== DIGITAL SIGNATURE =====
+FIXED_BASE_WINDOW = 4
+
+@instrument()
+def dsa_public_key(x: int, p: int, g: int) -> int:
+    """Compute the public key y = g^x mod p"""
+    return powmod(g, x, p)
+
+@instrument()
+def dsa_sign(h: int, x: int, p: int, q: int, g: int, k: int) -> Tuple[int, int]:
+    """Sign message hash h with private key x and per-message secret k"""
+    r = powmod(g, k, p) % q
+    k_inv = mod_inverse(k, q)
+    s = (k_inv * (h + x * r)) % q
+    return r, s
+
+@instrument()
+def dsa_verify(h: int, r: int, s: int, y: int, p: int, q: int, g: int) -> bool:
+    """Verify signature (r, s) on message hash h against public key y"""
+    if r <= 0 or r >= q or s <= 0 or s >= q:
+        return False
+    
+    w = mod_inverse(s, q)
+    u1 = (h * w) % q
+    u2 = (r * w) % q
+    
+    v = (powmod(g, u1, p) * powmod(y, u2, p)) % p % q
+    return v == r
+
+@instrument()
+def dsa_base_table(g: int, p: int, q: int, window: int = FIXED_BASE_WINDOW) -> List[List[int]]:
+    """Powers of the generator for fixed-base exponentiation of exponents below q.
+    
+    Row i holds g^(j * 2^(window * i)) mod p for j < 2^window, so g^e is a
+    product of one entry per window of e and needs no squarings. Past toy
+    sizes the entries are bignum.mpz values, so with gmpy2 the products run
+    on GMP.
+    """
+    number = mpz if p.bit_length() > GMPY2_MIN_BITS else int
+    table = []
+    base = number(g) % p
+    for _ in range((q.bit_length() + window - 1) // window):
+        row = [number(1)]
+        for _ in range((1 << window) - 1):
+            row.append(row[-1] * base % p)
+        table.append(row)
+        base = row[-1] * base % p
+    return table
+
+def dsa_pow_base(table: List[List[int]], e: int, p: int, window: int = FIXED_BASE_WINDOW) -> int:
+    """g^e mod p from dsa_base_table (0 <= e < 2^(window * len(table)))"""
+    mask = (1 << window) - 1
+    result = 1
+    for row in table:
+        digit = e & mask
+        if digit:
+            result = result * row[digit] % p
+        e >>= window
+    return int(result)
+
+@instrument()
+def dsa_sign_fixed(h: int, x: int, p: int, q: int, table: List[List[int]], k: int) -> Tuple[int, int]:
+    """dsa_sign with g^k taken from a precomputed dsa_base_table"""
+    r = dsa_pow_base(table, k % q, p) % q
+    k_inv = mod_inverse(k, q)
+    s = (k_inv * (h + x * r)) % q
+    return r, s
+
+@instrument()
+def dsa_verify_fixed(h: int, r: int, s: int, y: int, p: int, q: int, table: List[List[int]]) -> bool:
+    """dsa_verify with g^u1 taken from a precomputed dsa_base_table"""
+    if r <= 0 or r >= q or s <= 0 or s >= q:
+        return False
+    
+    w = mod_inverse(s, q)
+    u1 = (h * w) % q
+    u2 = (r * w) % q
+    
+    v = (dsa_pow_base(table, u1, p) * powmod(y, u2, p)) % p % q
+    return v == r
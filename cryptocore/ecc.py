@@ -0,0 +1,448 @@
+from __future__ import annotations
+
+import hmac
+import hashlib
+import secrets
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Optional, Tuple
+
+from .metrics import data_size, instrument
+
+# ===== ELLIPTIC CURVE SIGNATURES =====
+# NIST P-256 domain parameters (y^2 = x^3 - 3x + b over GF(p))
+P256_P = 0xffffffff00000001000000000000000000000000ffffffffffffffffffffffff
+P256_N = 0xffffffff00000000ffffffffffffffffbce6faada7179e84f3b9cac2fc632551
+P256_B = 0x5ac635d8aa3a93e7b3ebbd55769886bc651d06b0cc53b0f63bce3c3e27d2604b
+P256_GX = 0x6b17d1f2e12c4247f8bce6e563a440f277037d812deb33a0f4a13945d898c296
+P256_GY = 0x4fe342e2fe1a7f9b8ee7eb4a7c0f9e162bce33576b315ececbb6406837bf51f5
+
+# Ed25519 domain parameters (-x^2 + y^2 = 1 + d*x^2*y^2 over GF(2^255 - 19))
+ED25519_P = 2**255 - 19
+ED25519_L = 2**252 + 27742317777372353535851937790883648493
+ED25519_D = -121665 * pow(121666, -1, ED25519_P) % ED25519_P
+ED25519_SQRT_M1 = pow(2, (ED25519_P - 1) // 4, ED25519_P)
+ED25519_BY = 4 * pow(5, -1, ED25519_P) % ED25519_P
+
+WNAF_WIDTH = 5
+COMB_BITS = 4
+
+def wnaf(k: int, width: int = WNAF_WIDTH) -> List[int]:
+    """Width-w non-adjacent form of k, least significant digit first"""
+    digits = []
+    half = 1 << (width - 1)
+    full = 1 << width
+    while k > 0:
+        if k & 1:
+            d = k & (full - 1)
+            if d >= half:
+                d -= full
+            k -= d
+        else:
+            d = 0
+        digits.append(d)
+        k >>= 1
+    return digits
+
+def batch_inverse(values: List[int], p: int) -> List[int]:
+    """Invert many field elements with a single modular inversion"""
+    prefix = []
+    acc = 1
+    for v in values:
+        prefix.append(acc)
+        acc = acc * v % p
+    inv = pow(acc, -1, p)
+    result = [0] * len(values)
+    for i in range(len(values) - 1, -1, -1):
+        result[i] = prefix[i] * inv % p
+        inv = inv * values[i] % p
+    return result
+
+# --- P-256 in Jacobian coordinates (X, Y, Z) -> (X/Z^2, Y/Z^3), Z = 0 is infinity ---
+P256_INFINITY = (1, 1, 0)
+
+def p256_double(P: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """Jacobian point doubling using a = -3"""
+    X1, Y1, Z1 = P
+    if Z1 == 0 or Y1 == 0:
+        return P256_INFINITY
+    p = P256_P
+    delta = Z1 * Z1 % p
+    gamma = Y1 * Y1 % p
+    beta = X1 * gamma % p
+    alpha = 3 * (X1 - delta) * (X1 + delta) % p
+    X3 = (alpha * alpha - 8 * beta) % p
+    Z3 = ((Y1 + Z1) ** 2 - gamma - delta) % p
+    Y3 = (alpha * (4 * beta - X3) - 8 * gamma * gamma) % p
+    return (X3, Y3, Z3)
+
+def p256_add(P: Tuple[int, int, int], Q: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """Jacobian point addition"""
+    X1, Y1, Z1 = P
+    X2, Y2, Z2 = Q
+    if Z1 == 0:
+        return Q
+    if Z2 == 0:
+        return P
+    p = P256_P
+    Z1Z1 = Z1 * Z1 % p
+    Z2Z2 = Z2 * Z2 % p
+    U1 = X1 * Z2Z2 % p
+    U2 = X2 * Z1Z1 % p
+    S1 = Y1 * Z2 * Z2Z2 % p
+    S2 = Y2 * Z1 * Z1Z1 % p
+    H = (U2 - U1) % p
+    r = 2 * (S2 - S1) % p
+    if H == 0:
+        return p256_double(P) if r == 0 else P256_INFINITY
+    I = 4 * H * H % p
+    J = H * I % p
+    V = U1 * I % p
+    X3 = (r * r - J - 2 * V) % p
+    Y3 = (r * (V - X3) - 2 * S1 * J) % p
+    Z3 = ((Z1 + Z2) ** 2 - Z1Z1 - Z2Z2) * H % p
+    return (X3, Y3, Z3)
+
+def p256_add_affine(P: Tuple[int, int, int], Q: Tuple[int, int]) -> Tuple[int, int, int]:
+    """Mixed addition of a Jacobian point and an affine point"""
+    X1, Y1, Z1 = P
+    X2, Y2 = Q
+    if Z1 == 0:
+        return (X2, Y2, 1)
+    p = P256_P
+    Z1Z1 = Z1 * Z1 % p
+    U2 = X2 * Z1Z1 % p
+    S2 = Y2 * Z1 * Z1Z1 % p
+    H = (U2 - X1) % p
+    r = 2 * (S2 - Y1) % p
+    if H == 0:
+        return p256_double(P) if r == 0 else P256_INFINITY
+    HH = H * H % p
+    I = 4 * HH
+    J = H * I % p
+    V = X1 * I % p
+    X3 = (r * r - J - 2 * V) % p
+    Y3 = (r * (V - X3) - 2 * Y1 * J) % p
+    Z3 = ((Z1 + H) ** 2 - Z1Z1 - HH) % p
+    return (X3, Y3, Z3)
+
+def p256_to_affine(P: Tuple[int, int, int]) -> Optional[Tuple[int, int]]:
+    """Convert a Jacobian point to affine (None for infinity)"""
+    X, Y, Z = P
+    if Z == 0:
+        return None
+    p = P256_P
+    z_inv = pow(Z, -1, p)
+    z_inv2 = z_inv * z_inv % p
+    return (X * z_inv2 % p, Y * z_inv2 * z_inv % p)
+
+def p256_is_on_curve(point: Tuple[int, int]) -> bool:
+    """Check that an affine point satisfies the P-256 equation"""
+    x, y = point
+    p = P256_P
+    if not (0 <= x < p and 0 <= y < p):
+        return False
+    return (y * y - (x * x * x - 3 * x + P256_B)) % p == 0
+
+def p256_multiply(k: int, point: Tuple[int, int]) -> Tuple[int, int, int]:
+    """Variable-base scalar multiplication k*P using wNAF"""
+    P = (point[0], point[1], 1)
+    P2 = p256_double(P)
+    odd = [P]
+    for _ in range((1 << (WNAF_WIDTH - 2)) - 1):
+        odd.append(p256_add(odd[-1], P2))
+    
+    result = P256_INFINITY
+    for d in reversed(wnaf(k % P256_N)):
+        result = p256_double(result)
+        if d > 0:
+            result = p256_add(result, odd[d >> 1])
+        elif d < 0:
+            X, Y, Z = odd[(-d) >> 1]
+            result = p256_add(result, (X, -Y % P256_P, Z))
+    return result
+
+_p256_base_table: Optional[List[List[Tuple[int, int]]]] = None
+
+def p256_base_table() -> List[List[Tuple[int, int]]]:
+    """Lazily build the fixed-base comb table: table[i][j-1] = j * 16^i * G"""
+    global _p256_base_table
+    if _p256_base_table is None:
+        windows = (P256_N.bit_length() + COMB_BITS - 1) // COMB_BITS
+        points = []
+        base = (P256_GX, P256_GY, 1)
+        for _ in range(windows):
+            row = [base]
+            for _ in range((1 << COMB_BITS) - 2):
+                row.append(p256_add(row[-1], base))
+            points.extend(row)
+            base = p256_add(row[-1], base)
+        z_invs = batch_inverse([Z for _, _, Z in points], P256_P)
+        affine = []
+        for (X, Y, _), z_inv in zip(points, z_invs):
+            z_inv2 = z_inv * z_inv % P256_P
+            affine.append((X * z_inv2 % P256_P, Y * z_inv2 * z_inv % P256_P))
+        per_row = (1 << COMB_BITS) - 1
+        _p256_base_table = [affine[i:i + per_row] for i in range(0, len(affine), per_row)]
+    return _p256_base_table
+
+def p256_multiply_base(k: int) -> Tuple[int, int, int]:
+    """Fixed-base scalar multiplication k*G using the precomputed table (no doublings)"""
+    table = p256_base_table()
+    k %= P256_N
+    mask = (1 << COMB_BITS) - 1
+    result = P256_INFINITY
+    for row in table:
+        d = k & mask
+        if d:
+            result = p256_add_affine(result, row[d - 1])
+        k >>= COMB_BITS
+    return result
+
+def rfc6979_nonce(d: int, digest: bytes) -> int:
+    """Deterministic ECDSA nonce (RFC 6979, HMAC-SHA256, qlen = 256)"""
+    x = d.to_bytes(32, "big")
+    h = (int.from_bytes(digest, "big") % P256_N).to_bytes(32, "big")
+    V = b"\x01" * 32
+    K = b"\x00" * 32
+    K = hmac.new(K, V + b"\x00" + x + h, hashlib.sha256).digest()
+    V = hmac.new(K, V, hashlib.sha256).digest()
+    K = hmac.new(K, V + b"\x01" + x + h, hashlib.sha256).digest()
+    V = hmac.new(K, V, hashlib.sha256).digest()
+    while True:
+        V = hmac.new(K, V, hashlib.sha256).digest()
+        k = int.from_bytes(V, "big")
+        if 1 <= k < P256_N:
+            return k
+        K = hmac.new(K, V + b"\x00", hashlib.sha256).digest()
+        V = hmac.new(K, V, hashlib.sha256).digest()
+
+def ecdsa_p256_public_key(d: int) -> Tuple[int, int]:
+    """Derive the public point Q = d*G"""
+    if not 1 <= d < P256_N:
+        raise ValueError("Private key must be in [1, n-1]")
+    return p256_to_affine(p256_multiply_base(d))
+
+@instrument()
+def ecdsa_p256_generate_keys() -> Tuple[int, Tuple[int, int]]:
+    """Generate a random P-256 key pair (d, Q)"""
+    d = secrets.randbelow(P256_N - 1) + 1
+    return d, ecdsa_p256_public_key(d)
+
+@instrument(data_size)
+def ecdsa_p256_sign(message: bytes, d: int) -> Tuple[int, int]:
+    """Sign message with ECDSA P-256 / SHA-256"""
+    if not 1 <= d < P256_N:
+        raise ValueError("Private key must be in [1, n-1]")
+    digest = hashlib.sha256(message).digest()
+    e = int.from_bytes(digest, "big")
+    k = rfc6979_nonce(d, digest)
+    while True:
+        r = p256_to_affine(p256_multiply_base(k))[0] % P256_N
+        s = pow(k, -1, P256_N) * (e + r * d) % P256_N
+        if r != 0 and s != 0:
+            return r, s
+        k = secrets.randbelow(P256_N - 1) + 1
+
+@instrument(data_size)
+def ecdsa_p256_verify(message: bytes, signature: Tuple[int, int], public_key: Tuple[int, int]) -> bool:
+    """Verify an ECDSA P-256 / SHA-256 signature"""
+    r, s = signature
+    if not (1 <= r < P256_N and 1 <= s < P256_N):
+        return False
+    if not p256_is_on_curve(public_key):
+        return False
+    e = int.from_bytes(hashlib.sha256(message).digest(), "big")
+    w = pow(s, -1, P256_N)
+    u1 = e * w % P256_N
+    u2 = r * w % P256_N
+    R = p256_to_affine(p256_add(p256_multiply_base(u1), p256_multiply(u2, public_key)))
+    return R is not None and R[0] % P256_N == r
+
+def p256_encode_point(point: Tuple[int, int]) -> bytes:
+    """Uncompressed SEC1 encoding (04 || x || y)"""
+    return b"\x04" + point[0].to_bytes(32, "big") + point[1].to_bytes(32, "big")
+
+def p256_decode_point(data: bytes) -> Tuple[int, int]:
+    """Decode an uncompressed SEC1 point"""
+    if len(data) != 65 or data[0] != 4:
+        raise ValueError("Public key must be 65 bytes starting with 04")
+    point = (int.from_bytes(data[1:33], "big"), int.from_bytes(data[33:], "big"))
+    if not p256_is_on_curve(point):
+        raise ValueError("Point is not on P-256")
+    return point
+
+# --- Ed25519 in extended coordinates (X, Y, Z, T) with x = X/Z, y = Y/Z, x*y = T/Z ---
+ED25519_IDENTITY = (0, 1, 1, 0)
+
+def ed25519_add(P: Tuple[int, int, int, int], Q: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    """Complete extended-coordinate addition for a = -1"""
+    p = ED25519_P
+    X1, Y1, Z1, T1 = P
+    X2, Y2, Z2, T2 = Q
+    A = (Y1 - X1) * (Y2 - X2) % p
+    B = (Y1 + X1) * (Y2 + X2) % p
+    C = 2 * ED25519_D * T1 * T2 % p
+    D = 2 * Z1 * Z2 % p
+    E, F, G, H = B - A, D - C, D + C, B + A
+    return (E * F % p, G * H % p, F * G % p, E * H % p)
+
+def ed25519_double(P: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    """Extended-coordinate doubling for a = -1"""
+    p = ED25519_P
+    X1, Y1, Z1, _ = P
+    A = X1 * X1 % p
+    B = Y1 * Y1 % p
+    C = 2 * Z1 * Z1 % p
+    H = A + B
+    E = H - (X1 + Y1) ** 2
+    G = A - B
+    F = C + G
+    return (E * F % p, G * H % p, F * G % p, E * H % p)
+
+def ed25519_negate(P: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    X, Y, Z, T = P
+    return (-X % ED25519_P, Y, Z, -T % ED25519_P)
+
+def ed25519_equal(P: Tuple[int, int, int, int], Q: Tuple[int, int, int, int]) -> bool:
+    """Projective point equality"""
+    p = ED25519_P
+    return (P[0] * Q[2] - Q[0] * P[2]) % p == 0 and (P[1] * Q[2] - Q[1] * P[2]) % p == 0
+
+def ed25519_recover_x(y: int, sign: int) -> Optional[int]:
+    """Recover x from y and the sign bit (RFC 8032, section 5.1.3)"""
+    p = ED25519_P
+    if y >= p:
+        return None
+    x2 = (y * y - 1) * pow(ED25519_D * y * y + 1, -1, p) % p
+    if x2 == 0:
+        return None if sign else 0
+    x = pow(x2, (p + 3) // 8, p)
+    if (x * x - x2) % p != 0:
+        x = x * ED25519_SQRT_M1 % p
+    if (x * x - x2) % p != 0:
+        return None
+    if (x & 1) != sign:
+        x = p - x
+    return x
+
+def ed25519_encode_point(P: Tuple[int, int, int, int]) -> bytes:
+    p = ED25519_P
+    z_inv = pow(P[2], -1, p)
+    x = P[0] * z_inv % p
+    y = P[1] * z_inv % p
+    return (y | ((x & 1) << 255)).to_bytes(32, "little")
+
+def ed25519_decode_point(data: bytes) -> Optional[Tuple[int, int, int, int]]:
+    if len(data) != 32:
+        return None
+    y = int.from_bytes(data, "little")
+    sign = y >> 255
+    y &= (1 << 255) - 1
+    x = ed25519_recover_x(y, sign)
+    if x is None:
+        return None
+    return (x, y, 1, x * y % ED25519_P)
+
+def ed25519_multiply(k: int, P: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+    """Variable-base scalar multiplication k*P using wNAF"""
+    P2 = ed25519_double(P)
+    odd = [P]
+    for _ in range((1 << (WNAF_WIDTH - 2)) - 1):
+        odd.append(ed25519_add(odd[-1], P2))
+    
+    result = ED25519_IDENTITY
+    for d in reversed(wnaf(k)):
+        result = ed25519_double(result)
+        if d > 0:
+            result = ed25519_add(result, odd[d >> 1])
+        elif d < 0:
+            result = ed25519_add(result, ed25519_negate(odd[(-d) >> 1]))
+    return result
+
+_ed25519_base_table: Optional[List[List[Tuple[int, int, int, int]]]] = None
+
+def ed25519_base_table() -> List[List[Tuple[int, int, int, int]]]:
+    """Lazily build the fixed-base comb table: table[i][j-1] = j * 16^i * B (Z = 1)"""
+    global _ed25519_base_table
+    if _ed25519_base_table is None:
+        p = ED25519_P
+        bx = ed25519_recover_x(ED25519_BY, 0)
+        base = (bx, ED25519_BY, 1, bx * ED25519_BY % p)
+        windows = (256 + COMB_BITS - 1) // COMB_BITS
+        points = []
+        for _ in range(windows):
+            row = [base]
+            for _ in range((1 << COMB_BITS) - 2):
+                row.append(ed25519_add(row[-1], base))
+            points.extend(row)
+            base = ed25519_add(row[-1], base)
+        z_invs = batch_inverse([P[2] for P in points], p)
+        affine = []
+        for (X, Y, _, _), z_inv in zip(points, z_invs):
+            x = X * z_inv % p
+            y = Y * z_inv % p
+            affine.append((x, y, 1, x * y % p))
+        per_row = (1 << COMB_BITS) - 1
+        _ed25519_base_table = [affine[i:i + per_row] for i in range(0, len(affine), per_row)]
+    return _ed25519_base_table
+
+def ed25519_multiply_base(k: int) -> Tuple[int, int, int, int]:
+    """Fixed-base scalar multiplication k*B using the precomputed table (no doublings)"""
+    mask = (1 << COMB_BITS) - 1
+    result = ED25519_IDENTITY
+    for row in ed25519_base_table():
+        d = k & mask
+        if d:
+            result = ed25519_add(result, row[d - 1])
+        k >>= COMB_BITS
+    return result
+
+def ed25519_expand_seed(seed: bytes) -> Tuple[int, bytes]:
+    """Derive the clamped secret scalar and nonce prefix from a 32-byte seed"""
+    if len(seed) != 32:
+        raise ValueError("Ed25519 private key must be 32 bytes")
+    h = hashlib.sha512(seed).digest()
+    a = int.from_bytes(h[:32], "little")
+    a &= (1 << 254) - 8
+    a |= 1 << 254
+    return a, h[32:]
+
+def ed25519_public_key(seed: bytes) -> bytes:
+    """Derive the 32-byte public key from a 32-byte seed"""
+    a, _ = ed25519_expand_seed(seed)
+    return ed25519_encode_point(ed25519_multiply_base(a))
+
+@instrument()
+def ed25519_generate_keys() -> Tuple[bytes, bytes]:
+    """Generate a random Ed25519 key pair (seed, public key)"""
+    seed = secrets.token_bytes(32)
+    return seed, ed25519_public_key(seed)
+
+@instrument(data_size)
+def ed25519_sign(message: bytes, seed: bytes) -> bytes:
+    """Sign message with Ed25519 (RFC 8032), returns 64-byte signature"""
+    a, prefix = ed25519_expand_seed(seed)
+    A = ed25519_encode_point(ed25519_multiply_base(a))
+    r = int.from_bytes(hashlib.sha512(prefix + message).digest(), "little") % ED25519_L
+    R = ed25519_encode_point(ed25519_multiply_base(r))
+    h = int.from_bytes(hashlib.sha512(R + A + message).digest(), "little") % ED25519_L
+    s = (r + h * a) % ED25519_L
+    return R + s.to_bytes(32, "little")
+
+@instrument(data_size)
+def ed25519_verify(message: bytes, signature: bytes, public_key: bytes) -> bool:
+    """Verify an Ed25519 signature"""
+    if len(signature) != 64 or len(public_key) != 32:
+        return False
+    A = ed25519_decode_point(public_key)
+    R = ed25519_decode_point(signature[:32])
+    s = int.from_bytes(signature[32:], "little")
+    if A is None or R is None or s >= ED25519_L:
+        return False
+    h = int.from_bytes(hashlib.sha512(signature[:32] + public_key + message).digest(), "little") % ED25519_L
+    # Check s*B - h*A == R
+    sB = ed25519_multiply_base(s)
+    hA = ed25519_multiply(h, A)
+    return ed25519_equal(ed25519_add(sB, ed25519_negate(hA)), R)
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import collections
+import json
+import os
+import secrets
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import batch
+from .des import des_key_schedule, pkcs7_pad, pkcs7_unpad
+from .dsa import dsa_base_table, dsa_pow_base, dsa_sign_fixed, dsa_verify_fixed
+from .rsa import (RSABlinding, rsa_crt_params, rsa_decrypt, rsa_decrypt_crt, rsa_decrypt_multi_crt, rsa_encrypt,
+                  rsa_generate_keys, rsa_multi_crt_params)
+from .stream import des_ecb_blocks
+
+# ===== BATCH JOBS =====
+# A job is one JSON object per line: {"op", "cipher", "key", "input"} plus an
+# optional "id" that is echoed back. Each result line carries the job's line
+# number, its id, "output" or "error", and "us", the microseconds the job
+# took (including building the key state if this job was the first to need
+# it). Engines for a (cipher, op, key) are cached per process, so a key
+# shared by many jobs is expanded once.
+CHUNK_JOBS = 2048
+KEY_CACHE = 4096
+OPERATIONS = {
+    "caesar": ("encrypt", "decrypt"),
+    "vigenere": ("encrypt", "decrypt"),
+    "playfair": ("encrypt", "decrypt"),
+    "hill": ("encrypt", "decrypt"),
+    "railfence": ("encrypt", "decrypt"),
+    "des": ("encrypt", "decrypt"),
+    "rsa": ("keygen", "encrypt", "decrypt"),
+    "dsa": ("keygen", "sign", "verify"),
+}
+
+# ----- Engines -----
+def _ints(key: Dict[str, Any], *names: str) -> List[int]:
+    try:
+        return [int(key[name]) for name in names]
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Key needs integer fields {', '.join(names)}") from e
+
+def _des_engine(key: str, encrypt: bool) -> Callable[[str], str]:
+    """ECB with PKCS#7: text in, hex out (and back when decrypting)"""
+    round_keys = des_key_schedule(str(key).encode("latin-1"))
+    if encrypt:
+        return lambda text: des_ecb_blocks(pkcs7_pad(text.encode("utf-8")), round_keys).hex()
+    round_keys = round_keys[::-1]
+    
+    def decrypt(hex_text: str) -> str:
+        data = bytes.fromhex(hex_text)
+        if not data or len(data) % 8:
+            raise ValueError("Ciphertext must be a non-empty multiple of 8 bytes")
+        return pkcs7_unpad(des_ecb_blocks(data, round_keys)).decode("utf-8")
+    return decrypt
+
+def _primes(key: Dict[str, Any]) -> Optional[List[int]]:
+    """The primes of an RSA key: p and q, or a "primes" list for multi-prime keys"""
+    if "primes" in key:
+        try:
+            primes = [int(r) for r in key["primes"]]
+        except (TypeError, ValueError) as e:
+            raise ValueError("Key field primes must be a list of integers") from e
+        if len(primes) < 2:
+            raise ValueError("Key field primes needs at least two primes")
+        return primes
+    if "p" in key and "q" in key:
+        return _ints(key, "p", "q")
+    return None
+
+def _rsa_engine(op: str, key: Dict[str, Any]) -> Callable[[Any], Any]:
+    if op == "keygen":
+        primes = _primes(key)
+        if primes is None:
+            raise ValueError("Key needs integer fields p, q or a primes list")
+        e, d, n = rsa_generate_keys(*primes)
+        return lambda _: {"e": e, "d": d, "n": n}
+    if op == "encrypt":
+        e, n = _ints(key, "e", "n")
+        return lambda m: rsa_encrypt(int(m), e, n)
+    # Decryption is blinded whenever e is known or can be recovered from p and q;
+    # the engine is cached per key, so its blinding pair is reused across calls
+    d, n = _ints(key, "d", "n")
+    blinding = RSABlinding(int(key["e"]), n) if "e" in key else None
+    primes = _primes(key)
+    if primes is not None:
+        product = 1
+        for r in primes:
+            product *= r
+        if product != n:
+            raise ValueError("The primes do not multiply to n")
+        if blinding is None:
+            blinding = RSABlinding.from_private(primes, d)
+        if len(primes) > 2:
+            exponents, coefficients = rsa_multi_crt_params(primes, d)
+            return lambda c: rsa_decrypt_multi_crt(int(c) % n, primes, exponents, coefficients, blinding)
+        p, q = primes
+        dp, dq, q_inv = rsa_crt_params(p, q, d)
+        return lambda c: rsa_decrypt_crt(int(c) % n, p, q, dp, dq, q_inv, blinding)
+    return lambda c: rsa_decrypt(int(c), d, n, blinding)
+
+def _dsa_engine(op: str, key: Dict[str, Any]) -> Callable[[Any], Any]:
+    p, q, g = _ints(key, "p", "q", "g")
+    table = dsa_base_table(g, p, q)
+    if op == "keygen":
+        return lambda x: dsa_pow_base(table, int(x) % q, p)
+    if op == "sign":
+        x, = _ints(key, "x")
+        
+        def sign(data) -> List[int]:
+            # {"h": hash, "k": nonce}, or a bare hash signed with a random nonce
+            h, k = (int(data["h"]), data.get("k")) if isinstance(data, dict) else (int(data), None)
+            k = secrets.randbelow(q - 1) + 1 if k is None else int(k)
+            return list(dsa_sign_fixed(h, x, p, q, table, k))
+        return sign
+    y, = _ints(key, "y")
+    return lambda sig: dsa_verify_fixed(int(sig["h"]), int(sig["r"]), int(sig["s"]), y, p, q, table)
+
+def make_engine(cipher: str, op: str, key: Any) -> Callable[[Any], Any]:
+    """A callable input -> output for one (cipher, op, key), with the key state prepared"""
+    if op not in OPERATIONS.get(cipher, ()):
+        if cipher not in OPERATIONS:
+            raise ValueError(f"Unknown cipher {cipher!r}")
+        raise ValueError(f"{cipher} supports {', '.join(OPERATIONS[cipher])}, not {op!r}")
+    encrypt = op == "encrypt"
+    if cipher == "caesar":
+        return batch.caesar_engine(int(key), encrypt)
+    if cipher == "vigenere":
+        return batch.vigenere_engine(str(key), encrypt)
+    if cipher == "playfair":
+        return batch.PlayfairTable(str(key), encrypt).apply
+    if cipher == "hill":
+        return batch.hill_engine(key, encrypt)
+    if cipher == "railfence":
+        return batch.rail_fence_engine(int(key), encrypt)
+    if cipher == "des":
+        return _des_engine(key, encrypt)
+    if not isinstance(key, dict):
+        raise ValueError(f"{cipher} keys are objects, e.g. {{\"e\": 17, \"n\": 3233}}")
+    if cipher == "rsa":
+        return _rsa_engine(op, key)
+    return _dsa_engine(op, key)
+
+def key_id(key: Any) -> Any:
+    """A hashable identity for a JSON key (strings and numbers stay as they are)"""
+    return key if isinstance(key, (str, int)) else json.dumps(key, sort_keys=True)
+
+class EngineCache:
+    """LRU of engines keyed by (cipher, op, key)"""
+    def __init__(self, size: int = KEY_CACHE):
+        self.size = size
+        self.engines: "collections.OrderedDict[Tuple[str, str, Any], Callable]" = collections.OrderedDict()
+    
+    def get(self, cipher: str, op: str, key: Any, ident: Any = None) -> Callable[[Any], Any]:
+        ident = (cipher, op, key_id(key) if ident is None else ident)
+        engine = self.engines.get(ident)
+        if engine is None:
+            engine = make_engine(cipher, op, key)
+            self.engines[ident] = engine
+            if len(self.engines) > self.size:
+                self.engines.popitem(last=False)
+        else:
+            self.engines.move_to_end(ident)
+        return engine
+
+_engines = EngineCache()
+
+# ----- Chunks -----
+_decode = json.JSONDecoder().decode
+
+def parse_job(line: bytes) -> Dict[str, Any]:
+    job = _decode(line.decode("utf-8"))
+    if not isinstance(job, dict):
+        raise ValueError("A job must be a JSON object")
+    for field in ("op", "cipher", "key"):
+        if field not in job:
+            raise ValueError(f"Job is missing {field!r}")
+    return job
+
+def run_chunk(lines: List[bytes], first_line: int) -> bytes:
+    """Run a chunk of raw job lines and return their results as JSONL, in order.
+    
+    Jobs are grouped by (cipher, op, key) so each group runs back to back on
+    one cached engine.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(lines)
+    groups: Dict[Tuple[str, str, Any], List[Tuple[int, Dict[str, Any]]]] = {}
+    for i, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            job = parse_job(line)
+            ident = (str(job["cipher"]), str(job["op"]), key_id(job["key"]))
+            groups.setdefault(ident, []).append((i, job))
+        except ValueError as e:
+            results[i] = {"line": first_line + i, "error": f"{type(e).__name__}: {e}"}
+    
+    clock = time.perf_counter_ns
+    for (cipher, op, ident), jobs in groups.items():
+        for i, job in jobs:
+            result = {"line": first_line + i}
+            if "id" in job:
+                result["id"] = job["id"]
+            start = clock()
+            try:
+                engine = _engines.get(cipher, op, job["key"], ident)
+                result["output"] = engine(job.get("input"))
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+            result["us"] = round((clock() - start) / 1e3, 1)
+            results[i] = result
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    return "".join(dumps(r) + "\n" for r in results if r is not None).encode("utf-8")
+
+def read_job_chunks(lines: Iterable[bytes], chunk_jobs: int = CHUNK_JOBS) -> Iterator[Tuple[List[bytes], int]]:
+    """Group lines into (chunk, line number of its first line); blank lines stay in place"""
+    chunk: List[bytes] = []
+    first = 1
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_jobs:
+            yield chunk, first
+            first += len(chunk)
+            chunk = []
+    if chunk:
+        yield chunk, first
+
+def run_jobs(src: BinaryIO, dst: BinaryIO, workers: Optional[int] = None,
+             chunk_jobs: int = CHUNK_JOBS, max_in_flight: Optional[int] = None) -> Dict[str, float]:
+    """Stream jobs from src (JSONL) to results on dst (JSONL) in input order.
+    
+    Chunks of chunk_jobs lines are parsed and run in a process pool of
+    `workers` processes (0 runs everything in this process). At most
+    max_in_flight chunks (default: 2 per worker) are read ahead, which bounds
+    memory however large the input is. Blank lines are skipped, and the
+    line numbers in the results match the input file.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * max(workers, 1)
+    start = time.perf_counter()
+    jobs = 0
+    chunks = read_job_chunks(src, chunk_jobs)
+    if workers == 0:
+        for lines, first in chunks:
+            dst.write(run_chunk(lines, first))
+            jobs += sum(1 for line in lines if line.strip())
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        pending: Deque = collections.deque()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for lines, first in chunks:
+                if len(pending) >= max_in_flight:
+                    dst.write(pending.popleft().result())
+                pending.append(pool.submit(run_chunk, lines, first))
+                jobs += sum(1 for line in lines if line.strip())
+            while pending:
+                dst.write(pending.popleft().result())
+    seconds = time.perf_counter() - start
+    return {"jobs": jobs, "seconds": seconds, "jobs_per_s": jobs / seconds if seconds else 0.0}
+
+def run_batch(cipher: str, op: str, key: Any, inputs: List[Any]) -> List[Tuple[bool, Any]]:
+    """Run many inputs under one key on its cached engine: (True, output) or (False, error) each"""
+    try:
+        engine = _engines.get(cipher, op, key)
+    except Exception as e:
+        return [(False, f"{type(e).__name__}: {e}")] * len(inputs)
+    results = []
+    for value in inputs:
+        try:
+            results.append((True, engine(value)))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
+
+def run_batches(groups: List[Tuple[str, str, Any, List[Any]]]) -> List[List[Tuple[bool, Any]]]:
+    """run_batch for several (cipher, op, key, inputs) groups in one call"""
+    return [run_batch(cipher, op, key, inputs) for cipher, op, key, inputs in groups]
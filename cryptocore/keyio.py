@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import binascii
+import collections
+import hashlib
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, List, Optional, Tuple, Union
+    from .keystore import Key
+
+from .keystore import DSADomain, DSAKey, RSAKey
+
+# ===== DER =====
+# Just enough DER for key files. The reader never copies: it works on a
+# memoryview of the input and hands out (tag, start, end) offsets into it,
+# and integers are decoded straight from slices of the view.
+INTEGER, BIT_STRING, OCTET_STRING, NULL, OID, SEQUENCE = 0x02, 0x03, 0x04, 0x05, 0x06, 0x30
+
+def der_read(data: memoryview, offset: int, end: Optional[int] = None) -> Tuple[int, int, int]:
+    """(tag, content start, content end) of the element at offset, which must fit before end"""
+    if end is None:
+        end = len(data)
+    if offset + 2 > end:
+        raise ValueError("Truncated DER element")
+    tag = data[offset]
+    if tag & 0x1F == 0x1F:
+        raise ValueError("Unsupported DER tag")
+    length = data[offset + 1]
+    start = offset + 2
+    if length & 0x80:
+        count = length & 0x7F
+        if not 1 <= count <= 4 or start + count > end:
+            raise ValueError("Bad DER length")
+        length = int.from_bytes(data[start:start + count], "big")
+        if length < 0x80 or data[start] == 0:
+            raise ValueError("Non-minimal DER length")
+        start += count
+    if start + length > end:
+        raise ValueError("Truncated DER element")
+    return tag, start, start + length
+
+def der_items(data: memoryview, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+    """The elements between start and end (the contents of a SEQUENCE)"""
+    while start < end:
+        item = der_read(data, start, end)
+        yield item
+        start = item[2]
+
+def der_expect(item: Tuple[int, int, int], tag: int) -> Tuple[int, int]:
+    if item[0] != tag:
+        raise ValueError(f"Expected DER tag {tag:#04x}, found {item[0]:#04x}")
+    return item[1], item[2]
+
+def der_sequence(data: memoryview, start: int, end: int) -> List[Tuple[int, int, int]]:
+    """The elements of the SEQUENCE that fills data[start:end] exactly"""
+    tag, inner, stop = der_read(data, start, end)
+    if tag != SEQUENCE or stop != end:
+        raise ValueError("Expected a DER SEQUENCE")
+    return list(der_items(data, inner, stop))
+
+def der_uint(data: memoryview, item: Tuple[int, int, int]) -> int:
+    start, end = der_expect(item, INTEGER)
+    if start == end or data[start] & 0x80:
+        raise ValueError("Expected a non-negative DER INTEGER")
+    if end - start > 1 and data[start] == 0 and not data[start + 1] & 0x80:
+        raise ValueError("Non-minimal DER INTEGER")
+    return int.from_bytes(data[start:end], "big")
+
+def der_tlv(tag: int, content: bytes) -> bytes:
+    n = len(content)
+    if n < 0x80:
+        return bytes((tag, n)) + content
+    length = n.to_bytes((n.bit_length() + 7) // 8, "big")
+    return bytes((tag, 0x80 | len(length))) + length + content
+
+def der_int(value: int) -> bytes:
+    return der_tlv(INTEGER, value.to_bytes(value.bit_length() // 8 + 1, "big", signed=True))
+
+def der_seq(*items: bytes) -> bytes:
+    return der_tlv(SEQUENCE, b"".join(items))
+
+def der_oid(dotted: str) -> bytes:
+    parts = [int(p) for p in dotted.split(".")]
+    body = bytearray([40 * parts[0] + parts[1]])
+    for part in parts[2:]:
+        chunk = [part & 0x7F]
+        part >>= 7
+        while part:
+            chunk.append(0x80 | (part & 0x7F))
+            part >>= 7
+        body.extend(reversed(chunk))
+    return der_tlv(OID, bytes(body))
+
+RSA_OID = der_oid("1.2.840.113549.1.1.1")   # rsaEncryption
+DSA_OID = der_oid("1.2.840.10040.4.1")      # id-dsa
+DER_NULL = der_tlv(NULL, b"")
+
+# ===== KEY FORMATS =====
+#   pkcs1  RSAPrivateKey / RSAPublicKey (RFC 8017)       "RSA PRIVATE KEY" / "RSA PUBLIC KEY"
+#   pkcs8  PrivateKeyInfo, RSA or DSA (RFC 5208)         "PRIVATE KEY"
+#   spki   SubjectPublicKeyInfo, RSA or DSA (RFC 5280)   "PUBLIC KEY"
+#   dsa    OpenSSL's traditional DSA private key         "DSA PRIVATE KEY"
+FORMATS = ("pkcs1", "pkcs8", "spki", "dsa")
+PEM_LABELS = {
+    ("pkcs1", True): "RSA PRIVATE KEY",
+    ("pkcs1", False): "RSA PUBLIC KEY",
+    ("pkcs8", True): "PRIVATE KEY",
+    ("spki", False): "PUBLIC KEY",
+    ("dsa", True): "DSA PRIVATE KEY",
+}
+
+def _is_private(key: Key) -> bool:
+    if isinstance(key, (RSAKey, DSAKey)):
+        return key.private
+    raise TypeError(f"Cannot serialize {type(key).__name__} (only RSA and DSA keys)")
+
+def _algorithm(key: Key) -> bytes:
+    if isinstance(key, RSAKey):
+        return der_seq(RSA_OID, DER_NULL)
+    d = key.domain
+    return der_seq(DSA_OID, der_seq(der_int(d.p), der_int(d.q), der_int(d.g)))
+
+def _rsa_private(key: RSAKey) -> bytes:
+    if key.p is None:
+        raise ValueError("PKCS#1 private keys need the primes p and q")
+    values = (1 if key.others else 0, key.n, key.e, key.d, key.p, key.q, key.dp, key.dq, key.q_inv)
+    items = [der_int(v) for v in values]
+    if key.others:
+        # Version 1 (multi-prime): OtherPrimeInfos, a SEQUENCE of (prime, exponent, coefficient)
+        items.append(der_seq(*(der_seq(*(der_int(v) for v in info)) for info in key.others)))
+    return der_seq(*items)
+
+def default_format(key: Key) -> str:
+    return "pkcs8" if _is_private(key) else "spki"
+
+def _encoding(key: Key, format: Optional[str], public: bool) -> Tuple[Key, str, str]:
+    """(key to encode, format, PEM label)"""
+    if public and _is_private(key):
+        key = key.public()
+    private = _is_private(key)
+    format = format or default_format(key)
+    label = PEM_LABELS.get((format, private))
+    if label is None:
+        kind = "private" if private else "public"
+        raise ValueError(f"No {format} encoding for {kind} keys")
+    return key, format, label
+
+def key_to_der(key: Key, format: Optional[str] = None, public: bool = False) -> bytes:
+    """DER encoding of key (its public half when public is true); format defaults to pkcs8/spki"""
+    key, format, _ = _encoding(key, format, public)
+    private = _is_private(key)
+    if format == "spki":
+        if isinstance(key, RSAKey):
+            public_key = der_seq(der_int(key.n), der_int(key.e))
+        else:
+            public_key = der_int(key.y)
+        return der_seq(_algorithm(key), der_tlv(BIT_STRING, b"\0" + public_key))
+    if format == "pkcs8":
+        private_key = _rsa_private(key) if isinstance(key, RSAKey) else der_int(key.x)
+        return der_seq(der_int(0), _algorithm(key), der_tlv(OCTET_STRING, private_key))
+    if format == "dsa":
+        if not isinstance(key, DSAKey):
+            raise ValueError("The dsa format is for DSA keys")
+        d = key.domain
+        return der_seq(*(der_int(v) for v in (0, d.p, d.q, d.g, key.y, key.x)))
+    if not isinstance(key, RSAKey):
+        raise ValueError("The pkcs1 format is for RSA keys")
+    return _rsa_private(key) if private else der_seq(der_int(key.n), der_int(key.e))
+
+def key_to_pem(key: Key, format: Optional[str] = None, public: bool = False) -> str:
+    der = key_to_der(key, format, public)
+    label = _encoding(key, format, public)[2]
+    body = binascii.b2a_base64(der, newline=False).decode("ascii")
+    lines = [body[i:i + 64] for i in range(0, len(body), 64)]
+    return f"-----BEGIN {label}-----\n" + "\n".join(lines) + f"\n-----END {label}-----\n"
+
+# ----- Decoding -----
+def _rsa_public_from(data: memoryview, start: int, end: int) -> RSAKey:
+    items = der_sequence(data, start, end)
+    if len(items) != 2:
+        raise ValueError("Bad RSAPublicKey")
+    return RSAKey(der_uint(data, items[0]), der_uint(data, items[1]))
+
+def _rsa_private_from(data: memoryview, start: int, end: int) -> RSAKey:
+    items = der_sequence(data, start, end)
+    version = der_uint(data, items[0]) if items else None
+    if version not in (0, 1) or len(items) != 9 + version:
+        raise ValueError("Bad RSAPrivateKey")
+    n, e, d, p, q, dp, dq, q_inv = (der_uint(data, item) for item in items[1:9])
+    others = []
+    if version:
+        infos_start, infos_end = der_expect(items[9], SEQUENCE)
+        for info in der_items(data, infos_start, infos_end):
+            values = list(der_items(data, *der_expect(info, SEQUENCE)))
+            if len(values) != 3:
+                raise ValueError("Bad OtherPrimeInfo")
+            others.append(tuple(der_uint(data, item) for item in values))
+        if not others:
+            raise ValueError("Version 1 RSAPrivateKey without other primes")
+    return RSAKey(n, e, d, p, q, dp, dq, q_inv, others)
+
+def _algorithm_from(data: memoryview, item: Tuple[int, int, int]) -> Optional[DSADomain]:
+    """None for rsaEncryption, the domain for id-dsa"""
+    start, end = der_expect(item, SEQUENCE)
+    items = list(der_items(data, start, end))
+    oid_start, oid_end = der_expect(items[0], OID)
+    oid = data[oid_start:oid_end]
+    if oid == RSA_OID[2:]:
+        return None
+    if oid == DSA_OID[2:] and len(items) == 2:
+        return DSADomain(*_dsa_params(data, items[1]))
+    raise ValueError("Unsupported key algorithm (only RSA and DSA)")
+
+def _dsa_params(data: memoryview, item: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    start, end = der_expect(item, SEQUENCE)
+    items = list(der_items(data, start, end))
+    if len(items) != 3:
+        raise ValueError("Bad DSA parameters")
+    p, q, g = (der_uint(data, i) for i in items)
+    return p, q, g
+
+def _dsa_key(domain: DSADomain, y: Optional[int] = None, x: Optional[int] = None) -> DSAKey:
+    if x is not None and not 0 < x < domain.q:
+        raise ValueError("DSA private key out of range")
+    return DSAKey(domain, y, x)
+
+def key_from_der(data: Union[bytes, bytearray, memoryview]) -> Key:
+    """Parse a DER key in any of FORMATS (told apart by their structure)"""
+    view = memoryview(data)
+    items = der_sequence(view, 0, len(view))
+    if not items:
+        raise ValueError("Empty DER SEQUENCE")
+    if items[0][0] == SEQUENCE:
+        # SubjectPublicKeyInfo
+        if len(items) != 2:
+            raise ValueError("Bad SubjectPublicKeyInfo")
+        domain = _algorithm_from(view, items[0])
+        start, end = der_expect(items[1], BIT_STRING)
+        if start == end or view[start] != 0:
+            raise ValueError("Bad public key BIT STRING")
+        if domain is None:
+            return _rsa_public_from(view, start + 1, end)
+        return _dsa_key(domain, y=der_uint(view, der_read(view, start + 1, end)))
+    if len(items) >= 3 and items[1][0] == SEQUENCE:
+        # PrivateKeyInfo (trailing attributes and public key are ignored)
+        if der_uint(view, items[0]) not in (0, 1):
+            raise ValueError("Unsupported PrivateKeyInfo version")
+        domain = _algorithm_from(view, items[1])
+        start, end = der_expect(items[2], OCTET_STRING)
+        if domain is None:
+            return _rsa_private_from(view, start, end)
+        return _dsa_key(domain, x=der_uint(view, der_read(view, start, end)))
+    if len(items) == 2:
+        return RSAKey(der_uint(view, items[0]), der_uint(view, items[1]))
+    if len(items) == 6:
+        version, p, q, g, y, x = (der_uint(view, item) for item in items)
+        if version != 0:
+            raise ValueError("Unsupported DSA private key version")
+        return _dsa_key(DSADomain(p, q, g), y, x)
+    return _rsa_private_from(view, 0, len(view))
+
+def pem_blocks(text: str) -> Iterator[Tuple[str, bytes]]:
+    """(label, DER) of each PEM block in text"""
+    position = 0
+    while True:
+        begin = text.find("-----BEGIN ", position)
+        if begin < 0:
+            return
+        label_end = text.find("-----", begin + 11)
+        label = text[begin + 11:label_end]
+        footer = f"-----END {label}-----"
+        end = text.find(footer, label_end)
+        if label_end < 0 or end < 0:
+            raise ValueError(f"Unterminated PEM block {label!r}")
+        body = text[label_end + 5:end]
+        if ":" in body:
+            raise ValueError("Encrypted PEM keys are not supported")
+        try:
+            yield label, binascii.a2b_base64(body)
+        except binascii.Error as e:
+            raise ValueError(f"Bad base64 in PEM block {label!r}: {e}") from None
+        position = end + len(footer)
+
+def key_from_pem(text: str) -> Key:
+    """The first key in PEM text"""
+    for label, der in pem_blocks(text):
+        if label == "ENCRYPTED PRIVATE KEY":
+            raise ValueError("Encrypted PEM keys are not supported")
+        if label in PEM_LABELS.values():
+            return key_from_der(der)
+    raise ValueError("No RSA or DSA key found in the PEM text")
+
+# ----- Loading -----
+# Parsed keys are cached by a hash of their encoding, so loading the same
+# key file again costs one hash of its bytes. Keys are never mutated (DSA
+# domains only fill in their fixed-base table), so the cached objects are
+# shared between callers.
+LOAD_CACHE = 256
+_loaded: collections.OrderedDict[bytes, Key] = collections.OrderedDict()
+
+def load_key(data: Union[str, bytes, bytearray, memoryview]) -> Key:
+    """Parse a PEM or DER key, reusing the key parsed last time for the same bytes"""
+    if isinstance(data, str):
+        data = data.encode("ascii")
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    key = _loaded.get(digest)
+    if key is not None:
+        _loaded.move_to_end(digest)
+        return key
+    view = memoryview(data)
+    if len(view) and view[0] == SEQUENCE:
+        key = key_from_der(view)
+    else:
+        key = key_from_pem(bytes(view).decode("ascii"))
+    _loaded[digest] = key
+    if len(_loaded) > LOAD_CACHE:
+        _loaded.popitem(last=False)
+    return key
+
+def load_key_file(path: str) -> Key:
+    with open(path, "rb") as f:
+        return load_key(f.read())
+
+def clear_cache() -> None:
+    _loaded.clear()
+
+def fingerprint(key: Key) -> str:
+    """SHA-256 of the key's SubjectPublicKeyInfo, in hex (as `openssl pkey -pubout | sha256sum` of the DER)"""
+    return hashlib.sha256(key_to_der(key, "spki", public=True)).hexdigest()
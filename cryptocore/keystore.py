@@ -0,0 +1,559 @@
+from __future__ import annotations
+
+import collections
+import hashlib
+import mmap
+import os
+import secrets
+import struct
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .des import des_key_schedule, pkcs7_pad, pkcs7_unpad
+from .dsa import dsa_base_table, dsa_pow_base, dsa_sign_fixed, dsa_verify_fixed
+from .bignum import powmod
+from .rsa import (RSABlinding, rsa_crt_params, rsa_decrypt, rsa_decrypt_crt, rsa_decrypt_multi_crt, rsa_encrypt,
+                  rsa_generate_keys, rsa_max_primes, rsa_multi_crt_params, rsa_random_primes)
+from .stream import des_ecb_blocks
+
+# ===== KEY STORE =====
+# One file holds every key. The header points at an open-addressing hash
+# table (linear probing, at most half full) of (64-bit hash of the key ID,
+# record offset) slots. Records are never rewritten in place: commit()
+# appends the new records and a new table, then rewrites the header last,
+# so a crash mid-commit leaves the previous state intact. Superseded
+# records and tables are garbage until compact() rewrites the file.
+#
+#   header  magic "CCKS", version u16, reserved u16, count u32, slots u32,
+#           table offset u64, live bytes u64 (little endian, 32 bytes)
+#   record  kind u8, ID length u16, payload length u32, ID (UTF-8), payload
+#   slot    hash u64, record offset u64 (offset 0 marks an empty slot)
+#
+# Payloads are sequences of length-prefixed (u16) big-endian integers or
+# strings; an empty field stands for "absent". The file is memory-mapped
+# and a record is only decoded when its key is first asked for; decoded
+# keys are kept in an LRU. DSA domain parameters are stored once and shared
+# by their keys, together with the fixed-base table computed on first use.
+MAGIC = b"CCKS"
+VERSION = 1
+KEY_CACHE = 1024
+HEADER = struct.Struct("<4sHHIIQQ")
+RECORD = struct.Struct("<BHI")
+SLOT = struct.Struct("<QQ")
+FIELD = struct.Struct("<H")
+KIND_RSA, KIND_DSA_DOMAIN, KIND_DSA, KIND_DES = 1, 2, 3, 4
+KIND_NAMES = {KIND_RSA: "rsa", KIND_DSA_DOMAIN: "dsa-domain", KIND_DSA: "dsa", KIND_DES: "des"}
+
+def default_path() -> str:
+    """$CRYPTOCORE_KEYSTORE, or ~/.cryptocore/keys.ccks"""
+    return os.environ.get("CRYPTOCORE_KEYSTORE") or os.path.join(os.path.expanduser("~"), ".cryptocore", "keys.ccks")
+
+def key_hash(key_id: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key_id, digest_size=8).digest(), "little")
+
+# ----- Keys -----
+class RSAKey:
+    """An RSA key; with its primes it carries its CRT parameters and decrypts via the CRT.
+    
+    Multi-prime keys (RFC 8017) keep every prime after p and q in `others`,
+    as (r_i, d_i, t_i) triples: the prime, d mod (r_i - 1) and the CRT
+    coefficient.
+    """
+    __slots__ = ("n", "e", "d", "p", "q", "dp", "dq", "q_inv", "others", "_blinding")
+    
+    def __init__(self, n: int, e: int, d: Optional[int] = None, p: Optional[int] = None,
+                 q: Optional[int] = None, dp: Optional[int] = None, dq: Optional[int] = None,
+                 q_inv: Optional[int] = None, others: Sequence[Tuple[int, int, int]] = ()):
+        if (p is None) != (q is None):
+            raise ValueError("Give both primes or neither")
+        others = tuple(tuple(info) for info in others)
+        if p is not None:
+            product = p * q
+            for info in others:
+                product *= info[0]
+            if product != n:
+                raise ValueError("The primes do not multiply to n")
+            if d is not None and dp is None:
+                dp, dq, q_inv = rsa_crt_params(p, q, d)
+        elif others:
+            raise ValueError("Further primes need p and q")
+        self.n, self.e, self.d = n, e, d
+        self.p, self.q, self.dp, self.dq, self.q_inv = p, q, dp, dq, q_inv
+        self.others = others
+        self._blinding: Optional[RSABlinding] = None
+    
+    @classmethod
+    def from_primes(cls, p: int, q: int, *others: int) -> RSAKey:
+        e, d, n = rsa_generate_keys(p, q, *others)
+        if not others:
+            return cls(n, e, d, p, q)
+        (dp, dq, *d_others), (q_inv, *t_others) = rsa_multi_crt_params((p, q) + others, d)
+        return cls(n, e, d, p, q, dp, dq, q_inv, zip(others, d_others, t_others))
+    
+    @classmethod
+    def generate(cls, bits: int = 2048, primes: int = 2, workers: Optional[int] = None) -> RSAKey:
+        """A new key with a `bits`-bit modulus of `primes` primes, searched for in parallel"""
+        if primes > rsa_max_primes(bits):
+            raise ValueError(f"A {bits}-bit modulus can have at most {rsa_max_primes(bits)} primes")
+        return cls.from_primes(*rsa_random_primes(bits, primes, workers))
+    
+    @property
+    def private(self) -> bool:
+        return self.d is not None
+    
+    @property
+    def primes(self) -> Tuple[int, ...]:
+        """(p, q, r_3, ...), or () when the primes are not known"""
+        if self.p is None:
+            return ()
+        return (self.p, self.q) + tuple(info[0] for info in self.others)
+    
+    def public(self) -> RSAKey:
+        return RSAKey(self.n, self.e)
+    
+    def encrypt(self, message: int) -> int:
+        return rsa_encrypt(message, self.e, self.n)
+    
+    @property
+    def blinding(self) -> RSABlinding:
+        """This key's blinding pair, drawn on first use and kept with the key"""
+        if self._blinding is None:
+            self._blinding = RSABlinding(self.e, self.n)
+        return self._blinding
+    
+    def decrypt(self, cipher: int, blind: bool = True) -> int:
+        if self.d is None:
+            raise ValueError("Public RSA key cannot decrypt")
+        blinding = self.blinding if blind else None
+        if self.others:
+            exponents = (self.dp, self.dq) + tuple(info[1] for info in self.others)
+            coefficients = (self.q_inv,) + tuple(info[2] for info in self.others)
+            return rsa_decrypt_multi_crt(cipher % self.n, self.primes, exponents, coefficients, blinding)
+        if self.p is not None:
+            return rsa_decrypt_crt(cipher % self.n, self.p, self.q, self.dp, self.dq, self.q_inv, blinding)
+        return rsa_decrypt(cipher, self.d, self.n, blinding)
+    
+    def fields(self) -> Dict[str, int]:
+        names = ("n", "e", "d", "p", "q", "dp", "dq", "q_inv")
+        fields = {name: getattr(self, name) for name in names if getattr(self, name) is not None}
+        for i, (r, d_r, t_r) in enumerate(self.others, 3):
+            fields.update({f"r{i}": r, f"d{i}": d_r, f"t{i}": t_r})
+        return fields
+
+class DSADomain:
+    """DSA domain parameters and their fixed-base table for g, built on first use"""
+    __slots__ = ("p", "q", "g", "_table")
+    
+    def __init__(self, p: int, q: int, g: int):
+        self.p, self.q, self.g = p, q, g
+        self._table: Optional[List[List[int]]] = None
+    
+    @property
+    def table(self) -> List[List[int]]:
+        if self._table is None:
+            self._table = dsa_base_table(self.g, self.p, self.q)
+        return self._table
+    
+    def domain_id(self) -> str:
+        """ID under which these parameters are stored (derived from their values)"""
+        data = b"".join(_int_bytes(v) for v in (self.p, self.q, self.g))
+        return "dsa-domain:" + hashlib.blake2b(data, digest_size=8).hexdigest()
+    
+    def fields(self) -> Dict[str, int]:
+        return {"p": self.p, "q": self.q, "g": self.g}
+
+class DSAKey:
+    """A DSA key pair (x may be absent) in a shared domain"""
+    __slots__ = ("domain", "y", "x")
+    
+    def __init__(self, domain: DSADomain, y: Optional[int] = None, x: Optional[int] = None):
+        if y is None:
+            if x is None:
+                raise ValueError("A DSA key needs y or x")
+            # Not worth building the domain's table for one exponentiation
+            if domain._table is not None:
+                y = dsa_pow_base(domain._table, x % domain.q, domain.p)
+            else:
+                y = powmod(domain.g, x, domain.p)
+        self.domain, self.y, self.x = domain, y, x
+    
+    @classmethod
+    def generate(cls, domain: DSADomain) -> DSAKey:
+        return cls(domain, x=secrets.randbelow(domain.q - 1) + 1)
+    
+    @property
+    def private(self) -> bool:
+        return self.x is not None
+    
+    def public(self) -> DSAKey:
+        return DSAKey(self.domain, self.y)
+    
+    def sign(self, h: int, k: Optional[int] = None) -> Tuple[int, int]:
+        if self.x is None:
+            raise ValueError("Public DSA key cannot sign")
+        d = self.domain
+        if k is None:
+            k = secrets.randbelow(d.q - 1) + 1
+        return dsa_sign_fixed(h, self.x, d.p, d.q, d.table, k)
+    
+    def verify(self, h: int, r: int, s: int) -> bool:
+        d = self.domain
+        return dsa_verify_fixed(h, r, s, self.y, d.p, d.q, d.table)
+    
+    def fields(self) -> Dict[str, int]:
+        fields = dict(self.domain.fields(), y=self.y)
+        if self.x is not None:
+            fields["x"] = self.x
+        return fields
+
+class DESKey:
+    """An 8-byte DES key and its key schedule, expanded on first use"""
+    __slots__ = ("key", "_round_keys")
+    
+    def __init__(self, key: bytes):
+        if len(key) != 8:
+            raise ValueError("DES keys are exactly 8 bytes")
+        self.key = bytes(key)
+        self._round_keys: Optional[List[int]] = None
+    
+    @classmethod
+    def generate(cls) -> DESKey:
+        return cls(secrets.token_bytes(8))
+    
+    @property
+    def round_keys(self) -> List[int]:
+        if self._round_keys is None:
+            self._round_keys = des_key_schedule(self.key)
+        return self._round_keys
+    
+    def encrypt(self, data: bytes) -> bytes:
+        """ECB with PKCS#7 padding, as des_encrypt"""
+        return des_ecb_blocks(pkcs7_pad(data), self.round_keys)
+    
+    def decrypt(self, data: bytes) -> bytes:
+        return pkcs7_unpad(des_ecb_blocks(data, self.round_keys[::-1]))
+    
+    def fields(self) -> Dict[str, str]:
+        return {"key": self.key.hex()}
+
+if TYPE_CHECKING:
+    Key = Union[RSAKey, DSADomain, DSAKey, DESKey]
+
+# ----- Encoding -----
+def _int_bytes(value: Optional[int]) -> bytes:
+    if value is None:
+        return FIELD.pack(0)
+    data = value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big")
+    if len(data) > 0xFFFF:
+        raise ValueError("Number too large for the key store")
+    return FIELD.pack(len(data)) + data
+
+def _fields(buffer, offset: int, count: Optional[int] = None) -> List[Optional[bytes]]:
+    """Read `count` length-prefixed fields, or all up to the end (None for empty ones)"""
+    fields = []
+    while len(fields) != count and (count is not None or offset < len(buffer)):
+        length, = FIELD.unpack_from(buffer, offset)
+        offset += FIELD.size
+        fields.append(bytes(buffer[offset:offset + length]) if length else None)
+        offset += length
+    return fields
+
+def _ints(fields: List[Optional[bytes]]) -> List[Optional[int]]:
+    return [None if f is None else int.from_bytes(f, "big") for f in fields]
+
+def encode_key(key: Key) -> Tuple[int, bytes]:
+    """(kind, payload) of a key; DSA keys refer to their domain by its ID"""
+    if isinstance(key, RSAKey):
+        # Multi-prime keys append an (r_i, d_i, t_i) triple per further prime
+        values = (key.n, key.e, key.d, key.p, key.q, key.dp, key.dq, key.q_inv) + sum(key.others, ())
+        return KIND_RSA, b"".join(_int_bytes(v) for v in values)
+    if isinstance(key, DSADomain):
+        return KIND_DSA_DOMAIN, b"".join(_int_bytes(v) for v in (key.p, key.q, key.g))
+    if isinstance(key, DSAKey):
+        domain = key.domain.domain_id().encode("utf-8")
+        return KIND_DSA, FIELD.pack(len(domain)) + domain + _int_bytes(key.y) + _int_bytes(key.x)
+    if isinstance(key, DESKey):
+        return KIND_DES, FIELD.pack(len(key.key)) + key.key
+    raise TypeError(f"Cannot store {type(key).__name__}")
+
+# ----- Store -----
+class KeyStore:
+    """Keys by ID in one memory-mapped file.
+    
+    Opening costs the same for ten keys or a million: only the header is
+    read. A lookup hashes the ID, probes the table in the mapping and
+    decodes the record on first use. put() and delete() are staged (and
+    visible to this store at once) until commit(); use the store as a
+    context manager to commit on exit. Only one process should write to a
+    store at a time.
+    """
+    def __init__(self, path: Optional[str] = None, writable: bool = False, cache_size: int = KEY_CACHE):
+        self.path = path or default_path()
+        self.writable = writable
+        self.cache_size = cache_size
+        self._cache: collections.OrderedDict[str, Key] = collections.OrderedDict()
+        self._staged: Dict[str, Tuple[int, bytes]] = {}
+        self._deleted: set = set()
+        self._map: Optional[mmap.mmap] = None
+        if not os.path.exists(self.path):
+            if not writable:
+                raise FileNotFoundError(f"No key store at {self.path}")
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0, 0, 0))
+        self._open()
+    
+    def _open(self) -> None:
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.count, self.slots, self.table, self.live = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a key store")
+        if version != VERSION:
+            raise ValueError(f"Unsupported key store version {version}")
+    
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+    
+    def __enter__(self) -> KeyStore:
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None and self.writable:
+            self.commit()
+        self.close()
+        return False
+    
+    # ----- Reading -----
+    def _find(self, key_id: bytes) -> int:
+        """Offset of the record for key_id, or 0"""
+        if not self.slots:
+            return 0
+        h = key_hash(key_id)
+        mask = self.slots - 1
+        i = h & mask
+        mm = self._map
+        while True:
+            slot_hash, offset = SLOT.unpack_from(mm, self.table + i * SLOT.size)
+            if not offset:
+                return 0
+            if slot_hash == h:
+                _, length, _ = RECORD.unpack_from(mm, offset)
+                start = offset + RECORD.size
+                if mm[start:start + length] == key_id:
+                    return offset
+            i = (i + 1) & mask
+    
+    def _record(self, offset: int) -> Tuple[int, str, int, int]:
+        """(kind, ID, payload offset, payload length) of the record at offset"""
+        kind, id_length, payload_length = RECORD.unpack_from(self._map, offset)
+        start = offset + RECORD.size
+        return kind, self._map[start:start + id_length].decode("utf-8"), start + id_length, payload_length
+    
+    def raw(self, key_id: str) -> Optional[Tuple[int, bytes]]:
+        """(kind, payload) of a key without decoding it, or None"""
+        if key_id in self._deleted:
+            return None
+        staged = self._staged.get(key_id)
+        if staged is not None:
+            return staged
+        offset = self._find(key_id.encode("utf-8"))
+        if not offset:
+            return None
+        kind, _, start, length = self._record(offset)
+        return kind, self._map[start:start + length]
+    
+    def __contains__(self, key_id: str) -> bool:
+        if key_id in self._deleted:
+            return False
+        return key_id in self._staged or bool(self._find(key_id.encode("utf-8")))
+    
+    def get(self, key_id: str) -> Key:
+        """The decoded key (KeyError if there is none)"""
+        key = self._cache.get(key_id)
+        if key is not None:
+            self._cache.move_to_end(key_id)
+            return key
+        record = self.raw(key_id)
+        if record is None:
+            raise KeyError(f"No key {key_id!r} in {self.path}")
+        key = self._decode(*record)
+        self._cache[key_id] = key
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return key
+    
+    __getitem__ = get
+    
+    def _decode(self, kind: int, payload: bytes) -> Key:
+        if kind == KIND_RSA:
+            values = _ints(_fields(payload, 0))
+            others = [tuple(values[i:i + 3]) for i in range(8, len(values), 3)]
+            return RSAKey(*values[:8], others=others)
+        if kind == KIND_DSA_DOMAIN:
+            return DSADomain(*_ints(_fields(payload, 0, 3)))
+        if kind == KIND_DSA:
+            domain_id, y, x = _fields(payload, 0, 3)
+            domain = self.get(domain_id.decode("utf-8"))
+            y, x = _ints([y, x])
+            return DSAKey(domain, y, x)
+        if kind == KIND_DES:
+            return DESKey(_fields(payload, 0, 1)[0])
+        raise ValueError(f"Unknown key kind {kind}")
+    
+    def kind(self, key_id: str) -> str:
+        record = self.raw(key_id)
+        if record is None:
+            raise KeyError(f"No key {key_id!r} in {self.path}")
+        return KIND_NAMES.get(record[0], str(record[0]))
+    
+    def _entries(self) -> Iterator[Tuple[int, int]]:
+        """(hash, offset) of every committed record"""
+        if not self.slots:
+            return
+        # A copy, not a view: the map must stay closable while this runs
+        for slot_hash, offset in SLOT.iter_unpack(self._map[self.table:self.table + self.slots * SLOT.size]):
+            if offset:
+                yield slot_hash, offset
+    
+    def ids(self, kind: Optional[str] = None) -> Iterator[str]:
+        """IDs of the stored keys (in table order), optionally of one kind only"""
+        for _, offset in self._entries():
+            record_kind, key_id, _, _ = self._record(offset)
+            if key_id in self._staged or key_id in self._deleted:
+                continue
+            if kind is None or KIND_NAMES.get(record_kind) == kind:
+                yield key_id
+        for key_id, (record_kind, _) in self._staged.items():
+            if kind is None or KIND_NAMES.get(record_kind) == kind:
+                yield key_id
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self.ids())
+    
+    def __iter__(self) -> Iterator[str]:
+        return self.ids()
+    
+    # ----- Writing -----
+    def _check_writable(self) -> None:
+        if not self.writable:
+            raise ValueError("Key store was opened read-only")
+    
+    def put(self, key_id: str, key: Key) -> None:
+        """Stage a key under key_id (replacing any key with that ID); DSA domains are added as needed"""
+        self._check_writable()
+        if not key_id or len(key_id.encode("utf-8")) > 0xFFFF:
+            raise ValueError("Key IDs are 1 to 65535 bytes")
+        if isinstance(key, DSAKey):
+            domain_id = key.domain.domain_id()
+            if domain_id not in self:
+                self.put(domain_id, key.domain)
+        self._staged[key_id] = encode_key(key)
+        self._deleted.discard(key_id)
+        self._cache[key_id] = key
+        self._cache.move_to_end(key_id)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    def delete(self, key_id: str) -> None:
+        self._check_writable()
+        if key_id not in self:
+            raise KeyError(f"No key {key_id!r} in {self.path}")
+        self._staged.pop(key_id, None)
+        self._deleted.add(key_id)
+        self._cache.pop(key_id, None)
+    
+    def commit(self) -> None:
+        """Write the staged changes: new records, then a new table, then the header"""
+        self._check_writable()
+        if not self._staged and not self._deleted:
+            return
+        changed = {key_id.encode("utf-8") for key_id in (*self._staged, *self._deleted)}
+        changed_hashes = {key_hash(key_id) for key_id in changed}
+        entries = []
+        live = self.live
+        for slot_hash, offset in self._entries():
+            if slot_hash in changed_hashes:
+                _, key_id, start, length = self._record(offset)
+                if key_id.encode("utf-8") in changed:
+                    live -= start + length - offset
+                    continue
+            entries.append((slot_hash, offset))
+        
+        with open(self.path, "r+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            chunks = []
+            for key_id, (kind, payload) in self._staged.items():
+                encoded = key_id.encode("utf-8")
+                record = RECORD.pack(kind, len(encoded), len(payload)) + encoded + payload
+                entries.append((key_hash(encoded), end))
+                chunks.append(record)
+                end += len(record)
+                live += len(record)
+            f.write(b"".join(chunks))
+            slots, table = _build_table(entries)
+            f.write(table)
+            f.flush()
+            os.fsync(f.fileno())
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, 0, len(entries), slots, end, live))
+            f.flush()
+            os.fsync(f.fileno())
+        self._staged.clear()
+        self._deleted.clear()
+        self.close()
+        self._open()
+        if self.garbage() > 2 * (self.live + self.slots * SLOT.size):
+            self.compact()
+    
+    def garbage(self) -> int:
+        """Bytes taken by superseded records and tables"""
+        return len(self._map) - HEADER.size - self.live - self.slots * SLOT.size
+    
+    def compact(self) -> None:
+        """Rewrite the file with only the live records (commit() does this once most of it is garbage)"""
+        self._check_writable()
+        if self._staged or self._deleted:
+            self.commit()
+        temporary = self.path + ".tmp"
+        entries = []
+        with open(temporary, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0, 0, 0))
+            end = HEADER.size
+            for slot_hash, offset in self._entries():
+                kind, id_length, payload_length = RECORD.unpack_from(self._map, offset)
+                size = RECORD.size + id_length + payload_length
+                f.write(self._map[offset:offset + size])
+                entries.append((slot_hash, end))
+                end += size
+            slots, table = _build_table(entries)
+            f.write(table)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, 0, len(entries), slots, end, end - HEADER.size))
+            f.flush()
+            os.fsync(f.fileno())
+        self.close()
+        os.replace(temporary, self.path)
+        self._open()
+
+def _build_table(entries: List[Tuple[int, int]]) -> Tuple[int, bytes]:
+    """(slot count, packed table) for (hash, offset) entries, at most half full"""
+    if not entries:
+        return 0, b""
+    slots = 1 << max(3, (2 * len(entries) - 1).bit_length())
+    mask = slots - 1
+    table = [(0, 0)] * slots
+    for slot_hash, offset in entries:
+        i = slot_hash & mask
+        while table[i][1]:
+            i = (i + 1) & mask
+        table[i] = (slot_hash, offset)
+    return slots, b"".join(SLOT.pack(h, o) for h, o in table)
+
+def open_store(path: Optional[str] = None, writable: bool = False) -> KeyStore:
+    return KeyStore(path, writable)
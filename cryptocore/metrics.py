@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import functools
+import math
+import os
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# ===== INSTRUMENTATION =====
+# Every cipher entry point is wrapped by @instrument. Metrics are off by
+# default, and then a wrapper only tests one flag before calling through.
+# "sampled" counts every call and its bytes but times only every Nth call;
+# "full" times every call. Counters are updated without locks, so under
+# heavy multi-threaded use an occasional count can be lost.
+MODES = ("off", "sampled", "full")
+SAMPLE_RATE = 64
+SUB_BUCKET_BITS = 6
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+_active = False
+_mode = "off"
+_stride = 1
+_operations: Dict[str, Operation] = {}
+
+def bucket_index(value: int) -> int:
+    """Histogram bucket of a non-negative value"""
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return (shift << (SUB_BUCKET_BITS - 1)) + (value >> shift)
+
+def bucket_bounds(index: int) -> Tuple[int, int]:
+    """Smallest and largest value that fall into a bucket"""
+    if index < SUB_BUCKETS:
+        return index, index
+    half = SUB_BUCKETS >> 1
+    shift = index // half - 1
+    mantissa = index - shift * half
+    return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+class LatencyHistogram:
+    """Log-linear (HDR-style) histogram of latencies in nanoseconds.
+    
+    Values below SUB_BUCKETS get a bucket each. Above that every power of two
+    is split into SUB_BUCKETS / 2 equal buckets, so a bucket is at most 1/32
+    of its values wide (about 3% precision). Recording is one index
+    computation and one list increment.
+    """
+    __slots__ = ("counts", "count", "total", "min", "max")
+    
+    def __init__(self):
+        self.counts: List[int] = []
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+    
+    def record(self, value: int) -> None:
+        index = bucket_index(value)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+    
+    def percentile(self, fraction: float) -> int:
+        """Highest value of the bucket holding the given fraction of the values"""
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bucket_bounds(index)[1], self.max)
+        return self.max
+    
+    def buckets(self) -> List[List[int]]:
+        """Non-empty buckets as [lowest, highest, count]"""
+        return [[*bucket_bounds(i), n] for i, n in enumerate(self.counts) if n]
+
+class Operation:
+    """Call count, bytes processed, errors and latencies of one entry point"""
+    __slots__ = ("name", "calls", "bytes", "errors", "histogram")
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.reset()
+    
+    def reset(self) -> None:
+        self.calls = 0
+        self.bytes = 0
+        self.errors = 0
+        self.histogram = LatencyHistogram()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        h = self.histogram
+        latency = {"min": h.min, "mean": h.total / h.count if h.count else 0, "max": h.max}
+        for q in QUANTILES:
+            latency[f"p{q * 100:g}".replace(".", "")] = h.percentile(q)
+        return {
+            "calls": self.calls,
+            "bytes": self.bytes,
+            "errors": self.errors,
+            "timed": h.count,
+            "latency_ns": latency,
+            "histogram": h.buckets(),
+        }
+
+def operation(name: str) -> Operation:
+    """The stats of an entry point, created on first use"""
+    op = _operations.get(name)
+    if op is None:
+        op = _operations[name] = Operation(name)
+    return op
+
+def data_size(data, *args, **kwargs) -> int:
+    """Size function for entry points whose first argument is the text or data"""
+    return len(data)
+
+def instrument(size: Optional[Callable[..., int]] = None, name: Optional[str] = None):
+    """Decorator that records calls, bytes and latency of a cipher entry point.
+    
+    `size(*args, **kwargs)` returns the bytes one call processes.
+    """
+    def decorate(fn):
+        op = operation(name or fn.__name__)
+        clock = time.perf_counter_ns
+        
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _active:
+                return fn(*args, **kwargs)
+            op.calls += 1
+            if size is not None:
+                op.bytes += size(*args, **kwargs)
+            if op.calls % _stride:
+                try:
+                    return fn(*args, **kwargs)
+                except BaseException:
+                    op.errors += 1
+                    raise
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                op.errors += 1
+                raise
+            finally:
+                op.histogram.record(clock() - start)
+        return wrapper
+    return decorate
+
+def instrument_stream(name: Optional[str] = None):
+    """Decorator for streaming engines fn(chunks, ...) that yield processed chunks.
+    
+    A stream counts as one call. Bytes are those of the input chunks, and
+    the latency histogram gets one value per output chunk: the time spent
+    producing it, minus the time spent waiting for input.
+    """
+    def decorate(fn):
+        op = operation(name or fn.__name__)
+        
+        @functools.wraps(fn)
+        def wrapper(chunks, *args, **kwargs):
+            if not _active:
+                return fn(chunks, *args, **kwargs)
+            op.calls += 1
+            waits = [0]   # ns spent pulling input during the current output chunk
+            return _measured_stream(op, fn(_counted_input(op, chunks, waits), *args, **kwargs), waits)
+        return wrapper
+    return decorate
+
+def _counted_input(op: Operation, chunks, waits: List[int]):
+    clock = time.perf_counter_ns
+    it = iter(chunks)
+    while True:
+        start = clock()
+        chunk = next(it, None)
+        waits[0] += clock() - start
+        if chunk is None:
+            return
+        op.bytes += len(chunk)
+        yield chunk
+
+def _measured_stream(op: Operation, stream, waits: List[int]):
+    clock = time.perf_counter_ns
+    produced = 0
+    while True:
+        waits[0] = 0
+        start = clock()
+        try:
+            chunk = next(stream)
+        except StopIteration:
+            return
+        except BaseException:
+            op.errors += 1
+            raise
+        if produced % _stride == 0:
+            op.histogram.record(max(0, clock() - start - waits[0]))
+        produced += 1
+        yield chunk
+
+class _Phase:
+    """Context manager timing one phase of a larger operation"""
+    __slots__ = ("op", "start")
+    
+    def __init__(self, op: Operation):
+        self.op = op
+    
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.op.histogram.record(time.perf_counter_ns() - self.start)
+        if exc_type is not None:
+            self.op.errors += 1
+        return False
+
+class _NoPhase:
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NO_PHASE = _NoPhase()
+
+def phase(name: str):
+    """Time a block as its own operation, e.g. ``with phase("rsa_generate_keys.inverse"):``"""
+    if not _active:
+        return _NO_PHASE
+    op = operation(name)
+    op.calls += 1
+    if op.calls % _stride:
+        return _NO_PHASE
+    return _Phase(op)
+
+# ----- Control and export -----
+def set_mode(mode: str, sample_rate: int = SAMPLE_RATE) -> None:
+    """Switch between "off", "sampled" (time every sample_rate-th call) and "full" """
+    global _active, _mode, _stride
+    if mode not in MODES:
+        raise ValueError(f"Unknown metrics mode {mode!r} (expected one of {', '.join(MODES)})")
+    if sample_rate < 1:
+        raise ValueError("Sample rate must be at least 1")
+    _mode = mode
+    _stride = sample_rate if mode == "sampled" else 1
+    _active = mode != "off"
+
+def get_mode() -> str:
+    return _mode
+
+def reset() -> None:
+    """Zero all counters and histograms"""
+    for op in _operations.values():
+        op.reset()
+
+def snapshot() -> Dict[str, Any]:
+    """All stats as plain data; operations that were never called are left out"""
+    return {
+        "mode": _mode,
+        "sample_rate": _stride,
+        "operations": {name: op.snapshot() for name, op in sorted(_operations.items()) if op.calls},
+    }
+
+def to_json(indent: Optional[int] = 2) -> str:
+    import json
+    return json.dumps(snapshot(), indent=indent)
+
+def to_prometheus(prefix: str = "cryptocore") -> str:
+    """The stats in the Prometheus text exposition format (latency as a summary)"""
+    ops = [op for _, op in sorted(_operations.items()) if op.calls]
+    lines = []
+    for metric, help_text, field in (("calls_total", "Calls of each cipher entry point", "calls"),
+                                     ("bytes_total", "Bytes processed by each entry point", "bytes"),
+                                     ("errors_total", "Calls that raised an exception", "errors")):
+        lines.append(f"# HELP {prefix}_{metric} {help_text}")
+        lines.append(f"# TYPE {prefix}_{metric} counter")
+        lines.extend(f'{prefix}_{metric}{{op="{op.name}"}} {getattr(op, field)}' for op in ops)
+    name = f"{prefix}_latency_seconds"
+    lines.append(f"# HELP {name} Latency of the timed calls (every call in full mode, a sample otherwise)")
+    lines.append(f"# TYPE {name} summary")
+    for op in ops:
+        h = op.histogram
+        for q in QUANTILES:
+            lines.append(f'{name}{{op="{op.name}",quantile="{q:g}"}} {h.percentile(q) / 1e9:.9g}')
+        lines.append(f'{name}_sum{{op="{op.name}"}} {h.total / 1e9:.9g}')
+        lines.append(f'{name}_count{{op="{op.name}"}} {h.count}')
+    return "\n".join(lines) + "\n"
+
+def _configure_from_environment() -> None:
+    """CRYPTOCORE_METRICS=off|sampled|full, optionally with a rate: sampled:16"""
+    value = os.environ.get("CRYPTOCORE_METRICS", "").strip().lower()
+    if value:
+        mode, _, rate = value.partition(":")
+        set_mode(mode, int(rate) if rate else SAMPLE_RATE)
+
+_configure_from_environment()
@@ -0,0 +1,75 @@
+import math
+
+from . import bignum
+from .metrics import instrument
+
+# ===== NUMBER THEORY =====
+SMALL_PRIMES = [p for p in range(2, 1000) if all(p % d for d in range(2, math.isqrt(p) + 1))]
+# The first 13 primes as Miller-Rabin bases decide primality exactly below this bound
+DETERMINISTIC_LIMIT = 3317044064679887385961981
+RANDOM_ROUNDS = 24
+
+def is_prime(n: int) -> bool:
+    """Check if a number is prime.
+    
+    Small factors are found by trial division, then Miller-Rabin runs with
+    fixed bases, which is exact below DETERMINISTIC_LIMIT. Larger numbers
+    also get RANDOM_ROUNDS random bases (error below 4^-24).
+    """
+    if n <= 1:
+        return False
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < SMALL_PRIMES[-1] ** 2:
+        return True
+    if n >= DETERMINISTIC_LIMIT and bignum.is_probable_prime is not None:
+        return bignum.is_probable_prime(n, RANDOM_ROUNDS)
+    
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    bases = SMALL_PRIMES[:13]
+    if n >= DETERMINISTIC_LIMIT:
+        import random
+        rng = random.SystemRandom()
+        bases = bases + [rng.randrange(2, n - 1) for _ in range(RANDOM_ROUNDS)]
+    for a in bases:
+        x = bignum.powmod(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+@instrument()
+def random_prime(bits: int, rng=None) -> int:
+    """A random prime of exactly `bits` bits"""
+    if bits < 2:
+        raise ValueError("A prime needs at least 2 bits")
+    if rng is None:
+        import random
+        rng = random.SystemRandom()
+    while True:
+        candidate = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        if bits == 2:
+            candidate = rng.choice((2, 3))
+        if is_prime(candidate):
+            return candidate
+
+def gcd(a: int, b: int) -> int:
+    return bignum.gcd(a, b)
+
+def mod_inverse(a: int, m: int) -> int:
+    """Find modular inverse of a under modulo m (-1 if none exists)"""
+    if m <= 1:
+        return -1
+    try:
+        return bignum.invert(a, m)
+    except ValueError:
+        return -1
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, Sequence, Tuple
+
+import os
+
+from .bignum import invert, powmod
+from .metrics import instrument, phase
+from .numtheory import gcd, is_prime, mod_inverse
+
+# ===== ASYMMETRIC ENCRYPTION =====
+def modulus_size(value: int, exponent: int, n: int, *args, **kwargs) -> int:
+    """Bytes processed by one RSA operation: the size of the modulus"""
+    return (n.bit_length() + 7) // 8
+
+@instrument()
+def rsa_generate_keys(p: int, q: int, *others: int) -> Tuple[int, int, int]:
+    """Derive (e, d, n) from two or more primes using the smallest valid e"""
+    primes = (p, q) + others
+    with phase("rsa_generate_keys.primality"):
+        if not all(is_prime(r) for r in primes):
+            raise ValueError("All numbers must be prime" if others else "Both numbers must be prime")
+    if others and len(set(primes)) != len(primes):
+        raise ValueError("The primes must be distinct")
+    
+    n = phi = 1
+    for r in primes:
+        n *= r
+        phi *= r - 1
+    
+    with phase("rsa_generate_keys.exponent"):
+        e = 2
+        while e < phi:
+            if gcd(e, phi) == 1:
+                break
+            e += 1
+    
+    with phase("rsa_generate_keys.inverse"):
+        d = mod_inverse(e, phi)
+    return e, d, n
+
+@instrument(modulus_size)
+def rsa_encrypt(msg: int, e: int, n: int) -> int:
+    return powmod(msg, e, n)
+
+@instrument(modulus_size)
+def rsa_decrypt(cipher: int, d: int, n: int, blinding: RSABlinding = None) -> int:
+    if blinding is None:
+        return powmod(cipher, d, n)
+    blind, unblind = blinding.next()
+    return powmod(cipher * blind % n, d, n) * unblind % n
+
+@instrument()
+def rsa_crt_params(p: int, q: int, d: int) -> Tuple[int, int, int]:
+    """CRT exponents and coefficient (dp, dq, q_inv) for decrypting with p and q"""
+    if p == q:
+        raise ValueError("CRT needs two distinct primes")
+    return d % (p - 1), d % (q - 1), mod_inverse(q, p)
+
+def crt_modulus_size(cipher: int, p: int, q: int, *args, **kwargs) -> int:
+    return (p.bit_length() + q.bit_length() + 7) // 8
+
+@instrument(crt_modulus_size)
+def rsa_decrypt_crt(cipher: int, p: int, q: int, dp: int, dq: int, q_inv: int,
+                    blinding: RSABlinding = None) -> int:
+    """rsa_decrypt via the CRT: two half-size exponentiations and Garner's recombination"""
+    if blinding is not None:
+        blind, unblind = blinding.next()
+        cipher = cipher * blind % blinding.n
+    m_p = powmod(cipher, dp, p)
+    m_q = powmod(cipher, dq, q)
+    m = m_q + q * ((m_p - m_q) * q_inv % p)
+    return m if blinding is None else m * unblind % blinding.n
+
+# ----- Multi-prime -----
+# RFC 8017 lets the modulus have more than two primes. Decrypting with k
+# primes of n/k bits takes k exponentiations with n/k-bit moduli and
+# exponents, so three primes cut the private-key cost of the CRT path by
+# about a third to a half at the same modulus size. The CRT values follow
+# the RFC: the two-prime (dP, dQ, qInv) for p and q, then for every further
+# prime r_i its exponent d mod (r_i - 1) and the coefficient
+# t_i = (r_1 * ... * r_(i-1))^-1 mod r_i.
+def rsa_max_primes(bits: int) -> int:
+    """The most primes a `bits`-bit modulus should have (OpenSSL's limits)"""
+    return 2 if bits < 1024 else 3 if bits < 4096 else 4 if bits < 8192 else 5
+
+def _root_ceil(x: int, k: int) -> int:
+    """The smallest r with r**k >= x"""
+    r = 1 << -(-x.bit_length() // k)
+    while True:
+        s = ((k - 1) * r + x // r ** (k - 1)) // k
+        if s >= r:
+            break
+        r = s
+    return r if r ** k >= x else r + 1
+
+def rsa_prime(bits: int, count: int = 2, rng=None) -> int:
+    """A random `bits`-bit prime big enough that `count` of them make a full-length modulus"""
+    if bits < 2:
+        raise ValueError("A prime needs at least 2 bits")
+    if rng is None:
+        import random
+        rng = random.SystemRandom()
+    low = _root_ceil(1 << (count * bits - 1), count)
+    while True:
+        candidate = (low + rng.randrange((1 << bits) - low)) | 1
+        if is_prime(candidate):
+            return candidate
+
+@instrument()
+def rsa_random_primes(bits: int, count: int = 2, workers: Optional[int] = None) -> Tuple[int, ...]:
+    """`count` distinct primes whose product has exactly `bits` bits.
+    
+    The primes are searched for in parallel, one per process, in up to
+    `workers` processes (default: CPU count, 0 searches in this process).
+    """
+    if count < 2:
+        raise ValueError("RSA needs at least two primes")
+    if bits < 16 * count:
+        # Smaller primes leave too few candidates in the range rsa_prime draws from
+        raise ValueError(f"A {count}-prime modulus needs at least {16 * count} bits")
+    sizes = [bits // count + (i < bits % count) for i in range(count)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, count)
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            primes = list(pool.map(rsa_prime, sizes, [count] * count))
+    else:
+        primes = [rsa_prime(size, count) for size in sizes]
+    # Equal primes are vanishingly unlikely at real sizes, but not at toy ones
+    while len(set(primes)) != count:
+        primes = list(dict.fromkeys(primes))
+        primes.append(rsa_prime(sizes[len(primes)], count))
+    return tuple(primes)
+
+@instrument()
+def rsa_multi_crt_params(primes: Sequence[int], d: int) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """CRT (exponents, coefficients) for primes (p, q, r_3, ...): every d_i, then qInv and each t_i"""
+    if len(primes) < 2 or len(set(primes)) != len(primes):
+        raise ValueError("CRT needs two or more distinct primes")
+    exponents = tuple(d % (r - 1) for r in primes)
+    coefficients = [mod_inverse(primes[1], primes[0])]
+    product = primes[0] * primes[1]
+    for r in primes[2:]:
+        coefficients.append(mod_inverse(product % r, r))
+        product *= r
+    return exponents, tuple(coefficients)
+
+def multi_crt_size(cipher: int, primes: Sequence[int], *args, **kwargs) -> int:
+    return (sum(r.bit_length() for r in primes) + 7) // 8
+
+@instrument(multi_crt_size)
+def rsa_decrypt_multi_crt(cipher: int, primes: Sequence[int], exponents: Sequence[int],
+                          coefficients: Sequence[int], blinding: RSABlinding = None) -> int:
+    """rsa_decrypt_crt over k primes: k exponentiations and Garner's recombination (RFC 8017)"""
+    if blinding is not None:
+        blind, unblind = blinding.next()
+        cipher = cipher * blind % blinding.n
+    p, q = primes[0], primes[1]
+    m_p = powmod(cipher, exponents[0], p)
+    m_q = powmod(cipher, exponents[1], q)
+    m = m_q + q * ((m_p - m_q) * coefficients[0] % p)
+    product = p * q
+    for r, d_r, t_r in zip(primes[2:], exponents[2:], coefficients[1:]):
+        m_r = powmod(cipher, d_r, r)
+        m += product * ((m_r - m) * t_r % r)
+        product *= r
+    return m if blinding is None else m * unblind % blinding.n
+
+# ----- Blinding -----
+# Blinding decrypts c * r^e instead of c and multiplies the result by r^-1,
+# so the timing of the private exponentiation does not depend on the
+# ciphertext an attacker chose. Drawing r and computing r^e and r^-1 for every
+# call would cost about as much as the decryption itself; instead each key
+# keeps one (r^e, r^-1) pair and squares both after every use, which is the
+# pair for r^2. The steady-state overhead is the two multiplications that
+# blind and unblind (plus the two squarings), and a fresh random r replaces
+# the chain every BLINDING_REFRESH uses.
+BLINDING_REFRESH = 32
+
+class RSABlinding:
+    """The blinding pair of one RSA key, shared by every decryption with it"""
+    __slots__ = ("e", "n", "refresh", "_pair", "_uses", "_lock")
+    
+    def __init__(self, e: int, n: int, refresh: int = BLINDING_REFRESH):
+        if n < 3:
+            raise ValueError("Blinding needs a modulus of at least 3")
+        if refresh < 1:
+            raise ValueError("refresh must be at least 1")
+        import threading
+        self.e, self.n, self.refresh = e, n, refresh
+        self._lock = threading.Lock()
+        self._pair = self._fresh()
+        self._uses = 0
+    
+    @classmethod
+    def from_private(cls, primes: Sequence[int], d: int, refresh: int = BLINDING_REFRESH) -> RSABlinding:
+        """Blinding for a key known by its primes and d: e is recovered as d^-1 mod phi"""
+        n = phi = 1
+        for r in primes:
+            n *= r
+            phi *= r - 1
+        return cls(invert(d, phi), n, refresh)
+    
+    def _fresh(self) -> Tuple[int, int]:
+        # Imported on first use: secrets pulls in random, base64 and hmac
+        import secrets
+        while True:
+            r = secrets.randbelow(self.n - 2) + 2
+            try:
+                return powmod(r, self.e, self.n), invert(r, self.n)
+            except ValueError:
+                continue  # r shares a factor with n
+    
+    def next(self) -> Tuple[int, int]:
+        """The (r^e, r^-1) pair for one decryption; no pair is handed out twice"""
+        with self._lock:
+            blind, unblind = self._pair
+            self._uses += 1
+            if self._uses >= self.refresh:
+                self._pair, self._uses = self._fresh(), 0
+            else:
+                n = self.n
+                self._pair = blind * blind % n, unblind * unblind % n
+        return blind, unblind
+    
+    def __getstate__(self) -> Tuple[int, int, int]:
+        # Never ship the current pair: a copy that reused it would repeat r
+        return self.e, self.n, self.refresh
+    
+    def __setstate__(self, state: Tuple[int, int, int]) -> None:
+        self.__init__(*state)
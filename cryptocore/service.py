@@ -0,0 +1,389 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import json
+import os
+import signal
+import time
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from .jobs import OPERATIONS, key_id, run_batches
+from .metrics import QUANTILES, LatencyHistogram
+
+# ===== LOCAL SERVICE =====
+# A small HTTP/1.1 server (TCP or Unix socket) in front of the batch engines:
+#
+#   POST /v1/<cipher>/<op>  {"key": ..., "input": ...}  ->  {"output": ...}
+#   GET  /health, /stats (JSON), /metrics (Prometheus)
+#
+# Ciphers, ops, keys and inputs are those of the batch jobs (see jobs.py).
+# Concurrent requests are grouped by (cipher, op, key) and each group runs
+# back to back on one engine, which the worker process caches with its key
+# state (DES schedules, RSA CRT parameters, DSA fixed-base tables). Groups
+# stay open while they wait for a free worker slot, and a free slot takes
+# the oldest groups, up to max_batch requests, in a single call. Batches
+# thus grow with the load and an idle service answers without added delay.
+#
+# Backpressure: at most `limit` requests are admitted at once and the rest
+# get 503 with Retry-After. The limit starts at max_pending and is adjusted
+# every CONTROL_INTERVAL seconds to keep the p99 latency between 60% and 85%
+# of the target, which leaves headroom for bursts: above that band it is cut
+# to three quarters of the peak concurrency seen in the interval, below it
+# it grows by a tenth.
+# Latency is measured from admitting a request to its result, so it covers
+# both the wait for a worker and the work itself.
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8470
+MAX_BATCH = 256
+MAX_PENDING = 4096
+MIN_PENDING = 16
+P99_TARGET_MS = 50.0
+CONTROL_INTERVAL = 0.5
+MAX_HEADER = 16 << 10
+MAX_BODY = 1 << 20
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+class JobError(Exception):
+    """A request the engine rejected (bad key or input)"""
+
+# ----- Micro-batching -----
+class _Batch:
+    __slots__ = ("cipher", "op", "key", "values", "futures")
+    
+    def __init__(self, cipher: str, op: str, key: Any):
+        self.cipher = cipher
+        self.op = op
+        self.key = key
+        self.values: List[Any] = []
+        self.futures: List[asyncio.Future] = []
+
+class MicroBatcher:
+    """Coalesces concurrent requests into worker calls, grouped by (cipher, op, key)"""
+    def __init__(self, executor, slots: int, max_batch: int = MAX_BATCH):
+        self.executor = executor
+        self.slots = asyncio.Semaphore(slots)
+        self.max_batch = max_batch
+        self.open: Dict[Tuple[str, str, Any], _Batch] = {}   # oldest first
+        self.full: Deque[_Batch] = collections.deque()
+        self.batches = 0
+        self.batched = 0
+    
+    async def submit(self, cipher: str, op: str, key: Any, value: Any) -> Any:
+        ident = (cipher, op, key_id(key))
+        batch = self.open.get(ident)
+        if batch is None or len(batch.values) >= self.max_batch:
+            if batch is not None:
+                self.full.append(self.open.pop(ident))
+            batch = self.open[ident] = _Batch(cipher, op, key)
+            asyncio.ensure_future(self._dispatch())
+        future = asyncio.get_running_loop().create_future()
+        batch.values.append(value)
+        batch.futures.append(future)
+        return await future
+    
+    def _take(self) -> List[_Batch]:
+        """Close the oldest groups, up to about max_batch requests in all"""
+        taken: List[_Batch] = []
+        size = 0
+        while self.full and size < self.max_batch:
+            taken.append(self.full.popleft())
+            size += len(taken[-1].values)
+        for ident in list(self.open):
+            if size >= self.max_batch:
+                break
+            taken.append(self.open.pop(ident))
+            size += len(taken[-1].values)
+        return taken
+    
+    async def _dispatch(self) -> None:
+        async with self.slots:
+            # Groups stay open until a slot is free, so they grow while the workers are busy
+            batches = self._take()
+            if not batches:   # an earlier dispatch took them
+                return
+            self.batches += 1
+            self.batched += sum(len(batch.values) for batch in batches)
+            groups = [(batch.cipher, batch.op, batch.key, batch.values) for batch in batches]
+            try:
+                results = await asyncio.get_running_loop().run_in_executor(self.executor, run_batches, groups)
+            except Exception as e:
+                for batch in batches:
+                    for future in batch.futures:
+                        if not future.done():
+                            future.set_exception(e)
+                return
+        for batch, outcomes in zip(batches, results):
+            for future, (ok, value) in zip(batch.futures, outcomes):
+                if future.done():   # the client went away
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(JobError(value))
+
+# ----- Service -----
+class CipherService:
+    """The cipher service: admission control, batching and the HTTP front end"""
+    def __init__(self, workers: Optional[int] = None, max_batch: int = MAX_BATCH,
+                 max_pending: int = MAX_PENDING, p99_target_ms: float = P99_TARGET_MS):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.limit = max_pending
+        self.target_ns = int(p99_target_ms * 1e6)
+        self.max_batch = max_batch
+        self.pending = 0
+        self.peak = 0
+        self.requests = 0
+        self.rejected = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self.window = LatencyHistogram()
+        self.started = time.monotonic()
+        self.executor = None
+        self.batcher: Optional[MicroBatcher] = None
+        self._control_task: Optional[asyncio.Task] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        self._decode = json.JSONDecoder().decode
+    
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    unix: Optional[str] = None) -> asyncio.AbstractServer:
+        """Start the worker pool and listen on host:port, or on a Unix socket path"""
+        from concurrent.futures import ProcessPoolExecutor
+        loop = asyncio.get_running_loop()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        # Start the workers now rather than on the first requests
+        await asyncio.gather(*(loop.run_in_executor(self.executor, int) for _ in range(self.workers)))
+        self.batcher = MicroBatcher(self.executor, 2 * self.workers, self.max_batch)
+        self._control_task = asyncio.ensure_future(self._control())
+        if unix:
+            return await asyncio.start_unix_server(self.handle, path=unix, limit=MAX_HEADER)
+        return await asyncio.start_server(self.handle, host, port, limit=MAX_HEADER)
+    
+    async def close_connections(self) -> None:
+        """Drop the open connections (idle keep-alive ones and requests in flight)"""
+        tasks = list(self._connections)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def close(self) -> None:
+        if self._control_task is not None:
+            self._control_task.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+    
+    async def _control(self) -> None:
+        """Steer the admission limit towards the p99 latency target"""
+        while True:
+            await asyncio.sleep(CONTROL_INTERVAL)
+            window, self.window = self.window, LatencyHistogram()
+            peak, self.peak = self.peak, self.pending
+            if not window.count:
+                continue
+            p99 = window.percentile(0.99)
+            if p99 > self.target_ns * 0.85:
+                self.limit = max(MIN_PENDING, min(self.limit, peak) * 3 // 4)
+            elif p99 < self.target_ns * 0.6 and self.limit < self.max_pending:
+                self.limit = min(self.max_pending, self.limit + max(1, self.limit // 10))
+    
+    async def call(self, cipher: str, op: str, key: Any, value: Any) -> Any:
+        """Run one request through the batcher (raises JobError for rejected input)"""
+        return await self.batcher.submit(cipher, op, key, value)
+    
+    # ----- HTTP -----
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one connection until the client closes it"""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(self.response(431, {"error": "Headers too large"}, False))
+                    break
+                request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+                try:
+                    method, path, version = request_line.split(" ", 2)
+                except ValueError:
+                    writer.write(self.response(400, {"error": "Malformed request line"}, False))
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                try:
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY:
+                    writer.write(self.response(413, {"error": f"Body must be at most {MAX_BODY} bytes"}, False))
+                    break
+                body = await reader.readexactly(length) if length else b""
+                
+                status, payload, extra = await self.route(method, path, body)
+                writer.write(self.response(status, payload, keep_alive, extra))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            # close_connections() at shutdown; the stream callback expects a finished task
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+    
+    def response(self, status: int, payload: Any, keep_alive: bool,
+                 extra: Optional[Dict[str, str]] = None) -> bytes:
+        if isinstance(payload, str):
+            body = payload.encode("utf-8")
+            content_type = "text/plain; version=0.0.4"
+        else:
+            body = self._encode(payload).encode("utf-8")
+            content_type = "application/json"
+        head = [f"HTTP/1.1 {status} {REASONS[status]}",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(body)}",
+                "Connection: keep-alive" if keep_alive else "Connection: close"]
+        head.extend(f"{name}: {value}" for name, value in (extra or {}).items())
+        return ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body
+    
+    async def route(self, method: str, path: str, body: bytes) -> Tuple[int, Any, Optional[Dict[str, str]]]:
+        """(status, payload, extra headers) for one request"""
+        parts = path.split("?", 1)[0].strip("/").split("/")
+        if method == "GET":
+            if path == "/health":
+                return 200, {"status": "ok"}, None
+            if path == "/stats":
+                return 200, self.stats(), None
+            if path == "/metrics":
+                return 200, self.prometheus(), None
+        if len(parts) != 3 or parts[0] != "v1":
+            return 404, {"error": f"No route for {path}"}, None
+        cipher, op = parts[1], parts[2]
+        if op not in OPERATIONS.get(cipher, ()):
+            return 404, {"error": f"Unknown cipher or op {cipher}/{op}"}, None
+        if method != "POST":
+            return 405, {"error": "Use POST"}, {"Allow": "POST"}
+        
+        self.requests += 1
+        if self.pending >= self.limit:
+            self.rejected += 1
+            return 503, {"error": "Overloaded, retry later"}, {"Retry-After": "1"}
+        try:
+            request = self._decode(body.decode("utf-8"))
+            if not isinstance(request, dict) or "key" not in request:
+                raise ValueError('The body must be a JSON object with a "key"')
+        except ValueError as e:
+            self.errors += 1
+            return 400, {"error": f"{type(e).__name__}: {e}"}, None
+        
+        self.pending += 1
+        if self.pending > self.peak:
+            self.peak = self.pending
+        start = time.perf_counter_ns()
+        try:
+            output = await self.call(cipher, op, request["key"], request.get("input"))
+        except JobError as e:
+            self.errors += 1
+            return 400, {"error": str(e)}, None
+        except Exception as e:
+            self.errors += 1
+            return 500, {"error": f"{type(e).__name__}: {e}"}, None
+        finally:
+            self.pending -= 1
+            elapsed = time.perf_counter_ns() - start
+            self.latency.record(elapsed)
+            self.window.record(elapsed)
+        return 200, {"output": output}, None
+    
+    # ----- Stats -----
+    def stats(self) -> Dict[str, Any]:
+        h = self.latency
+        batcher = self.batcher
+        latency = {f"p{q * 100:g}".replace(".", ""): h.percentile(q) / 1e6 for q in QUANTILES}
+        latency["mean"] = h.total / h.count / 1e6 if h.count else 0.0
+        latency["max"] = h.max / 1e6
+        return {
+            "uptime_s": round(time.monotonic() - self.started, 3),
+            "workers": self.workers,
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "pending": self.pending,
+            "limit": self.limit,
+            "p99_target_ms": self.target_ns / 1e6,
+            "batches": batcher.batches if batcher else 0,
+            "mean_batch": batcher.batched / batcher.batches if batcher and batcher.batches else 0.0,
+            "latency_ms": latency,
+        }
+    
+    def prometheus(self, prefix: str = "cryptocore_service") -> str:
+        """Service counters and request latency in the Prometheus text format"""
+        batcher = self.batcher
+        lines = []
+        for metric, kind, help_text, value in (
+                ("requests_total", "counter", "Cipher requests received", self.requests),
+                ("rejected_total", "counter", "Requests refused with 503", self.rejected),
+                ("errors_total", "counter", "Requests that failed", self.errors),
+                ("batches_total", "counter", "Batches sent to the workers", batcher.batches if batcher else 0),
+                ("pending", "gauge", "Requests admitted and not yet answered", self.pending),
+                ("limit", "gauge", "Current admission limit", self.limit)):
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} {kind}")
+            lines.append(f"{prefix}_{metric} {value}")
+        name = f"{prefix}_latency_seconds"
+        h = self.latency
+        lines.append(f"# HELP {name} Time from admitting a cipher request to its result")
+        lines.append(f"# TYPE {name} summary")
+        for q in QUANTILES:
+            lines.append(f'{name}{{quantile="{q:g}"}} {h.percentile(q) / 1e9:.9g}')
+        lines.append(f"{name}_sum {h.total / 1e9:.9g}")
+        lines.append(f"{name}_count {h.count}")
+        return "\n".join(lines) + "\n"
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix: Optional[str] = None,
+                workers: Optional[int] = None, max_batch: int = MAX_BATCH, max_pending: int = MAX_PENDING,
+                p99_target_ms: float = P99_TARGET_MS, ready=None) -> None:
+    """Run the service until cancelled or sent SIGTERM; ready(address) is called once it listens"""
+    service = CipherService(workers, max_batch, max_pending, p99_target_ms)
+    server = await service.start(host, port, unix)
+    stop = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    except (NotImplementedError, RuntimeError):   # no signal handlers on Windows event loops
+        pass
+    try:
+        if ready is not None:
+            host, port = server.sockets[0].getsockname()[:2]
+            ready(unix or f"{host}:{port}")
+        await stop.wait()
+    finally:
+        # Stop accepting, then drop the open connections before the loop
+        # shuts down, or their cancelled handlers are logged as errors
+        server.close()
+        await service.close_connections()
+        await server.wait_closed()
+        service.close()
+        if unix and os.path.exists(unix):
+            os.unlink(unix)
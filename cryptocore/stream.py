@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import BinaryIO, Iterable, Iterator, List
+
+from ._optional import numpy
+from .des import des_crypt_int, des_key_schedule, pkcs7_pad, pkcs7_unpad
+from .metrics import instrument_stream
+
+# ===== STREAMING =====
+CHUNK_SIZE = 1 << 16
+BLOCK_MASK = (1 << 64) - 1
+
+def read_chunks(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield fixed-size chunks from a binary stream until EOF"""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+def write_chunks(stream: BinaryIO, data: bytes, chunk_size: int = CHUNK_SIZE) -> None:
+    """Write data to a binary stream in fixed-size slices"""
+    view = memoryview(data)
+    for i in range(0, len(view), chunk_size):
+        stream.write(view[i:i + chunk_size])
+
+def caesar_table(key: int, encrypt: bool) -> bytes:
+    """256-byte translation table that shifts ASCII letters like caesar_cipher"""
+    shift = key % 26 if encrypt else -key % 26
+    table = bytearray(range(256))
+    for base in (ord('A'), ord('a')):
+        for i in range(26):
+            table[base + i] = base + (i + shift) % 26
+    return bytes(table)
+
+@instrument_stream()
+def caesar_stream(chunks: Iterable[bytes], key: int, encrypt: bool) -> Iterator[bytes]:
+    """Caesar-shift a byte stream (ASCII letters only, other bytes pass through)"""
+    table = caesar_table(key, encrypt)
+    for chunk in chunks:
+        # bytes(chunk) is free for bytes and copies memoryviews (e.g. mmap windows)
+        yield bytes(chunk).translate(table)
+
+def vigenere_shifts(key: str, encrypt: bool) -> List[int]:
+    """Per-position shifts matching vigenere_cipher's key handling"""
+    if not key:
+        raise ValueError("Key must not be empty")
+    shifts = [(ord(ch.lower()) - ord('a')) % 26 for ch in key]
+    return shifts if encrypt else [-s % 26 for s in shifts]
+
+@instrument_stream()
+def vigenere_stream(chunks: Iterable[bytes], key: str, encrypt: bool) -> Iterator[bytes]:
+    """Vigenère over a byte stream; the key position carries across chunks"""
+    shifts = vigenere_shifts(key, encrypt)
+    try:
+        np = numpy()
+    except ImportError:
+        np = None
+    
+    position = 0
+    if np is None:
+        tables = [caesar_table(s, True) for s in shifts]
+        period = len(tables)
+        for chunk in chunks:
+            out = bytearray(chunk)
+            for i, b in enumerate(chunk):
+                if 65 <= b <= 90 or 97 <= b <= 122:
+                    out[i] = tables[position % period][b]
+                    position += 1
+            yield bytes(out)
+        return
+    
+    shift_arr = np.array(shifts, dtype=np.uint8)
+    for chunk in chunks:
+        a = np.frombuffer(chunk, dtype=np.uint8)
+        upper = (a >= 65) & (a <= 90)
+        letters = np.flatnonzero(upper | ((a >= 97) & (a <= 122)))
+        if letters.size == 0:
+            yield chunk
+            continue
+        base = np.where(upper[letters], 65, 97).astype(np.uint8)
+        k = shift_arr[(position + np.arange(letters.size)) % len(shifts)]
+        out = a.copy()
+        out[letters] = (a[letters] - base + k) % 26 + base
+        position += letters.size
+        yield out.tobytes()
+
+def des_ctr_keystream(round_keys: List[int], counter: int, blocks: int) -> bytes:
+    """Keystream for `blocks` consecutive counter values"""
+    return b"".join(
+        des_crypt_int((counter + i) & BLOCK_MASK, round_keys).to_bytes(8, "big")
+        for i in range(blocks)
+    )
+
+@instrument_stream()
+def des_ctr_stream(chunks: Iterable[bytes], key: bytes, iv: bytes) -> Iterator[bytes]:
+    """DES in CTR mode over a byte stream (encryption and decryption are identical)"""
+    if len(iv) != 8:
+        raise ValueError("IV must be exactly 8 bytes")
+    round_keys = des_key_schedule(key)
+    counter = int.from_bytes(iv, "big")
+    leftover = b""
+    for chunk in chunks:
+        need = len(chunk) - len(leftover)
+        blocks = (need + 7) // 8 if need > 0 else 0
+        keystream = leftover + des_ctr_keystream(round_keys, counter, blocks)
+        counter += blocks
+        n = len(chunk)
+        mixed = int.from_bytes(chunk, "big") ^ int.from_bytes(keystream[:n], "big")
+        yield mixed.to_bytes(n, "big")
+        leftover = keystream[n:]
+
+def des_ecb_blocks(data: bytes, round_keys: List[int]) -> bytes:
+    """Run whole 8-byte blocks through DES with the given (possibly reversed) round keys"""
+    out = bytearray(len(data))
+    for i in range(0, len(data), 8):
+        block = int.from_bytes(data[i:i + 8], "big")
+        out[i:i + 8] = des_crypt_int(block, round_keys).to_bytes(8, "big")
+    return bytes(out)
+
+@instrument_stream()
+def des_ecb_stream(chunks: Iterable[bytes], key: bytes, encrypt: bool) -> Iterator[bytes]:
+    """DES in ECB mode with PKCS#7 padding over a byte stream"""
+    round_keys = des_key_schedule(key)
+    if not encrypt:
+        round_keys = round_keys[::-1]
+    pending = b""
+    for chunk in chunks:
+        pending += bytes(chunk)
+        # When decrypting, hold back the final block so its padding can be removed
+        usable = len(pending) - len(pending) % 8
+        if not encrypt and usable == len(pending):
+            usable -= 8
+        if usable > 0:
+            yield des_ecb_blocks(pending[:usable], round_keys)
+            pending = pending[usable:]
+    if encrypt:
+        yield des_ecb_blocks(pkcs7_pad(pending), round_keys)
+    else:
+        yield pkcs7_unpad(des_ecb_blocks(pending, round_keys))
@@ -0,0 +1,533 @@
+"""Differential tests for the optimized cipher engines.
+
+Every fast path (translate-table Caesar, vectorized Vigenère, table
+Playfair, batched Hill and Rail Fence, CRT RSA, fixed-base DSA) is run next
+to the reference function it replaces, first on the known-answer vectors in
+testvectors.json and then on seeded random inputs. Outputs and raised
+exceptions must match exactly. Key files are read from OpenSSL-generated
+PEM vectors and written back, which must give the same bytes. The key
+store is checked by behavior: what is put, replaced, deleted and compacted
+must read back the same after reopening. The batch GCD scanner is run in
+memory, spilled to files and split between worker processes, and must
+report what pairwise gcds find. Exits with status 1 on any mismatch. Run
+``python differential.py --help`` for the options.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from cryptocore import batch, classical, des, dsa, keyio, keystore, rsa
+from cryptocore.cryptanalysis import batchgcd, playfair
+from cryptocore.numtheory import is_prime, random_prime
+from cryptocore.stream import caesar_stream, vigenere_stream
+
+# ===== CONFIGURATION =====
+VECTORS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "testvectors.json")
+SEED = 2024
+STREAM_CHUNK = 7   # small chunks so the streams carry state across many boundaries
+TEXT_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz  .,!?0123456789\n"
+UNICODE_ALPHABET = "ÄÖÜäöüßéÉçΩωЖж€—"
+RSA_BITS = [16, 64, 256, 512]
+DSA_BITS = [(64, 16), (256, 64), (1024, 160)]   # (p bits, q bits)
+WEAK_SIZES = [1, 2, 4, 9, 150]   # corpus sizes for the batch GCD
+
+# ===== ENGINES =====
+# A text engine is fn(text, key, encrypt) -> str. The first engine of each
+# cipher is the reference; an engine returns SKIP for inputs it does not take.
+SKIP = object()
+
+def first(batch_fn: Callable) -> Callable:
+    """Run a batch function on a single text and key"""
+    return lambda text, key, encrypt: batch_fn([text], [key], encrypt)[0]
+
+def streamed(stream_fn: Callable) -> Callable:
+    """Run a byte stream engine on an ASCII text split into small chunks"""
+    def run(text: str, key: Any, encrypt: bool):
+        if not text.isascii() or key == "":
+            return SKIP
+        data = text.encode("ascii")
+        chunks = [data[i:i + STREAM_CHUNK] for i in range(0, len(data), STREAM_CHUNK)]
+        return b"".join(stream_fn(chunks, key, encrypt)).decode("ascii")
+    return run
+
+TEXT_ENGINES: Dict[str, Dict[str, Callable]] = {
+    "caesar": {
+        "caesar_cipher": classical.caesar_cipher,
+        "caesar_batch": first(batch.caesar_batch),
+        "caesar_stream": streamed(caesar_stream),
+    },
+    "vigenere": {
+        "vigenere_cipher": classical.vigenere_cipher,
+        "vigenere_batch": first(batch.vigenere_batch),
+        "vigenere_stream": streamed(vigenere_stream),
+    },
+    "playfair": {
+        "playfair_cipher": classical.playfair_cipher,
+        "PlayfairTable": lambda text, key, encrypt: batch.PlayfairTable(key, encrypt).apply(text),
+        "playfair_batch": first(batch.playfair_batch),
+    },
+    "hill": {
+        "hill_cipher": classical.hill_cipher,
+        "hill_batch": first(batch.hill_batch),
+    },
+    "railfence": {
+        "rail_fence_cipher": classical.rail_fence_cipher,
+        "rail_fence_batch": first(batch.rail_fence_batch),
+    },
+}
+
+def rsa_engines(params: Dict[str, int]) -> Dict[str, Callable[[int], int]]:
+    p, q, d, n = params["p"], params["q"], params["d"], params["n"]
+    dp, dq, q_inv = rsa.rsa_crt_params(p, q, d)
+    blinding = rsa.RSABlinding.from_private((p, q), d, refresh=5)
+    return {
+        "rsa_decrypt": lambda c: rsa.rsa_decrypt(c, d, n),
+        "rsa_decrypt_crt": lambda c: rsa.rsa_decrypt_crt(c, p, q, dp, dq, q_inv),
+        "rsa_decrypt_blinded": lambda c: rsa.rsa_decrypt(c, d, n, blinding),
+        "rsa_decrypt_crt_blinded": lambda c: rsa.rsa_decrypt_crt(c, p, q, dp, dq, q_inv, blinding),
+    }
+
+def dsa_engines(params: Dict[str, int]) -> Dict[str, Dict[str, Callable]]:
+    p, q, g = params["p"], params["q"], params["g"]
+    table = dsa.dsa_base_table(g, p, q)
+    return {
+        "keygen": {
+            "dsa_public_key": lambda x: dsa.dsa_public_key(x, p, g),
+            "dsa_pow_base": lambda x: dsa.dsa_pow_base(table, x, p),
+        },
+        "sign": {
+            "dsa_sign": lambda h: list(dsa.dsa_sign(h, params["x"], p, q, g, params["k"])),
+            "dsa_sign_fixed": lambda h: list(dsa.dsa_sign_fixed(h, params["x"], p, q, table, params["k"])),
+        },
+        "verify": {
+            "dsa_verify": lambda sig: dsa.dsa_verify(sig["h"], sig["r"], sig["s"], params["y"], p, q, g),
+            "dsa_verify_fixed": lambda sig: dsa.dsa_verify_fixed(sig["h"], sig["r"], sig["s"], params["y"],
+                                                                 p, q, table),
+        },
+    }
+
+def key_summary(key: Any) -> Dict[str, Any]:
+    """What a keyio vector's output records about a key"""
+    summary = {"kind": "rsa" if isinstance(key, keystore.RSAKey) else "dsa", "private": key.private,
+               "fingerprint": keyio.fingerprint(key)}
+    if isinstance(key, keystore.RSAKey):
+        summary["primes"] = len(key.primes)
+    return summary
+
+def key_works(key: Any) -> bool:
+    """Whether a private key decrypts its own ciphertext (RSA) or verifies its own signature (DSA)"""
+    if isinstance(key, keystore.RSAKey):
+        return key.decrypt(key.encrypt(42), blind=False) == 42
+    return key.verify(42, *key.sign(42))
+
+def outcome(fn: Callable, *args) -> Any:
+    """fn(*args), or the name of the exception it raised"""
+    try:
+        return fn(*args)
+    except Exception as exc:
+        return f"raises {type(exc).__name__}"
+
+# ===== CHECKS =====
+class Report:
+    """Counts checks and collects mismatches"""
+    def __init__(self, verbose: bool = False):
+        self.checks = 0
+        self.failures: List[str] = []
+        self.verbose = verbose
+    
+    def compare(self, case: str, engines: Dict[str, Callable], args: Tuple,
+                expected: Any = SKIP) -> None:
+        """Run every engine on args and check it against expected (or the first engine)"""
+        results = {name: outcome(fn, *args) for name, fn in engines.items()}
+        if expected is SKIP:
+            expected = next(iter(results.values()))
+        for name, result in results.items():
+            if result is SKIP:
+                continue
+            self.checks += 1
+            if result != expected:
+                self.failures.append(f"{case} {name}: expected {expected!r}, got {result!r}"
+                                     + (f" for {args!r}" if self.verbose else ""))
+
+def vector_expected(vector: Dict[str, Any]) -> Any:
+    if "error" in vector:
+        return f"raises {vector['error']}"
+    return vector["output"]
+
+def check_vector(vector: Dict[str, Any], report: Report) -> None:
+    cipher, op, case = vector["cipher"], vector["op"], vector["id"]
+    expected = vector_expected(vector)
+    if cipher in TEXT_ENGINES:
+        args = (vector["input"], vector["key"], op == "encrypt")
+        report.compare(case, TEXT_ENGINES[cipher], args, expected)
+    elif cipher == "des":
+        key = vector["key"]
+        engines = {
+            "xor-encrypt": lambda: des.des_xor_encrypt(vector["input"].encode(), key.encode()).hex(),
+            "encrypt": lambda: des.des_encrypt(vector["input"].encode(), key.encode()).hex(),
+            "encrypt-block": lambda: des.des_encrypt_block(
+                bytes.fromhex(vector["input"]), des.des_key_schedule(bytes.fromhex(key))).hex(),
+        }
+        report.compare(case, {f"des {op}": engines[op]}, (), expected)
+    elif cipher == "rsa":
+        params = vector["params"]
+        if op == "keygen":
+            keygen = lambda p, q: dict(zip("edn", rsa.rsa_generate_keys(p, q)))
+            report.compare(case, {"rsa_generate_keys": keygen}, (params["p"], params["q"]), expected)
+        elif op == "encrypt":
+            report.compare(case, {"rsa_encrypt": rsa.rsa_encrypt},
+                           (vector["input"], params["e"], params["n"]), expected)
+        else:
+            report.compare(case, rsa_engines(params), (vector["input"],), expected)
+    elif cipher == "dsa":
+        params = vector["params"]
+        arg = params["x"] if op == "keygen" else vector["input"]
+        report.compare(case, dsa_engines(params)[op], (arg,), expected)
+    elif cipher == "keyio":
+        # Parse the PEM and its DER body; a round trip must give back the same bytes
+        pem = "\n".join(vector["input"]) + "\n"
+        der = next(keyio.pem_blocks(pem))[1]
+        loaders = {
+            "key_from_pem": lambda: key_summary(keyio.key_from_pem(pem)),
+            "key_from_der": lambda: key_summary(keyio.key_from_der(der)),
+        }
+        report.compare(case, loaders, (), expected)
+        if op == "roundtrip":
+            format = vector["format"]
+            report.compare(case, {"key_to_pem": lambda: keyio.key_to_pem(keyio.key_from_pem(pem), format)}, (), pem)
+            report.compare(case, {"key_to_der": lambda: keyio.key_to_der(keyio.key_from_der(der), format)}, (), der)
+            if expected["private"]:
+                report.compare(case, {"key_works": lambda: key_works(keyio.key_from_pem(pem))}, (), True)
+    else:
+        report.failures.append(f"{case}: unknown cipher {cipher!r}")
+
+# ===== RANDOM INPUTS =====
+def random_text(rng: random.Random, max_length: int) -> str:
+    alphabet = TEXT_ALPHABET + (UNICODE_ALPHABET if rng.random() < 0.25 else "")
+    return "".join(rng.choice(alphabet) for _ in range(rng.randrange(max_length + 1)))
+
+def random_letters(rng: random.Random, low: int, high: int) -> str:
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+    return "".join(rng.choice(letters) for _ in range(rng.randint(low, high)))
+
+def random_key(cipher: str, rng: random.Random) -> Any:
+    if cipher == "caesar":
+        return rng.randrange(-60, 60)
+    if cipher == "vigenere":
+        # Mostly letters; digits and the empty key check the edge cases agree too
+        if rng.random() < 0.02:
+            return ""
+        key = random_letters(rng, 1, 12)
+        return key + str(rng.randrange(10)) if rng.random() < 0.1 else key
+    if cipher == "playfair":
+        return random_letters(rng, 0, 12)
+    if cipher == "hill":
+        return [[rng.randrange(-5, 30) for _ in range(2)] for _ in range(2)]
+    return rng.randrange(2, 12)   # rails (rail_fence_cipher loops forever on 1)
+
+def text_cases(rng: random.Random, ciphers: List[str], iterations: int,
+               max_length: int) -> Iterator[Tuple[str, Dict[str, Callable], Tuple]]:
+    for i in range(iterations):
+        for cipher in ciphers:
+            if cipher in TEXT_ENGINES:
+                args = (random_text(rng, max_length), random_key(cipher, rng), rng.random() < 0.5)
+                yield f"random-{cipher}-{i}", TEXT_ENGINES[cipher], args
+
+def random_dsa_domain(rng: random.Random, p_bits: int, q_bits: int) -> Dict[str, int]:
+    """Random (p, q, g) with q | p - 1 and g of order q"""
+    q = random_prime(q_bits, rng)
+    while True:
+        p = (rng.getrandbits(p_bits) | (1 << (p_bits - 1))) // (2 * q) * (2 * q) + 1
+        if p.bit_length() == p_bits and is_prime(p):
+            break
+    h = 2
+    while pow(h, (p - 1) // q, p) == 1:
+        h += 1
+    return {"p": p, "q": q, "g": pow(h, (p - 1) // q, p)}
+
+def check_rsa(rng: random.Random, iterations: int, report: Report) -> None:
+    for i in range(iterations):
+        bits = RSA_BITS[i % len(RSA_BITS)]
+        p = random_prime(bits // 2, rng)
+        q = random_prime(bits // 2, rng)
+        if p == q:
+            continue
+        e, d, n = rsa.rsa_generate_keys(p, q)
+        engines = rsa_engines({"p": p, "q": q, "d": d, "n": n})
+        m = rng.randrange(n)
+        report.compare(f"random-rsa-{bits}-{i}", engines, (rsa.rsa_encrypt(m, e, n),), m)
+        report.compare(f"random-rsa-{bits}-{i}", engines, (rng.randrange(n),))
+        
+        count = 3 + i % 2
+        if bits < 16 * count:
+            continue
+        primes = [rsa.rsa_prime(bits // count, count, rng) for _ in range(count)]
+        if len(set(primes)) != count:
+            continue
+        e, d, n = rsa.rsa_generate_keys(*primes)
+        exponents, coefficients = rsa.rsa_multi_crt_params(primes, d)
+        blinding = rsa.RSABlinding.from_private(primes, d, refresh=5)
+        engines = {
+            "rsa_decrypt": lambda c: rsa.rsa_decrypt(c, d, n),
+            "rsa_decrypt_multi_crt": lambda c: rsa.rsa_decrypt_multi_crt(c, primes, exponents, coefficients),
+            "rsa_decrypt_multi_crt_blinded":
+                lambda c: rsa.rsa_decrypt_multi_crt(c, primes, exponents, coefficients, blinding),
+        }
+        m = rng.randrange(n)
+        report.compare(f"random-rsa{count}-{bits}-{i}", engines, (rsa.rsa_encrypt(m, e, n),), m)
+        report.compare(f"random-rsa{count}-{bits}-{i}", engines, (rng.randrange(n),))
+
+def check_dsa(rng: random.Random, iterations: int, report: Report) -> None:
+    # Finding a 1024-bit p takes a while, so each size has one domain and
+    # the keys, nonces and hashes vary
+    domains = [random_dsa_domain(rng, p_bits, q_bits) for p_bits, q_bits in DSA_BITS]
+    for i in range(iterations):
+        p_bits, q_bits = DSA_BITS[i % len(DSA_BITS)]
+        params = dict(domains[i % len(DSA_BITS)])
+        q = params["q"]
+        params.update(x=rng.randrange(1, q), k=rng.randrange(1, q))
+        params["y"] = dsa.dsa_public_key(params["x"], params["p"], params["g"])
+        engines = dsa_engines(params)
+        case = f"random-dsa-{p_bits}-{i}"
+        
+        h = rng.randrange(1 << q_bits + 8)
+        report.compare(case, engines["keygen"], (params["x"],), params["y"])
+        report.compare(case, engines["sign"], (h,))
+        r, s = dsa.dsa_sign(h, params["x"], params["p"], q, params["g"], params["k"])
+        for sig in ({"h": h, "r": r, "s": s},
+                    {"h": h + 1, "r": r, "s": s},
+                    {"h": h, "r": rng.randrange(q + 1), "s": rng.randrange(q + 1)}):
+            report.compare(case, engines["verify"], (sig,))
+
+# ===== KEY STORE =====
+KEY_HASH = keystore.key_hash
+
+def store_fields(path: str, cache_size: int = keystore.KEY_CACHE) -> Dict[str, Dict[str, Any]]:
+    """Every key of the store at path, reopened read-only, as its fields"""
+    with keystore.KeyStore(path, cache_size=cache_size) as store:
+        return {key_id: store.get(key_id).fields() for key_id in store.ids()}
+
+def check_keystore(rng: random.Random, report: Report) -> None:
+    """Put, replace, delete, commit, compact and reopen key stores.
+    
+    The last rounds swap in weak ID hashes, so that IDs share a slot hash or
+    probe through each other's slots.
+    """
+    def check(case: str, name: str, fn: Callable[[], Any], expected: Any) -> None:
+        report.compare(f"keystore-{case}", {name: fn}, (), expected)
+    
+    domain = keystore.DSADomain(23, 11, 4)
+    primes = []
+    while len(primes) < 3:
+        prime = random_prime(24, rng)
+        if prime not in primes:
+            primes.append(prime)
+    keys = {
+        "rsa": keystore.RSAKey.from_primes(61, 53),
+        "rsa3": keystore.RSAKey.from_primes(*primes),
+        "rsa-public": keystore.RSAKey(3233, 17),
+        "dsa": keystore.DSAKey(domain, x=7),
+        "dsa-public": keystore.DSAKey(domain, y=8),
+        "des": keystore.DESKey(b"SECRETKY"),
+        "clé 🔑": keystore.DESKey(bytes(rng.randrange(256) for _ in range(8))),
+    }
+    expected = {key_id: key.fields() for key_id, key in keys.items()}
+    expected[domain.domain_id()] = domain.fields()
+    
+    for hashing in ("blake2b", "collide", "probe"):
+        if hashing == "collide":
+            keystore.key_hash = lambda key_id: 0x5EED   # every ID has the same slot hash
+        elif hashing == "probe":
+            keystore.key_hash = lambda key_id: key_id[-1] << 32   # every ID probes from slot 0
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                check_store(os.path.join(directory, "keys.ccks"), hashing, keys, dict(expected), rng, check)
+        except Exception as exc:
+            report.failures.append(f"keystore-{hashing}: raises {type(exc).__name__}: {exc}")
+        finally:
+            keystore.key_hash = KEY_HASH
+
+def check_store(path: str, case: str, keys: Dict[str, Any], expected: Dict[str, Dict[str, Any]],
+                rng: random.Random, check: Callable) -> None:
+    # put, then commit by leaving the with block; staged keys are visible before
+    with keystore.KeyStore(path, writable=True) as store:
+        for key_id, key in keys.items():
+            store.put(key_id, key)
+        check(case, "staged", lambda: {key_id: store.get(key_id).fields() for key_id in store.ids()}, expected)
+    check(case, "commit on exit", lambda: store_fields(path), expected)
+    check(case, "LRU of 2", lambda: store_fields(path, cache_size=2), expected)
+    
+    # an exception in the with block discards the staged changes
+    try:
+        with keystore.KeyStore(path, writable=True) as store:
+            store.put("lost", keystore.DESKey(b"LOSTKEY!"))
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    check(case, "no commit on error", lambda: store_fields(path), expected)
+    
+    # replace and delete, then commit() explicitly
+    store = keystore.KeyStore(path, writable=True)
+    store.put("rsa", keystore.RSAKey.from_primes(11, 13))
+    store.delete("des")
+    check(case, "delete staged", lambda: "des" in store, False)
+    store.commit()
+    store.close()
+    expected["rsa"] = keystore.RSAKey.from_primes(11, 13).fields()
+    del expected["des"]
+    check(case, "replace and delete", lambda: store_fields(path), expected)
+    
+    # Many commits of replaced and deleted keys: auto-compaction bounds the
+    # garbage, and compact() keeps every live ID
+    store = keystore.KeyStore(path, writable=True)
+    for i in range(60):
+        for _ in range(rng.randrange(1, 8)):
+            key_id = f"des-{rng.randrange(40)}"
+            key = keystore.DESKey(bytes(rng.randrange(256) for _ in range(8)))
+            store.put(key_id, key)
+            expected[key_id] = key.fields()
+        key_id = f"des-{rng.randrange(40)}"
+        if key_id in expected:
+            store.delete(key_id)
+            del expected[key_id]
+        store.commit()
+        bound = 2 * (store.live + store.slots * keystore.SLOT.size)
+        check(case, f"garbage after commit {i}", lambda: store.garbage() <= bound, True)
+    before = os.path.getsize(path)
+    store.compact()
+    check(case, "compact garbage", store.garbage, 0)
+    check(case, "compact size", lambda: os.path.getsize(path) <= before, True)
+    store.close()
+    check(case, "compact", lambda: store_fields(path), expected)
+
+# ===== BATCH GCD =====
+WeakReport = List[Tuple[int, Optional[Tuple[int, int]], List[int]]]
+
+def weak_reference(moduli: List[int]) -> WeakReport:
+    """(index, sorted primes or None, duplicate indices) of every weak modulus, by pairwise gcds"""
+    weak = []
+    for i, n in enumerate(moduli):
+        duplicates = [j for j, m in enumerate(moduli) if m == n and j != i]
+        primes = next((tuple(sorted((g, n // g))) for g in (math.gcd(n, m) for m in moduli) if 1 < g < n), None)
+        if duplicates or primes:
+            weak.append((i, primes, duplicates))
+    return weak
+
+def weak_engine(**options: Any) -> Callable[[List[int]], WeakReport]:
+    """find_weak_moduli with these options, on the moduli as a one-pass iterator"""
+    def run(moduli: List[int]) -> WeakReport:
+        return [(w.index, None if w.factor is None else tuple(sorted((w.factor, w.n // w.factor))),
+                 sorted(w.duplicates)) for w in batchgcd.find_weak_moduli(iter(moduli), **options)]
+    return run
+
+def weak_corpus(rng: random.Random, size: int) -> List[int]:
+    """`size` two-prime moduli in random order, with weak keys planted as far as they fit.
+    
+    The plants are a shared prime, a duplicate, moduli that share both of
+    their primes, and a duplicate of a modulus that also shares a prime.
+    """
+    primes: List[int] = []
+    while len(primes) < 2 * size + 3:
+        prime = random_prime(32, rng)
+        if prime not in primes:
+            primes.append(prime)
+    moduli = [primes[2 * i] * primes[2 * i + 1] for i in range(size)]
+    a, b, c = primes[-3:]
+    if size > 1:
+        moduli[1] = primes[0] * a
+    if size > 3:
+        moduli[3] = moduli[2]
+    if size > 8:
+        moduli[5:9] = [a * b, b * c, c * primes[12], moduli[0]]
+    rng.shuffle(moduli)
+    return moduli
+
+def check_batchgcd(rng: random.Random, report: Report) -> None:
+    """Every path of find_weak_moduli against pairwise gcds"""
+    with tempfile.TemporaryDirectory() as directory:
+        engines = {
+            "in memory": weak_engine(workers=0),
+            "spilled": weak_engine(workers=0, directory=directory, memory_limit=0),
+            "spilled midway": weak_engine(workers=0, directory=directory, memory_limit=2000),
+            "spilled, 3 workers": weak_engine(workers=3, directory=directory, memory_limit=0),
+            "written for 2 workers": weak_engine(workers=2, directory=directory),
+        }
+        parallel_min = batchgcd.PARALLEL_MIN
+        batchgcd.PARALLEL_MIN = 0   # small corpora go to the workers too
+        try:
+            for size in WEAK_SIZES:
+                moduli = weak_corpus(rng, size)
+                report.compare(f"batchgcd-{size}", engines, (moduli,), weak_reference(moduli))
+        finally:
+            batchgcd.PARALLEL_MIN = parallel_min
+        report.compare("batchgcd-cleanup", {"os.listdir": os.listdir}, (directory,), [])
+
+# ===== PLAYFAIR CRACKER =====
+def pair_codes(text: str) -> List[int]:
+    """Digraph codes of text by looking its letters up in the square alphabet, J as I"""
+    squares = [playfair.ALPHABET.index(c) for c in text.upper().replace("J", "I") if c.isalpha()]
+    return [a * 25 + b for a, b in zip(squares[0::2], squares[1::2])]
+
+def check_playfair_pairs(rng: random.Random, iterations: int, report: Report) -> None:
+    """The cracker's ciphertext digraph codes, J and I alike"""
+    engines = {"ciphertext_pairs": lambda text: playfair.ciphertext_pairs(text).tolist()}
+    report.compare("playfair-pairs-JA", engines, ("JA",), pair_codes("IA"))
+    report.compare("playfair-pairs-alphabet", engines, ("ABCDEFGHIJKLMNOPQRSTUVWXYZJI",),
+                   pair_codes("ABCDEFGHIJKLMNOPQRSTUVWXYZJI"))
+    for i in range(iterations):
+        text = random_letters(rng, 1, 40) * 2
+        report.compare(f"playfair-pairs-{i}", engines, (text,), pair_codes(text))
+
+# ===== MAIN =====
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="differential.py",
+        description="Check the optimized cipher engines against the reference functions."
+    )
+    parser.add_argument("--vectors", default=VECTORS, help="known-answer vector file (default: testvectors.json)")
+    parser.add_argument("--iterations", type=int, default=200,
+                        help="random inputs per cipher (default: 200, 0 for the vectors only)")
+    parser.add_argument("--seed", type=int, default=SEED, help=f"seed for the random inputs (default: {SEED})")
+    parser.add_argument("--max-length", type=int, default=300, help="longest random text (default: 300)")
+    parser.add_argument("-k", "--filter", action="append", default=[],
+                        help="only check these ciphers, e.g. -k hill -k rsa (repeatable)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show the inputs of failing cases")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    ciphers = args.filter or [*TEXT_ENGINES, "des", "rsa", "dsa", "keyio", "keystore", "batchgcd"]
+    report = Report(args.verbose)
+    
+    with open(args.vectors, encoding="utf-8") as f:
+        vectors = [v for v in json.load(f)["vectors"] if v["cipher"] in ciphers]
+    for vector in vectors:
+        check_vector(vector, report)
+    
+    rng = random.Random(args.seed)
+    for case, engines, case_args in text_cases(rng, ciphers, args.iterations, args.max_length):
+        report.compare(case, engines, case_args)
+    if "rsa" in ciphers:
+        check_rsa(rng, args.iterations, report)
+    if "dsa" in ciphers:
+        check_dsa(rng, args.iterations, report)
+    if "keystore" in ciphers:
+        check_keystore(rng, report)
+    if "batchgcd" in ciphers:
+        check_batchgcd(rng, report)
+    if "playfair" in ciphers:
+        check_playfair_pairs(rng, args.iterations, report)
+    
+    for failure in report.failures:
+        print(f"FAIL {failure}")
+    print(f"{len(vectors)} vectors, {args.iterations} random inputs per cipher (seed {args.seed}): "
+          f"{report.checks} checks, {len(report.failures)} failures")
+    return 1 if report.failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
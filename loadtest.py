@@ -0,0 +1,267 @@
+"""Load test for the local cipher service (``main.py serve``).
+
+Opens many keep-alive connections to the service and sends a mix of cipher
+requests as fast as the service answers them. Reports throughput, latency
+percentiles, 503 rejections and the batching the service achieved, and
+fails when the p99 latency misses the target. With --spawn the service is
+started and stopped by the test, so everything runs on localhost. Run
+``python loadtest.py --help`` for the options.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmark import dsa_parameters, rsa_primes
+from cryptocore import dsa, rsa
+from cryptocore.metrics import LatencyHistogram
+from cryptocore.service import DEFAULT_HOST, DEFAULT_PORT, P99_TARGET_MS
+
+# ===== CONFIGURATION =====
+MIX = ["caesar", "vigenere", "des", "rsa-encrypt", "rsa-decrypt", "dsa-sign", "dsa-verify"]
+KEY_BITS = 1024
+SEED = 2024
+STARTUP_TIMEOUT = 30.0
+BACKOFF_MS = 50.0   # pause of a connection after a 503, instead of the whole Retry-After second
+
+# ===== REQUESTS =====
+Request = Tuple[str, bytes]   # (path, JSON body)
+
+def request_pool(mix: List[str], keys: int, bits: int, rng: random.Random) -> List[Request]:
+    """Requests to cycle through: `keys` keys per cipher, several inputs per key"""
+    def post(cipher: str, op: str, key: Any, value: Any) -> Request:
+        return f"/v1/{cipher}/{op}", json.dumps({"key": key, "input": value}).encode()
+    
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    texts = ["".join(rng.choice(letters + "     ") for _ in range(rng.randint(16, 256))) for _ in range(32)]
+    p, q = rsa_primes(bits)
+    e, d, n = rsa.rsa_generate_keys(p, q)
+    dsa_p, dsa_q, g = dsa_parameters(bits)
+    x = rng.randrange(1, dsa_q)
+    y = dsa.dsa_public_key(x, dsa_p, g)
+    signatures = []
+    for h in range(1, 17):
+        r, s = dsa.dsa_sign(h, x, dsa_p, dsa_q, g, rng.randrange(1, dsa_q))
+        signatures.append({"h": h, "r": r, "s": s})
+    
+    pool = []
+    for name in mix:
+        for i in range(keys):
+            if name == "caesar":
+                pool.extend(post("caesar", "encrypt", i + 1, t) for t in texts)
+            elif name == "vigenere":
+                key = "".join(rng.choice(letters) for _ in range(8))
+                pool.extend(post("vigenere", "encrypt", key, t) for t in texts)
+            elif name == "des":
+                key = "".join(rng.choice(letters) for _ in range(8))
+                pool.extend(post("des", "encrypt", key, t) for t in texts)
+            elif name == "rsa-encrypt":
+                pool.extend(post("rsa", "encrypt", {"e": e, "n": n}, rng.randrange(2, n)) for _ in texts)
+            elif name == "rsa-decrypt":
+                key = {"d": d, "n": n, "p": p, "q": q}
+                pool.extend(post("rsa", "decrypt", key, rng.randrange(2, n)) for _ in texts)
+            elif name == "dsa-sign":
+                key = {"p": dsa_p, "q": dsa_q, "g": g, "x": x}
+                pool.extend(post("dsa", "sign", key, rng.randrange(1, dsa_q)) for _ in texts)
+            elif name == "dsa-verify":
+                key = {"p": dsa_p, "q": dsa_q, "g": g, "y": y}
+                pool.extend(post("dsa", "verify", key, sig) for sig in signatures)
+            else:
+                raise ValueError(f"Unknown request type {name!r} (expected one of {', '.join(MIX)})")
+    rng.shuffle(pool)
+    return pool
+
+# ===== CLIENT =====
+async def open_connection(address: str):
+    if address.startswith("/"):
+        return await asyncio.open_unix_connection(address)
+    host, _, port = address.rpartition(":")
+    return await asyncio.open_connection(host, int(port))
+
+async def exchange(reader, writer, method: str, path: str, body: bytes = b"") -> Tuple[int, bytes]:
+    """Send one keep-alive request and read its (status, body)"""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    length = 0
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return int(status_line.split()[1]), await reader.readexactly(length)
+
+async def get_json(address: str, path: str) -> Dict[str, Any]:
+    reader, writer = await open_connection(address)
+    try:
+        status, body = await exchange(reader, writer, "GET", path)
+        return json.loads(body)
+    finally:
+        writer.close()
+
+class Results:
+    def __init__(self):
+        self.latency = LatencyHistogram()   # successful requests only
+        self.statuses: Dict[int, int] = {}
+        self.errors: List[str] = []
+
+async def run_load(address: str, pool: List[Request], total: int, connections: int,
+                   backoff: float = BACKOFF_MS / 1e3, warmup: int = 0) -> Tuple[Results, float]:
+    """Send `total` requests after `warmup` unrecorded ones; returns the results and the measured seconds"""
+    results = Results()
+    started = [0.0]
+    sent = [0]
+    clock = time.perf_counter_ns
+    
+    async def connection() -> None:
+        reader, writer = await open_connection(address)
+        try:
+            while sent[0] < warmup + total:
+                index = sent[0]
+                path, body = pool[index % len(pool)]
+                sent[0] += 1
+                if index == warmup:
+                    started[0] = time.perf_counter()
+                start = clock()
+                status, reply = await exchange(reader, writer, "POST", path, body)
+                if index < warmup:
+                    if status == 503:
+                        await asyncio.sleep(backoff)
+                    continue
+                results.statuses[status] = results.statuses.get(status, 0) + 1
+                if status == 200:
+                    results.latency.record(clock() - start)
+                elif status == 503:
+                    await asyncio.sleep(backoff)
+                elif len(results.errors) < 10:
+                    results.errors.append(f"{status} {path}: {reply.decode(errors='replace')}")
+        finally:
+            writer.close()
+    
+    started[0] = time.perf_counter()
+    await asyncio.gather(*(connection() for _ in range(connections)))
+    return results, time.perf_counter() - started[0]
+
+# ===== SERVICE =====
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind((DEFAULT_HOST, 0))
+        return s.getsockname()[1]
+
+def spawn_service(args, address: str) -> subprocess.Popen:
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py"), "serve",
+               "--p99-target", str(args.p99_target)]
+    if address.startswith("/"):
+        command += ["--unix", address]
+    else:
+        command += ["--host", DEFAULT_HOST, "--port", address.rpartition(":")[2]]
+    if args.workers:
+        command += ["--workers", str(args.workers)]
+    return subprocess.Popen(command)
+
+async def wait_until_up(address: str, timeout: float = STARTUP_TIMEOUT) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            await get_json(address, "/health")
+            return
+        except (OSError, asyncio.IncompleteReadError):
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+# ===== MAIN =====
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="loadtest.py",
+        description="Load-test the local cipher service and check its p99 latency."
+    )
+    parser.add_argument("--spawn", action="store_true", help="start the service for the test and stop it after")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="service address (default: %(default)s)")
+    parser.add_argument("--port", type=int, help=f"service port (default: {DEFAULT_PORT}, or a free one with --spawn)")
+    parser.add_argument("--unix", help="connect over this Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, help="with --spawn, worker processes of the service")
+    parser.add_argument("--requests", type=int, default=20000, help="requests to send (default: %(default)s)")
+    parser.add_argument("--warmup", type=int, default=2000,
+                        help="requests sent first and left out of the results (default: %(default)s)")
+    parser.add_argument("--connections", type=int, default=64, help="concurrent connections (default: %(default)s)")
+    parser.add_argument("--mix", default=",".join(MIX), help="comma-separated request types (default: all)")
+    parser.add_argument("--backoff", type=float, default=BACKOFF_MS,
+                        help="ms a connection waits after a 503 before its next request (default: %(default)s)")
+    parser.add_argument("--keys", type=int, default=4, help="distinct keys per request type (default: %(default)s)")
+    parser.add_argument("--key-bits", type=int, default=KEY_BITS, choices=[0, 1024, 2048],
+                        help="RSA modulus and DSA p size, 0 for the toy parameters (default: %(default)s)")
+    parser.add_argument("--p99-target", type=float, default=P99_TARGET_MS,
+                        help="p99 latency in ms the test must meet (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=SEED, help=f"seed for keys and inputs (default: {SEED})")
+    parser.add_argument("--json", help="also write the report as JSON to this file")
+    return parser
+
+async def load_test(args) -> Dict[str, Any]:
+    if args.unix:
+        address = os.path.abspath(args.unix)
+    elif args.spawn and args.port is None:
+        address = f"{DEFAULT_HOST}:{free_port()}"
+    else:
+        address = f"{args.host}:{args.port or DEFAULT_PORT}"
+    pool = request_pool(args.mix.split(","), args.keys, args.key_bits, random.Random(args.seed))
+    process = spawn_service(args, address) if args.spawn else None
+    try:
+        await wait_until_up(address)
+        results, seconds = await run_load(address, pool, args.requests, args.connections,
+                                          args.backoff / 1e3, args.warmup)
+        server = await get_json(address, "/stats")
+    finally:
+        if process is not None:
+            # SIGTERM is the service's graceful shutdown
+            process.send_signal(signal.SIGTERM)
+            try:
+                process.wait(STARTUP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+    h = results.latency
+    return {
+        "address": address,
+        "requests": args.requests,
+        "connections": args.connections,
+        "seconds": round(seconds, 3),
+        "requests_per_s": round(args.requests / seconds, 1),
+        "statuses": {str(k): v for k, v in sorted(results.statuses.items())},
+        "latency_ms": {"p50": h.percentile(0.5) / 1e6, "p99": h.percentile(0.99) / 1e6,
+                       "p999": h.percentile(0.999) / 1e6, "max": h.max / 1e6},
+        "p99_target_ms": args.p99_target,
+        "errors": results.errors,
+        "server": server,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    report = asyncio.run(load_test(args))
+    latency = report["latency_ms"]
+    server = report["server"]
+    print(f"{report['requests']} requests over {report['connections']} connections to {report['address']}: "
+          f"{report['seconds']:.2f}s, {report['requests_per_s']:.0f} req/s")
+    print(f"statuses {report['statuses']}, mean batch {server['mean_batch']:.1f}, "
+          f"admission limit {server['limit']}")
+    print(f"latency p50 {latency['p50']:.2f} ms, p99 {latency['p99']:.2f} ms, p99.9 {latency['p999']:.2f} ms, "
+          f"max {latency['max']:.2f} ms (target p99 {args.p99_target:g} ms)")
+    for error in report["errors"]:
+        print(f"ERROR {error}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    missed = latency["p99"] > args.p99_target
+    if missed:
+        print("FAIL p99 latency above target")
+    return 1 if missed or report["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
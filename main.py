@@ -1,8 +1,17 @@
+import argparse
+import os
 import sys
-import math
-from typing import List, Tuple
+import time
+from typing import Any, BinaryIO, List, Optional, Tuple
 
-SIZE = 5
+# Subcommands import the modules only they use (the service, jobs, key
+# store, crackers...) in their run_* function, so each run pays for its own
+from cryptocore import classical, des, dsa, metrics, rsa
+from cryptocore.numtheory import is_prime
+from cryptocore.stream import (
+    CHUNK_SIZE, caesar_stream, des_ctr_stream, des_ecb_stream, read_chunks,
+    vigenere_stream, write_chunks
+)
 
 # ===== HELPER FUNCTIONS =====
 def print_hex(data: bytes, length: int) -> None:
@@ -18,24 +27,7 @@ def caesar_cipher() -> None:
     key = int(input("Enter shift key: "))
     choice = int(input("1. Encrypt\n2. Decrypt\nChoose: "))
     
-    result = []
-    for char in text:
-        if char.isupper():
-            if choice == 1:
-                new_char = chr((ord(char) - ord('A') + key) % 26 + ord('A'))
-            else:
-                new_char = chr((ord(char) - ord('A') - key + 26) % 26 + ord('A'))
-            result.append(new_char)
-        elif char.islower():
-            if choice == 1:
-                new_char = chr((ord(char) - ord('a') + key) % 26 + ord('a'))
-            else:
-                new_char = chr((ord(char) - ord('a') - key + 26) % 26 + ord('a'))
-            result.append(new_char)
-        else:
-            result.append(char)
-    
-    print("Result:", "".join(result))
+    print("Result:", classical.caesar_cipher(text, key, choice == 1))
 
 def playfair_cipher() -> None:
     print("\nPlayfair Cipher")
@@ -43,74 +35,7 @@ def playfair_cipher() -> None:
     text = input("Enter text: ").upper()
     choice = int(input("1. Encrypt\n2. Decrypt\nChoose: "))
     
-    # Prepare 5x5 key matrix
-    used = [False] * 26
-    matrix = [['' for _ in range(SIZE)] for _ in range(SIZE)]
-    k = 0
-    
-    # Process key
-    for ch in key:
-        if ch == 'J':
-            ch = 'I'
-        if ch.isalpha() and not used[ord(ch) - ord('A')]:
-            matrix[k // SIZE][k % SIZE] = ch
-            used[ord(ch) - ord('A')] = True
-            k += 1
-    
-    # Fill remaining letters
-    for ch in range(ord('A'), ord('Z') + 1):
-        ch = chr(ch)
-        if ch == 'J':
-            continue
-        if not used[ord(ch) - ord('A')] and k < 25:
-            matrix[k // SIZE][k % SIZE] = ch
-            k += 1
-    
-    # Process text
-    processed_text = []
-    i = 0
-    while i < len(text):
-        a = text[i]
-        if i + 1 < len(text):
-            b = text[i + 1]
-        else:
-            b = 'X'
-        
-        if a == b:
-            b = 'X'
-            i += 1
-        else:
-            i += 2
-        
-        # Find positions in matrix
-        a_pos = (-1, -1)
-        b_pos = (-1, -1)
-        for row in range(SIZE):
-            for col in range(SIZE):
-                if matrix[row][col] == a:
-                    a_pos = (row, col)
-                if matrix[row][col] == b:
-                    b_pos = (row, col)
-        
-        a_row, a_col = a_pos
-        b_row, b_col = b_pos
-        
-        # Apply cipher rules
-        if a_row == b_row:  # Same row
-            new_a_col = (a_col + (1 if choice == 1 else -1)) % SIZE
-            new_b_col = (b_col + (1 if choice == 1 else -1)) % SIZE
-            processed_text.append(matrix[a_row][new_a_col])
-            processed_text.append(matrix[b_row][new_b_col])
-        elif a_col == b_col:  # Same column
-            new_a_row = (a_row + (1 if choice == 1 else -1)) % SIZE
-            new_b_row = (b_row + (1 if choice == 1 else -1)) % SIZE
-            processed_text.append(matrix[new_a_row][a_col])
-            processed_text.append(matrix[new_b_row][b_col])
-        else:  # Rectangle
-            processed_text.append(matrix[a_row][b_col])
-            processed_text.append(matrix[b_row][a_col])
-    
-    print("Result:", "".join(processed_text))
+    print("Result:", classical.playfair_cipher(text, key, choice == 1))
 
 def hill_cipher() -> None:
     print("\nHill Cipher (2x2)")
@@ -119,49 +44,10 @@ def hill_cipher() -> None:
     text = input("Enter text (even length): ").upper()
     choice = int(input("1. Encrypt\n2. Decrypt\nChoose: "))
     
-    # Calculate determinant
-    det = key[0][0] * key[1][1] - key[0][1] * key[1][0]
-    det = (det % 26 + 26) % 26
-    
-    # Find modular inverse of determinant
-    det_inv = -1
-    for i in range(26):
-        if (det * i) % 26 == 1:
-            det_inv = i
-            break
-    
-    if choice == 2 and det_inv == -1:
-        print("Invalid key - no inverse exists!")
-        return
-    
-    # Calculate inverse key for decryption
-    if choice == 2:
-        inv_key = [
-            [(key[1][1] * det_inv) % 26, (-key[0][1] * det_inv) % 26],
-            [(-key[1][0] * det_inv) % 26, (key[0][0] * det_inv) % 26]
-        ]
-        for i in range(2):
-            for j in range(2):
-                if inv_key[i][j] < 0:
-                    inv_key[i][j] += 26
-    
-    # Process text in pairs
-    result = []
-    for i in range(0, len(text), 2):
-        a = ord(text[i]) - ord('A')
-        b = ord(text[i + 1]) - ord('A') if i + 1 < len(text) else 23  # 'X'
-        
-        if choice == 1:
-            res_a = (key[0][0] * a + key[0][1] * b) % 26
-            res_b = (key[1][0] * a + key[1][1] * b) % 26
-        else:
-            res_a = (inv_key[0][0] * a + inv_key[0][1] * b) % 26
-            res_b = (inv_key[1][0] * a + inv_key[1][1] * b) % 26
-        
-        result.append(chr(res_a + ord('A')))
-        result.append(chr(res_b + ord('A')))
-    
-    print("Result:", "".join(result))
+    try:
+        print("Result:", classical.hill_cipher(text, key, choice == 1))
+    except ValueError as e:
+        print(e)
 
 def vigenere_cipher() -> None:
     print("\nVigenère Cipher")
@@ -169,26 +55,7 @@ def vigenere_cipher() -> None:
     key = input("Enter key: ")
     choice = int(input("1. Encrypt\n2. Decrypt\nChoose: "))
     
-    result = []
-    key_index = 0
-    for char in text:
-        if char.isalpha():
-            key_char = key[key_index % len(key)].lower()
-            shift = ord(key_char) - ord('a')
-            if choice == 2:
-                shift = -shift
-            
-            if char.isupper():
-                new_char = chr((ord(char) - ord('A') + shift + 26) % 26 + ord('A'))
-            else:
-                new_char = chr((ord(char) - ord('a') + shift + 26) % 26 + ord('a'))
-            
-            result.append(new_char)
-            key_index += 1
-        else:
-            result.append(char)
-    
-    print("Result:", "".join(result))
+    print("Result:", classical.vigenere_cipher(text, key, choice == 1))
 
 def rail_fence_cipher() -> None:
     print("\nRail Fence Cipher")
@@ -196,84 +63,10 @@ def rail_fence_cipher() -> None:
     rails = int(input("Enter rails: "))
     choice = int(input("1. Encrypt\n2. Decrypt\nChoose: "))
     
-    if choice == 1:
-        # Encryption
-        result = []
-        for r in range(rails):
-            i = r
-            while i < len(text):
-                result.append(text[i])
-                if r != 0 and r != rails - 1:
-                    next_i = i + 2 * (rails - r - 1)
-                    if next_i < len(text):
-                        result.append(text[next_i])
-                i += 2 * (rails - 1)
-        print("Result:", "".join(result))
-    else:
-        # Decryption
-        decrypted = [''] * len(text)
-        index = 0
-        for r in range(rails):
-            i = r
-            while i < len(text):
-                decrypted[i] = text[index]
-                index += 1
-                if r != 0 and r != rails - 1:
-                    next_i = i + 2 * (rails - r - 1)
-                    if next_i < len(text):
-                        decrypted[next_i] = text[index]
-                        index += 1
-                i += 2 * (rails - 1)
-        print("Result:", "".join(decrypted))
+    print("Result:", classical.rail_fence_cipher(text, rails, choice == 1))
 
 
 # ===== SYMMETRIC ENCRYPTION =====
-# DES Tables (Partial - full set would be needed for production)
-INITIAL_PERM = [58, 50, 42, 34, 26, 18, 10, 2,
-                60, 52, 44, 36, 28, 20, 12, 4,
-                62, 54, 46, 38, 30, 22, 14, 6,
-                64, 56, 48, 40, 32, 24, 16, 8,
-                57, 49, 41, 33, 25, 17, 9, 1,
-                59, 51, 43, 35, 27, 19, 11, 3,
-                61, 53, 45, 37, 29, 21, 13, 5,
-                63, 55, 47, 39, 31, 23, 15, 7]
-
-def des_key_schedule(key: bytes) -> List[List[int]]:
-    """Generate 16 round keys from 64-bit key"""
-    # Key permutation and compression tables would go here
-    round_keys = []
-    # Actual implementation would generate 16 48-bit keys
-    return round_keys
-
-def des_encrypt_block(block: bytes, round_keys: List[List[int]]) -> bytes:
-    """Encrypt single 64-bit block"""
-    # Initial permutation
-    permuted = [0] * 64
-    for i in range(64):
-        byte_pos = INITIAL_PERM[i] // 8
-        bit_pos = 7 - (INITIAL_PERM[i] % 8)
-        if byte_pos < len(block):  # Add bounds checking
-            permuted[i] = (block[byte_pos] >> bit_pos) & 0x01
-    
-    # 16 Rounds of Feistel network
-    left = permuted[:32]
-    right = permuted[32:]
-    
-    for _ in range(16):
-        new_left = right
-        right = [left[i] ^ right[i] for i in range(32)]
-        left = new_left
-    
-    # Convert bits back to bytes
-    encrypted_bytes = bytearray()
-    for i in range(0, 64, 8):
-        byte = 0
-        for j in range(8):
-            if i+j < len(left + right):  # Add bounds checking
-                byte = (byte << 1) | (left + right)[i+j]
-        encrypted_bytes.append(byte)
-    
-    return bytes(encrypted_bytes)
 
 def des_encrypt() -> None:
     """Complete DES Encryption Interface"""
@@ -284,21 +77,7 @@ def des_encrypt() -> None:
             raise ValueError("Key must be exactly 8 bytes")
         
         plaintext = input("Enter message: ").encode('latin-1')
-        
-        # Pad plaintext using PKCS#7
-        pad_len = 8 - (len(plaintext) % 8)
-        plaintext += bytes([pad_len] * pad_len)
-        
-        # Generate round keys
-        round_keys = des_key_schedule(key)
-        
-        # Encrypt blocks
-        ciphertext = bytearray()
-        for i in range(0, len(plaintext), 8):
-            block = plaintext[i:i+8]
-            if len(block) < 8:
-                block += bytes(8 - len(block))  # Ensure 8-byte blocks
-            ciphertext.extend(des_encrypt_block(block, round_keys))
+        ciphertext = des.des_encrypt(plaintext, key)
         
         print("\nEncryption Successful!")
         print("Ciphertext (hex):", ciphertext.hex())
@@ -309,24 +88,6 @@ def des_encrypt() -> None:
 
 # ===== ASYMMETRIC ENCRYPTION =====
 
-def is_prime(n: int) -> bool:
-    if n <= 1:
-        return False
-    for i in range(2, int(math.sqrt(n)) + 1):
-        if n % i == 0:
-            return False
-    return True
-
-def gcd(a: int, b: int) -> int:
-    return a if b == 0 else gcd(b, a % b)
-
-def mod_inverse(a: int, m: int) -> int:
-    a = a % m
-    for x in range(1, m):
-        if (a * x) % m == 1:
-            return x
-    return -1
-
 def rsa_cipher() -> None:
     print("\nRSA Encryption/Decryption")
     
@@ -340,27 +101,18 @@ def rsa_cipher() -> None:
             print("Both numbers must be prime!")
             return
         
-        n = p * q
-        phi = (p - 1) * (q - 1)
-        
-        e = 2
-        while e < phi:
-            if gcd(e, phi) == 1:
-                break
-            e += 1
-        
-        d = mod_inverse(e, phi)
+        e, d, n = rsa.rsa_generate_keys(p, q)
         
         print(f"Public key (e,n): ({e},{n})")
         print(f"Private key (d,n): ({d},{n})")
         
         msg = int(input("Enter message (number): "))
-        cipher = pow(msg, e, n)
+        cipher = rsa.rsa_encrypt(msg, e, n)
         print(f"Encrypted: {cipher}")
     else:
         d, n = map(int, input("Enter private key (d n): ").split())
         cipher = int(input("Enter ciphertext: "))
-        msg = pow(cipher, d, n)
+        msg = rsa.rsa_decrypt(cipher, d, n)
         print(f"Decrypted: {msg}")
 
 # ===== DIGITAL SIGNATURE =====
@@ -377,14 +129,12 @@ def digital_signature() -> None:
         g = int(input("Enter generator g: "))
         x = int(input("Enter private key x: "))
         
-        y = pow(g, x, p)
+        y = dsa.dsa_public_key(x, p, g)
         
         h = int(input("Enter hash of message (0 < h < q): "))
         k = int(input("Enter random k (0 < k < q): "))
         
-        r = pow(g, k, p) % q
-        k_inv = mod_inverse(k, q)
-        s = (k_inv * (h + x * r)) % q
+        r, s = dsa.dsa_sign(h, x, p, q, g, k)
         
         print(f"Signature (r,s): ({r},{s})")
         print(f"Public key (y,p,q,g): ({y},{p},{q},{g})")
@@ -397,13 +147,7 @@ def digital_signature() -> None:
             print("Invalid signature!")
             return
         
-        w = mod_inverse(s, q)
-        u1 = (h * w) % q
-        u2 = (r * w) % q
-        
-        v = (pow(g, u1, p) * pow(y, u2, p)) % p % q
-        
-        if v == r:
+        if dsa.dsa_verify(h, r, s, y, p, q, g):
             print("Signature is valid!")
         else:
             print("Signature is invalid!")
@@ -459,5 +203,550 @@ def main() -> None:
         
         else:
             print("Invalid choice. Please try again.")
+
+# ===== COMMAND LINE =====
+def open_input(path: Optional[str]) -> BinaryIO:
+    return sys.stdin.buffer if path in (None, "-") else open(path, "rb")
+
+def open_output(path: Optional[str]) -> BinaryIO:
+    return sys.stdout.buffer if path in (None, "-") else open(path, "wb")
+
+def read_text(src: BinaryIO) -> Tuple[str, str]:
+    """Read a whole text input, splitting off one trailing newline"""
+    text = src.read().decode("utf-8")
+    for newline in ("\r\n", "\n"):
+        if text.endswith(newline):
+            return text[:-len(newline)], newline
+    return text, ""
+
+def read_lines(src: BinaryIO):
+    """Yield non-empty input lines as lists of fields"""
+    for line in src:
+        fields = line.decode("utf-8").replace(",", " ").split()
+        if fields:
+            yield fields
+
+def parse_ints(value: str, count: int) -> List[int]:
+    """Parse `count` integers separated by commas or spaces"""
+    numbers = [int(v) for v in value.replace(",", " ").split()]
+    if len(numbers) != count:
+        raise ValueError(f"Expected {count} numbers, got {len(numbers)}")
+    return numbers
+
+def option(value: Any, default: Any) -> Any:
+    """A command line option, or the module default it was left to"""
+    return default if value is None else value
+
+def parse_primes(value: str) -> List[int]:
+    """Parse two or more primes separated by commas or spaces"""
+    primes = [int(v) for v in value.replace(",", " ").split()]
+    if len(primes) < 2:
+        raise ValueError(f"Expected at least 2 primes, got {len(primes)}")
+    return primes
+
+def run_caesar(args, src: BinaryIO, dst: BinaryIO) -> None:
+    for chunk in caesar_stream(read_chunks(src, args.chunk_size), int(args.key), not args.decrypt):
+        dst.write(chunk)
+
+def run_vigenere(args, src: BinaryIO, dst: BinaryIO) -> None:
+    for chunk in vigenere_stream(read_chunks(src, args.chunk_size), args.key, not args.decrypt):
+        dst.write(chunk)
+
+def run_playfair(args, src: BinaryIO, dst: BinaryIO) -> None:
+    text, newline = read_text(src)
+    result = classical.playfair_cipher(text, args.key, not args.decrypt)
+    write_chunks(dst, (result + newline).encode("utf-8"), args.chunk_size)
+
+def run_hill(args, src: BinaryIO, dst: BinaryIO) -> None:
+    a, b, c, d = parse_ints(args.key, 4)
+    text, newline = read_text(src)
+    result = classical.hill_cipher(text, [[a, b], [c, d]], not args.decrypt)
+    write_chunks(dst, (result + newline).encode("utf-8"), args.chunk_size)
+
+def run_railfence(args, src: BinaryIO, dst: BinaryIO) -> None:
+    text, newline = read_text(src)
+    result = classical.rail_fence_cipher(text, int(args.key), not args.decrypt)
+    write_chunks(dst, (result + newline).encode("utf-8"), args.chunk_size)
+
+def stored_key(args, kind: Optional[str] = None):
+    """The key --key-file or --key-id names, checked to be of `kind` ("rsa", "dsa", "des")"""
+    from cryptocore import keyio, keystore
+    if getattr(args, "key_file", None):
+        key = keyio.load_key_file(args.key_file)
+        if kind is not None and not isinstance(key, {"rsa": keystore.RSAKey, "dsa": keystore.DSAKey}[kind]):
+            raise ValueError(f"{args.key_file} holds no {kind} key")
+        return key
+    with keystore.KeyStore(args.keystore) as store:
+        if args.key_id not in store:
+            raise ValueError(f"No key {args.key_id!r} in {store.path}")
+        stored = store.kind(args.key_id)
+        if kind is not None and stored != kind:
+            raise ValueError(f"Key {args.key_id!r} is a {stored} key, not {kind}")
+        return store.get(args.key_id)
+
+def des_key(args) -> bytes:
+    if args.key_id:
+        return stored_key(args, "des").key
+    if args.key is None:
+        raise ValueError("Give a key with -k or --key-id")
+    key = args.key.encode("latin-1")
+    if len(key) != 8:
+        raise ValueError("Key must be exactly 8 bytes")
+    return key
+
+def run_des(args, src: BinaryIO, dst: BinaryIO) -> None:
+    key = des_key(args)
+    if args.mode == "ecb":
+        for chunk in des_ecb_stream(read_chunks(src, args.chunk_size), key, not args.decrypt):
+            dst.write(chunk)
+        return
+    if args.iv:
+        iv = bytes.fromhex(args.iv)
+    elif args.decrypt:
+        iv = src.read(8)
+    else:
+        import secrets
+        iv = secrets.token_bytes(8)
+    # Without --iv the IV travels as the first 8 bytes of the ciphertext
+    if not args.decrypt and not args.iv:
+        dst.write(iv)
+    for chunk in des_ctr_stream(read_chunks(src, args.chunk_size), key, iv):
+        dst.write(chunk)
+
+def run_file(args) -> None:
+    """Process -i into -o through memory maps and report throughput on stderr"""
+    from cryptocore.fileio import crypt_file
+    if args.input in (None, "-") or args.output in (None, "-"):
+        raise ValueError("--mmap needs both -i and -o files")
+    if args.command == "caesar":
+        key = int(args.key)
+    elif args.command == "des":
+        key = des_key(args)
+    else:
+        key = args.key
+    iv = bytes.fromhex(args.iv) if getattr(args, "iv", None) else None
+    stats = crypt_file(args.input, args.output, args.command, key, not args.decrypt,
+                       getattr(args, "mode", "ctr"), iv)
+    print(f"{stats['bytes_in']} bytes in {stats['seconds']:.2f}s "
+          f"({stats['mb_per_s']:.1f} MB/s)", file=sys.stderr)
+
+def run_rsa(args, src: BinaryIO, dst: BinaryIO) -> None:
+    if args.action == "keygen":
+        if args.key is None:
+            raise ValueError('keygen needs the primes as -k "p q" (or more primes)')
+        primes = parse_primes(args.key)
+        if args.key_id:
+            from cryptocore import keystore
+            # Keep the primes too, so that decryption by ID can use the CRT
+            key = keystore.RSAKey.from_primes(*primes)
+            with keystore.KeyStore(args.keystore, writable=True) as store:
+                store.put(args.key_id, key)
+            e, d, n = key.e, key.d, key.n
+        else:
+            e, d, n = rsa.rsa_generate_keys(*primes)
+        dst.write(f"{e} {d} {n}\n".encode())
+        return
+    if args.key_id or args.key_file:
+        key = stored_key(args, "rsa")
+        crypt = key.encrypt if args.action == "encrypt" else key.decrypt
+    elif args.key is None:
+        raise ValueError("Give a key with -k, --key-id or --key-file")
+    else:
+        exponent, n = parse_ints(args.key, 2)
+        operation = rsa.rsa_encrypt if args.action == "encrypt" else rsa.rsa_decrypt
+        crypt = lambda value: operation(value, exponent, n)
+    for fields in read_lines(src):
+        for value in fields:
+            dst.write(f"{crypt(int(value))}\n".encode())
+
+def run_dsa(args, src: BinaryIO, dst: BinaryIO) -> None:
+    if args.key_id or args.key_file:
+        run_dsa_stored(args, src, dst)
+        return
+    if args.params is None or args.key is None:
+        raise ValueError("Give --params and -k, --key-id or --key-file")
+    p, q, g = parse_ints(args.params, 3)
+    key = int(args.key)
+    if args.action == "pubkey":
+        dst.write(f"{dsa.dsa_public_key(key, p, g)}\n".encode())
+    elif args.action == "sign":
+        for fields in read_lines(src):
+            h, k = int(fields[0]), int(fields[1])
+            r, s = dsa.dsa_sign(h, key, p, q, g, k)
+            dst.write(f"{r} {s}\n".encode())
+    else:
+        for fields in read_lines(src):
+            h, r, s = int(fields[0]), int(fields[1]), int(fields[2])
+            dst.write(b"valid\n" if dsa.dsa_verify(h, r, s, key, p, q, g) else b"invalid\n")
+
+def run_dsa_stored(args, src: BinaryIO, dst: BinaryIO) -> None:
+    """run_dsa with a stored key; sign lines may leave out k to use a random one"""
+    key = stored_key(args, "dsa")
+    if args.action == "pubkey":
+        dst.write(f"{key.y}\n".encode())
+    elif args.action == "sign":
+        for fields in read_lines(src):
+            r, s = key.sign(int(fields[0]), int(fields[1]) if len(fields) > 1 else None)
+            dst.write(f"{r} {s}\n".encode())
+    else:
+        for fields in read_lines(src):
+            h, r, s = int(fields[0]), int(fields[1]), int(fields[2])
+            dst.write(b"valid\n" if key.verify(h, r, s) else b"invalid\n")
+
+def run_keys(args, src: BinaryIO, dst: BinaryIO) -> None:
+    """Manage the key store"""
+    from cryptocore import keyio, keystore
+    if args.action == "list":
+        kind = args.kind and args.kind.replace("-public", "")
+        with keystore.KeyStore(args.keystore) as store:
+            for key_id in sorted(store.ids(kind)):
+                dst.write(f"{key_id}\t{store.kind(key_id)}\n".encode())
+        return
+    if args.action != "compact" and not args.key_id:
+        raise ValueError(f"keys {args.action} needs a key ID")
+    if args.action == "show":
+        key = stored_key(args)
+        for name, value in key.fields().items():
+            dst.write(f"{name}\t{value}\n".encode())
+        if isinstance(key, (keystore.RSAKey, keystore.DSAKey)):
+            dst.write(f"sha256\t{keyio.fingerprint(key)}\n".encode())
+        return
+    if args.action == "export":
+        key = stored_key(args)
+        if not isinstance(key, (keystore.RSAKey, keystore.DSAKey)):
+            kind = keystore.KIND_NAMES[keystore.encode_key(key)[0]]
+            raise ValueError(f"Key {args.key_id!r} is a {kind} key; only RSA and DSA keys can be exported")
+        if args.der:
+            dst.write(keyio.key_to_der(key, args.format, args.public))
+        else:
+            dst.write(keyio.key_to_pem(key, args.format, args.public).encode())
+        return
+    if args.action in ("add", "gen") and not args.kind:
+        raise ValueError(f"keys {args.action} needs --kind")
+    with keystore.KeyStore(args.keystore, writable=True) as store:
+        if args.action == "delete":
+            try:
+                store.delete(args.key_id)
+            except KeyError as e:
+                raise ValueError(e.args[0]) from None
+        elif args.action == "compact":
+            before = os.path.getsize(store.path)
+            store.compact()
+            print(f"{before} -> {os.path.getsize(store.path)} bytes", file=sys.stderr)
+        elif args.action == "import":
+            store.put(args.key_id, keyio.load_key(src.read()))
+        else:
+            store.put(args.key_id, new_key(args))
+
+def new_key(args):
+    """The key `keys add` or `keys gen` stores"""
+    from cryptocore import keystore
+    if args.kind in ("dsa", "dsa-public"):
+        if args.params is None:
+            raise ValueError('DSA keys need --params "p q g"')
+        domain = keystore.DSADomain(*parse_ints(args.params, 3))
+    if args.action == "gen":
+        if args.kind == "rsa":
+            return keystore.RSAKey.generate(args.bits, args.primes)
+        if args.kind == "dsa":
+            return keystore.DSAKey.generate(domain)
+        if args.kind == "des":
+            return keystore.DESKey.generate()
+        raise ValueError(f"Cannot generate {args.kind} keys")
+    if args.key is None:
+        raise ValueError("keys add needs the key as -k")
+    if args.kind == "rsa":
+        return keystore.RSAKey.from_primes(*parse_primes(args.key))
+    if args.kind == "rsa-public":
+        e, n = parse_ints(args.key, 2)
+        return keystore.RSAKey(n, e)
+    if args.kind == "dsa":
+        return keystore.DSAKey(domain, x=int(args.key))
+    if args.kind == "dsa-public":
+        return keystore.DSAKey(domain, y=int(args.key))
+    if args.kind == "des":
+        return keystore.DESKey(args.key.encode("latin-1"))
+    raise ValueError(f"Cannot add {args.kind} keys (they are added with the keys that use them)")
+
+def run_crack(args, src: BinaryIO, dst: BinaryIO) -> None:
+    """Print the best candidate keys, each followed by its decryption"""
+    if args.ngrams:
+        # Through the environment so Playfair's worker processes see it too
+        os.environ["CRYPTOCORE_NGRAMS"] = args.ngrams
+    text, newline = read_text(src)
+    if args.cipher == "caesar":
+        from cryptocore.cryptanalysis import caesar
+        candidates = caesar.crack_caesar(text, args.top)
+    elif args.cipher == "vigenere":
+        from cryptocore.cryptanalysis import vigenere
+        candidates = vigenere.crack_vigenere(text, args.top, option(args.max_period, vigenere.MAX_PERIOD))
+    elif args.cipher == "playfair":
+        from cryptocore.cryptanalysis import playfair
+        candidates = playfair.crack_playfair(text, args.top, option(args.time_budget, playfair.TIME_BUDGET))
+    elif args.cipher == "railfence":
+        from cryptocore.cryptanalysis import railfence
+        candidates = railfence.crack_rail_fence(text, args.top, option(args.max_rails, railfence.MAX_RAILS))
+    else:
+        from cryptocore.cryptanalysis import hill
+        if args.known:
+            key = hill.known_plaintext_key(args.known, text)
+            candidates = [(key, None, classical.hill_cipher(text, key, False))]
+        else:
+            candidates = hill.crack_hill(text, args.top)
+    for key, score, plaintext in candidates:
+        if args.cipher == "hill":
+            key = " ".join(str(v) for row in key for v in row)
+        header = f"# key={key}" if score is None else f"# key={key} score={score:.2f}"
+        dst.write(f"{header}\n".encode())
+        write_chunks(dst, (plaintext + "\n").encode("utf-8"), args.chunk_size)
+
+def run_weakkeys(args, src: BinaryIO, dst: BinaryIO) -> None:
+    """Report the RSA moduli that share a prime with another one (batch GCD).
+    
+    Input lines are "modulus" or "label modulus", decimal or 0x-hex; the
+    label defaults to the line number. Each weak modulus is reported as
+    "label<TAB>p<TAB>q<TAB>labels of identical moduli", with "-" for
+    whatever is unknown or empty.
+    """
+    from cryptocore.cryptanalysis import batchgcd
+    labels: List[str] = []
+    
+    def moduli():
+        if args.from_keystore:
+            from cryptocore import keystore
+            with keystore.KeyStore(args.keystore) as store:
+                for key_id in store.ids("rsa"):
+                    labels.append(key_id)
+                    yield store.get(key_id).n
+            return
+        for fields in read_lines(src):
+            labels.append(fields[0] if len(fields) > 1 else str(len(labels) + 1))
+            yield int(fields[-1], 0)
+    
+    start = time.perf_counter()
+    memory_limit = option(args.memory_limit, batchgcd.MEMORY_LIMIT >> 20) << 20
+    weak = batchgcd.find_weak_moduli(moduli(), args.workers, args.tmpdir, memory_limit)
+    for modulus in weak:
+        p, q = ("-", "-") if modulus.factor is None else (modulus.factor, modulus.n // modulus.factor)
+        copies = ",".join(labels[i] for i in modulus.duplicates) or "-"
+        dst.write(f"{labels[modulus.index]}\t{p}\t{q}\t{copies}\n".encode())
+    duplicates = sum(1 for modulus in weak if modulus.duplicates)
+    print(f"{len(labels)} moduli in {time.perf_counter() - start:.1f}s: {len(weak)} share a prime "
+          f"({duplicates} of them duplicates)", file=sys.stderr)
+
+def run_ngrams(args, src: BinaryIO, dst: BinaryIO) -> None:
+    """Train an n-gram model from a corpus streamed from -i"""
+    from cryptocore.cryptanalysis import ngrams
+    ngrams.train(read_chunks(src, args.chunk_size)).write(dst)
+
+def run_batch_jobs(args, src: BinaryIO, dst: BinaryIO) -> None:
+    """Run a JSONL file of jobs and report throughput on stderr"""
+    from cryptocore.jobs import CHUNK_JOBS, run_jobs
+    stats = run_jobs(src, dst, args.workers, option(args.chunk_jobs, CHUNK_JOBS), args.max_in_flight)
+    print(f"{stats['jobs']} jobs in {stats['seconds']:.2f}s "
+          f"({stats['jobs_per_s']:.0f} jobs/s)", file=sys.stderr)
+
+def run_serve(args, src: BinaryIO, dst: BinaryIO) -> None:
+    """Run the local cipher service until interrupted"""
+    import asyncio
+    from cryptocore import service
+    p99_target = option(args.p99_target, service.P99_TARGET_MS)
+    
+    def ready(address: str) -> None:
+        print(f"Serving on {address} with {args.workers or os.cpu_count() or 1} workers "
+              f"(p99 target {p99_target:g} ms)", file=sys.stderr)
+    try:
+        asyncio.run(service.serve(option(args.host, service.DEFAULT_HOST), option(args.port, service.DEFAULT_PORT),
+                                  args.unix, args.workers, option(args.max_batch, service.MAX_BATCH),
+                                  option(args.max_pending, service.MAX_PENDING), p99_target, ready))
+    except KeyboardInterrupt:
+        pass
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Cryptography toolkit. Run without arguments for the interactive menu."
+    )
+    io_args = argparse.ArgumentParser(add_help=False)
+    io_args.add_argument("-i", "--input", help="input file (default: stdin)")
+    io_args.add_argument("-o", "--output", help="output file (default: stdout)")
+    io_args.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="I/O chunk size in bytes")
+    io_args.add_argument("--metrics", choices=metrics.MODES,
+                         help="record call counts, bytes and latencies (default: $CRYPTOCORE_METRICS or off)")
+    io_args.add_argument("--sample-rate", type=int, default=metrics.SAMPLE_RATE,
+                         help="with --metrics sampled, time every Nth call (default: %(default)s)")
+    io_args.add_argument("--metrics-format", choices=["json", "prometheus"], default="json")
+    io_args.add_argument("--metrics-output", help="write the metrics to this file (default: stderr)")
+    
+    cipher_args = argparse.ArgumentParser(add_help=False, parents=[io_args])
+    cipher_args.add_argument("-d", "--decrypt", action="store_true", help="decrypt instead of encrypt")
+    
+    key_args = argparse.ArgumentParser(add_help=False)
+    key_args.add_argument("--key-id", help="use this key from the key store instead of -k")
+    key_args.add_argument("--keystore", help=f"key store file (default: $CRYPTOCORE_KEYSTORE or "
+                                             f"{os.path.join('~', '.cryptocore', 'keys.ccks')})")
+    
+    mmap_args = argparse.ArgumentParser(add_help=False)
+    mmap_args.add_argument("--mmap", action="store_true",
+                           help="memory-map -i and -o instead of streaming, and report MB/s")
+    
+    sub = parser.add_subparsers(dest="command", required=True)
+    
+    p = sub.add_parser("caesar", parents=[cipher_args, mmap_args], help="Caesar cipher (streaming)")
+    p.add_argument("-k", "--key", required=True, help="shift")
+    p.set_defaults(run=run_caesar)
+    
+    p = sub.add_parser("vigenere", parents=[cipher_args, mmap_args], help="Vigenère cipher (streaming)")
+    p.add_argument("-k", "--key", required=True, help="keyword")
+    p.set_defaults(run=run_vigenere)
+    
+    p = sub.add_parser("playfair", parents=[cipher_args], help="Playfair cipher")
+    p.add_argument("-k", "--key", required=True, help="keyword")
+    p.set_defaults(run=run_playfair)
+    
+    p = sub.add_parser("hill", parents=[cipher_args], help="Hill cipher (2x2)")
+    p.add_argument("-k", "--key", required=True, help='key matrix "a b c d"')
+    p.set_defaults(run=run_hill)
+    
+    p = sub.add_parser("railfence", parents=[cipher_args], help="Rail Fence cipher")
+    p.add_argument("-k", "--key", required=True, help="number of rails")
+    p.set_defaults(run=run_railfence)
+    
+    p = sub.add_parser("des", parents=[cipher_args, key_args, mmap_args], help="DES in CTR or ECB mode (streaming)")
+    p.add_argument("-k", "--key", help="8-character key")
+    p.add_argument("--mode", choices=["ctr", "ecb"], default="ctr", help="block cipher mode (default: ctr)")
+    p.add_argument("--iv", help="8-byte IV in hex (default: random, stored in front of the ciphertext)")
+    p.set_defaults(run=run_des)
+    
+    p = sub.add_parser("rsa", parents=[io_args, key_args], help="RSA on integers, one per line")
+    p.add_argument("action", choices=["keygen", "encrypt", "decrypt"])
+    p.add_argument("-k", "--key", help='"p q" (or more primes) for keygen (stored under --key-id if given), '
+                                       '"e n" or "d n" otherwise')
+    p.add_argument("--key-file", help="use the key in this PEM or DER file instead of -k")
+    p.set_defaults(run=run_rsa)
+    
+    p = sub.add_parser("dsa", parents=[io_args, key_args], help='DSA; sign reads "h k" lines, verify reads "h r s" lines')
+    p.add_argument("action", choices=["pubkey", "sign", "verify"])
+    p.add_argument("--params", help='domain parameters "p q g"')
+    p.add_argument("-k", "--key", help="private key x (pubkey/sign) or public key y (verify)")
+    p.add_argument("--key-file", help="use the key in this PEM or DER file instead of --params and -k")
+    p.set_defaults(run=run_dsa)
+    
+    p = sub.add_parser("keys", parents=[io_args],
+                       help="list, show, add, generate, import, export or delete stored keys")
+    p.add_argument("action", choices=["list", "show", "add", "gen", "import", "export", "delete", "compact"])
+    p.add_argument("key_id", nargs="?", help="key ID (all actions but list and compact)")
+    p.add_argument("--kind", choices=["rsa", "rsa-public", "dsa", "dsa-public", "des", "dsa-domain"],
+                   help="key type (add, gen; list shows only this type)")
+    p.add_argument("-k", "--key", help='add: "p q [r ...]" (rsa), "e n" (rsa-public), x (dsa), '
+                                       "y (dsa-public) or 8 characters (des)")
+    p.add_argument("--params", help='DSA domain parameters "p q g" (add, gen)')
+    p.add_argument("--bits", type=int, default=2048, help="RSA modulus size for gen (default: %(default)s)")
+    p.add_argument("--primes", type=int, default=2,
+                   help="number of RSA primes for gen, 3 from 1024 bits and 4 from 4096 (default: %(default)s)")
+    p.add_argument("--format", choices=["pkcs1", "pkcs8", "spki", "dsa"],
+                   help="export: key format (default: pkcs8 for private keys, spki for public ones)")
+    p.add_argument("--public", action="store_true", help="export: only the public key")
+    p.add_argument("--der", action="store_true", help="export: DER instead of PEM")
+    p.add_argument("--keystore", help="key store file (default: $CRYPTOCORE_KEYSTORE or ~/.cryptocore/keys.ccks)")
+    p.set_defaults(run=run_keys)
+    
+    p = sub.add_parser("crack", parents=[io_args], help="recover the key of a ciphertext")
+    p.add_argument("cipher", choices=["caesar", "vigenere", "playfair", "hill", "railfence"])
+    p.add_argument("--top", type=int, default=3, help="number of candidates to print (default: 3)")
+    p.add_argument("--max-period", type=int, help="longest Vigenère key to try (default: 20)")
+    p.add_argument("--time-budget", type=float, help="seconds to spend annealing Playfair keys (default: 60)")
+    p.add_argument("--max-rails", type=int, help="most rails to try (default: 50)")
+    p.add_argument("--known", help="Hill: plaintext of the start of the ciphertext (known-plaintext attack)")
+    p.add_argument("--ngrams", help="n-gram model file to score with (see the ngrams command)")
+    p.set_defaults(run=run_crack)
+    
+    p = sub.add_parser("weakkeys", parents=[io_args],
+                       help='find RSA moduli that share a prime (batch GCD); reads "[label] modulus" lines')
+    p.add_argument("--from-keystore", action="store_true", help="scan the RSA keys of the key store instead of -i")
+    p.add_argument("--keystore", help="key store file (default: $CRYPTOCORE_KEYSTORE or ~/.cryptocore/keys.ccks)")
+    p.add_argument("--workers", type=int, help="worker processes, 0 to run in this process (default: CPU count)")
+    p.add_argument("--tmpdir", help="directory for tree levels that do not fit in memory (default: system temp)")
+    p.add_argument("--memory-limit", type=int,
+                   help="MB of tree levels kept in memory before they go to --tmpdir (default: 256)")
+    p.set_defaults(run=run_weakkeys)
+    
+    p = sub.add_parser("ngrams", parents=[io_args], help="train an n-gram model file from an English corpus")
+    p.set_defaults(run=run_ngrams)
+    
+    p = sub.add_parser("jobs", parents=[io_args],
+                       help='run JSONL jobs {"op", "cipher", "key", "input"} and write JSONL results')
+    p.add_argument("--workers", type=int, help="worker processes, 0 to run in this process (default: CPU count)")
+    p.add_argument("--chunk-jobs", type=int, help="jobs per chunk sent to a worker (default: 2048)")
+    p.add_argument("--max-in-flight", type=int, help="chunks read ahead of the output (default: 2 per worker)")
+    p.set_defaults(run=run_batch_jobs)
+    
+    p = sub.add_parser("serve", parents=[io_args],
+                       help="serve POST /v1/<cipher>/<op> over HTTP on localhost or a Unix socket")
+    p.add_argument("--host", help="address to listen on (default: 127.0.0.1)")
+    p.add_argument("--port", type=int, help="TCP port (default: 8470)")
+    p.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    p.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    p.add_argument("--max-batch", type=int, help="most requests sent to a worker in one call (default: 256)")
+    p.add_argument("--max-pending", type=int,
+                   help="most requests admitted at once; the rest get 503 (default: 4096)")
+    p.add_argument("--p99-target", type=float,
+                   help="p99 latency in ms the admission limit steers towards (default: 50)")
+    p.set_defaults(run=run_serve)
+    
+    return parser
+
+def write_metrics(args) -> None:
+    if args.metrics_format == "prometheus":
+        report = metrics.to_prometheus()
+    else:
+        report = metrics.to_json() + "\n"
+    if args.metrics_output in (None, "-"):
+        sys.stderr.write(report)
+    else:
+        with open(args.metrics_output, "w") as f:
+            f.write(report)
+
+def cli(argv: List[str]) -> int:
+    """Run one non-interactive subcommand"""
+    args = build_parser().parse_args(argv)
+    if args.metrics:
+        metrics.set_mode(args.metrics, args.sample_rate)
+    try:
+        return run_command(args)
+    finally:
+        if metrics.get_mode() != "off":
+            write_metrics(args)
+
+def run_command(args) -> int:
+    if getattr(args, "mmap", False):
+        try:
+            run_file(args)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
+    
+    src = open_input(args.input)
+    dst = open_output(args.output)
+    try:
+        args.run(args, src, dst)
+        dst.flush()
+    except BrokenPipeError:
+        # Downstream closed the pipe (e.g. `| head`): silence the final flush and stop
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError, IndexError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.input not in (None, "-"):
+            src.close()
+        if args.output not in (None, "-"):
+            dst.close()
+    return 0
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(cli(sys.argv[1:]))
     main()